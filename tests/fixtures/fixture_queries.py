@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def query_budget(settings):
+    settings.QUERY_BUDGET_ENABLED = True
+    settings.QUERY_BUDGET_RAISE = True
@@ -0,0 +1,7 @@
+class ApiError(Exception):
+    """Ошибка запроса к API; api_view отдаёт её как JSON с кодом status."""
+
+    def __init__(self, status, detail):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
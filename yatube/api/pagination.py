@@ -0,0 +1,108 @@
+"""Курсорная пагинация по ключу сортировки (keyset).
+
+В отличие от OFFSET, страница N стоит столько же, сколько первая, и
+новые записи не сдвигают уже выданные страницы. Курсор — значения
+полей сортировки последней записи страницы.
+"""
+import base64
+import json
+from functools import reduce
+from operator import and_, or_
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from .exceptions import ApiError
+
+
+def encode_cursor(values):
+    # isoformat, а не DjangoJSONEncoder: тот обрезает время до
+    # миллисекунд, и записи внутри одной миллисекунды терялись бы.
+    payload = json.dumps(
+        [
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in values
+        ]
+    ).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor, model, ordering):
+    """Значения курсора, приведённые к типам полей; иначе ApiError 400."""
+    try:
+        values = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+    except ValueError:
+        # Сюда же попадают binascii.Error, не-ASCII символы и
+        # JSONDecodeError: все они наследуют ValueError.
+        raise ApiError(400, "Неверный курсор")
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise ApiError(400, "Неверный курсор")
+    try:
+        values = [
+            model._meta.get_field(field.lstrip("-")).to_python(value)
+            for field, value in zip(ordering, values)
+        ]
+    except (ValidationError, ValueError, TypeError):
+        raise ApiError(400, "Неверный курсор")
+    # Сравнение с None в условии after() Django не допускает.
+    if None in values:
+        raise ApiError(400, "Неверный курсор")
+    return values
+
+
+def after(ordering, values):
+    """Условие «строго после курсора» для сортировки ordering.
+
+    Для ("-pub_date", "-id"): pub_date < d OR (pub_date = d AND id < i).
+    """
+    conditions = []
+    for position, field in enumerate(ordering):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        equal = [
+            Q(**{previous.lstrip("-"): value})
+            for previous, value in zip(ordering[:position], values)
+        ]
+        conditions.append(
+            reduce(and_, equal, Q(**{f"{name}__{lookup}": values[position]}))
+        )
+    return reduce(or_, conditions)
+
+
+def page_limit(request):
+    """Размер страницы из ?limit=; некорректное значение — ApiError 400."""
+    limit = request.GET.get("limit", str(settings.API_PAGE_SIZE))
+    if not limit.isdigit() or not 1 <= int(limit) <= (
+        settings.API_MAX_PAGE_SIZE
+    ):
+        raise ApiError(
+            400, f"limit должен быть от 1 до {settings.API_MAX_PAGE_SIZE}"
+        )
+    return int(limit)
+
+
+def paginate(querysets, lookups, ordering, cursor, limit):
+    """Строки .values() одной страницы и курсор следующей.
+
+    querysets читаются подряд, как posts.utils.ChainedQuerySets: следующий
+    запрашивается, только если предыдущий не заполнил страницу.
+    Записи всех querysets должны идти в одном порядке ordering.
+    """
+    fields = [field.lstrip("-") for field in ordering]
+    lookups = list(dict.fromkeys([*lookups, *fields]))
+    rows = []
+    for queryset in querysets:
+        needed = limit + 1 - len(rows)
+        if needed <= 0:
+            break
+        if cursor is not None:
+            values = decode_cursor(cursor, queryset.model, ordering)
+            queryset = queryset.filter(after(ordering, values))
+        rows.extend(queryset.order_by(*ordering).values(*lookups)[:needed])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([rows[-1][field] for field in fields])
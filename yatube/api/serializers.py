@@ -0,0 +1,84 @@
+"""Сериализация прямо из .values(), без создания моделей.
+
+Schema описывает поля ресурса и вложенные объекты (автор, группа).
+Вложенные поля достаются тем же запросом через JOIN: lookups()
+возвращает список для .values(), build() собирает из строки словарь.
+"""
+from django.core.files.storage import default_storage
+
+from .exceptions import ApiError
+
+
+def file_url(name):
+    return default_storage.url(name) if name else None
+
+
+class Schema:
+    def __init__(self, fields, embedded=None, converters=None):
+        self.fields = fields
+        self.embedded = embedded or {}
+        self.converters = converters or {}
+
+    def select(self, fields=None):
+        """Поля из параметра fields= (через запятую) или все.
+
+        Пустые имена пропускаются, неизвестное имя — ApiError 400.
+        """
+        available = [*self.fields, *self.embedded]
+        if not fields:
+            return available
+        selected = [
+            name for name in (part.strip() for part in fields.split(","))
+            if name
+        ]
+        unknown = set(selected) - set(available)
+        if unknown:
+            raise ApiError(
+                400, "Неизвестные поля: " + ", ".join(sorted(unknown))
+            )
+        return [name for name in available if name in selected]
+
+    def lookups(self, selected, prefix=""):
+        result = []
+        for name in selected:
+            if name in self.embedded:
+                schema = self.embedded[name]
+                # id нужен всегда: по нему отличаем пустую связь.
+                result.append(f"{prefix}{name}__id")
+                result.extend(
+                    schema.lookups(
+                        [field for field in schema.fields if field != "id"],
+                        f"{prefix}{name}__",
+                    )
+                )
+            else:
+                result.append(prefix + name)
+        return result
+
+    def build(self, row, selected, prefix=""):
+        item = {}
+        for name in selected:
+            if name in self.embedded:
+                schema = self.embedded[name]
+                key = f"{prefix}{name}__"
+                item[name] = (
+                    None
+                    if row[key + "id"] is None
+                    else schema.build(row, schema.fields, key)
+                )
+                continue
+            value = row[prefix + name]
+            convert = self.converters.get(name)
+            item[name] = convert(value) if convert else value
+        return item
+
+
+AUTHOR = Schema(("id", "username", "first_name", "last_name"))
+GROUP = Schema(("id", "slug", "title"))
+POST = Schema(
+    ("id", "text", "pub_date", "image"),
+    embedded={"author": AUTHOR, "group": GROUP},
+    converters={"image": file_url},
+)
+COMMENT = Schema(("id", "text", "pub_date"), embedded={"author": AUTHOR})
+GROUP_DETAIL = Schema(("id", "slug", "title", "description"))
@@ -0,0 +1,183 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import ArchivedPost, Comment, Follow, Group, Post
+
+from ..pagination import encode_cursor
+
+User = get_user_model()
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            username="Author", first_name="Лев", last_name="Толстой"
+        )
+        cls.reader = User.objects.create_user(username="Reader")
+        cls.group = Group.objects.create(
+            title="Test title", slug="test-slug", description="Text"
+        )
+        cls.posts = [
+            Post.objects.create(
+                text=f"Post {number}",
+                author=cls.author,
+                group=cls.group if number % 2 else None,
+            )
+            for number in range(5)
+        ]
+        cls.archived = ArchivedPost.objects.create(
+            id=cls.posts[-1].id + 100,
+            text="Old post",
+            author=cls.author,
+            pub_date=cls.posts[0].pub_date.replace(year=2000),
+        )
+        Comment.objects.create(
+            post=cls.posts[0], author=cls.reader, text="Nice"
+        )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        self.reader_client = Client()
+        self.reader_client.force_login(ApiTests.reader)
+
+    def walk(self, url, **params):
+        """Все страницы ленты по ссылкам next."""
+        items = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            items.extend(data["results"])
+            if data["next"] is None:
+                return items
+            response = self.client.get(data["next"])
+
+    def test_cursor_pagination_walks_whole_feed(self):
+        """Курсор проходит ленту без пропусков и повторов."""
+        items = self.walk(reverse("api:post_list"), limit=2)
+        self.assertEqual(
+            [item["id"] for item in items],
+            [post.id for post in reversed(self.posts)],
+        )
+
+    def test_profile_feed_continues_into_archive(self):
+        """Лента автора после живых постов отдаёт архивные."""
+        items = self.walk(
+            reverse("api:profile_posts", args=[self.author.username]),
+            limit=3,
+        )
+        self.assertEqual(len(items), 6)
+        self.assertEqual(items[-1]["text"], "Old post")
+
+    def test_embedded_objects_in_one_query(self):
+        """Автор и группа вкладываются без дополнительных запросов."""
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("api:post_list"))
+        # Свежий пост без группы, предыдущий — с группой.
+        first, second = response.json()["results"][:2]
+        self.assertEqual(
+            second["author"],
+            {
+                "id": self.author.id,
+                "username": "Author",
+                "first_name": "Лев",
+                "last_name": "Толстой",
+            },
+        )
+        self.assertEqual(
+            second["group"],
+            {"id": self.group.id, "slug": "test-slug", "title": "Test title"},
+        )
+        self.assertIsNone(first["group"])
+
+    def test_sparse_fieldsets(self):
+        """fields= оставляет только запрошенные поля."""
+        response = self.client.get(
+            reverse("api:post_list"), {"fields": "id,author"}
+        )
+        item = response.json()["results"][0]
+        self.assertEqual(set(item), {"id", "author"})
+        response = self.client.get(
+            reverse("api:post_list"), {"fields": "id,password"}
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(
+            reverse("api:post_list"), {"fields": "id, ,text"}
+        )
+        item = response.json()["results"][0]
+        self.assertEqual(set(item), {"id", "text"})
+
+    def test_etag_returns_not_modified(self):
+        """Повторный запрос с If-None-Match получает 304."""
+        url = reverse("api:post_detail", args=[self.posts[0].id])
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.posts[0].text = "Edited"
+        self.posts[0].save()
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200
+        )
+
+    def test_follow_feed_requires_login(self):
+        """Лента подписок — только для вошедших, иначе 401."""
+        self.assertEqual(
+            self.client.get(reverse("api:follow")).status_code, 401
+        )
+        response = self.reader_client.get(reverse("api:follow"))
+        self.assertEqual(len(response.json()["results"]), 5)
+
+    def test_detail_endpoints(self):
+        """Профиль, группа, комментарии и ошибки."""
+        profile = self.client.get(
+            reverse("api:profile", args=[self.author.username])
+        ).json()
+        self.assertEqual(
+            (profile["post_count"], profile["followers"]), (6, 1)
+        )
+        group = self.client.get(
+            reverse("api:group_detail", args=[self.group.slug])
+        ).json()
+        self.assertEqual(group["description"], "Text")
+        group_posts = self.client.get(
+            reverse("api:group_posts", args=[self.group.slug])
+        ).json()
+        self.assertEqual(len(group_posts["results"]), 2)
+        comments = self.client.get(
+            reverse("api:comment_list", args=[self.posts[0].id])
+        ).json()
+        self.assertEqual(
+            comments["results"][0]["author"]["id"], self.reader.id
+        )
+        archived = self.client.get(
+            reverse("api:post_detail", args=[self.archived.id])
+        ).json()
+        self.assertEqual(archived["text"], "Old post")
+        for url, params in (
+            (reverse("api:post_detail", args=[10 ** 6]), {}),
+            (reverse("api:post_list"), {"cursor": "garbage"}),
+            (reverse("api:post_list"), {"limit": "0"}),
+        ):
+            with self.subTest(url=url, params=params):
+                response = self.client.get(url, params)
+                self.assertIn(response.status_code, (400, 404))
+                self.assertIn("detail", response.json())
+
+    def test_malformed_cursor_is_bad_request(self):
+        """Курсор с null, числом вместо даты или не-ASCII — 400, а не 500."""
+        for cursor in (
+            encode_cursor([None, None]),
+            encode_cursor([123, 1]),
+            encode_cursor(["", 1]),
+            encode_cursor(["2020-01-01T00:00:00", "x"]),
+            "é",
+        ):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(
+                    reverse("api:post_list"), {"cursor": cursor}
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("detail", response.json())
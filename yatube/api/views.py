@@ -0,0 +1,208 @@
+import hashlib
+import json
+from functools import wraps
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_safe
+
+from core.queries import query_budget
+from core.routers import replica_reads
+from posts.models import (
+    ArchivedComment,
+    ArchivedPost,
+    Comment,
+    Follow,
+    Group,
+    Post,
+)
+
+from .exceptions import ApiError
+from .pagination import page_limit, paginate
+from .serializers import COMMENT, GROUP, GROUP_DETAIL, POST
+
+User = get_user_model()
+
+FEED_ORDERING = ("-pub_date", "-id")
+
+
+def json_response(request, data, status=200):
+    """JSON-ответ с ETag; при совпадении If-None-Match — 304."""
+    body = json.dumps(
+        data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+    response = HttpResponse(
+        body, status=status, content_type="application/json"
+    )
+    if status != 200:
+        return response
+    etag = '"{}"'.format(hashlib.md5(body).hexdigest())
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+def api_view(view):
+    """Только GET/HEAD; ApiError превращается в JSON-ошибку."""
+
+    @require_safe
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return json_response(request, view(request, *args, **kwargs))
+        except ApiError as error:
+            return json_response(
+                request, {"detail": error.detail}, status=error.status
+            )
+
+    return wrapper
+
+
+def get_row(queryset, schema, request, **lookup):
+    selected = schema.select(request.GET.get("fields"))
+    row = queryset.filter(**lookup).values(*schema.lookups(selected)).first()
+    return row and schema.build(row, selected)
+
+
+def feed(request, querysets, schema, ordering=FEED_ORDERING):
+    """Страница ленты: {"results": [...], "next": url или null}."""
+    selected = schema.select(request.GET.get("fields"))
+    rows, cursor = paginate(
+        querysets,
+        schema.lookups(selected),
+        ordering,
+        request.GET.get("cursor"),
+        page_limit(request),
+    )
+    next_url = None
+    if cursor is not None:
+        params = request.GET.copy()
+        params["cursor"] = cursor
+        next_url = request.build_absolute_uri(
+            f"{request.path}?{params.urlencode()}"
+        )
+    return {
+        "results": [schema.build(row, selected) for row in rows],
+        "next": next_url,
+    }
+
+
+def not_found(name):
+    return ApiError(404, f"{name} не найден")
+
+
+@replica_reads
+@query_budget(2)
+@api_view
+def post_list(request):
+    return feed(request, [Post.objects.all()], POST)
+
+
+@replica_reads
+@query_budget(3)
+@api_view
+def post_detail(request, post_id):
+    for model in (Post, ArchivedPost):
+        post = get_row(model.objects, POST, request, id=post_id)
+        if post:
+            return post
+    raise not_found("Пост")
+
+
+@replica_reads
+@query_budget(3)
+@api_view
+def comment_list(request, post_id):
+    if Post.objects.filter(id=post_id).exists():
+        comments = Comment.objects.filter(post_id=post_id)
+    elif ArchivedPost.objects.filter(id=post_id).exists():
+        comments = ArchivedComment.objects.filter(post_id=post_id)
+    else:
+        raise not_found("Пост")
+    return feed(request, [comments], COMMENT)
+
+
+@replica_reads
+@query_budget(2)
+@api_view
+def group_list(request):
+    return feed(request, [Group.objects.all()], GROUP, ordering=("id",))
+
+
+@replica_reads
+@query_budget(2)
+@api_view
+def group_detail(request, slug):
+    group = get_row(Group.objects, GROUP_DETAIL, request, slug=slug)
+    if group is None:
+        raise not_found("Группа")
+    return group
+
+
+@replica_reads
+@query_budget(3)
+@api_view
+def group_posts(request, slug):
+    group_id = (
+        Group.objects.filter(slug=slug).values_list("id", flat=True).first()
+    )
+    if group_id is None:
+        raise not_found("Группа")
+    return feed(request, [Post.objects.filter(group_id=group_id)], POST)
+
+
+@replica_reads
+@query_budget(5)
+@api_view
+def profile(request, username):
+    user = (
+        User.objects.filter(username=username)
+        .values("id", "username", "first_name", "last_name")
+        .first()
+    )
+    if user is None:
+        raise not_found("Пользователь")
+    user["post_count"] = (
+        Post.objects.filter(author_id=user["id"]).count()
+        + ArchivedPost.objects.filter(author_id=user["id"]).count()
+    )
+    user["followers"] = Follow.objects.filter(author_id=user["id"]).count()
+    user["following"] = Follow.objects.filter(user_id=user["id"]).count()
+    return user
+
+
+@replica_reads
+@query_budget(4)
+@api_view
+def profile_posts(request, username):
+    author_id = (
+        User.objects.filter(username=username)
+        .values_list("id", flat=True)
+        .first()
+    )
+    if author_id is None:
+        raise not_found("Пользователь")
+    # Архивные посты старше живых, поэтому идут после них.
+    return feed(
+        request,
+        [
+            Post.objects.filter(author_id=author_id),
+            ArchivedPost.objects.filter(author_id=author_id),
+        ],
+        POST,
+    )
+
+
+@replica_reads
+@query_budget(4)
+@api_view
+def follow_feed(request):
+    if not request.user.is_authenticated:
+        raise ApiError(401, "Нужна авторизация")
+    return feed(
+        request,
+        [Post.objects.filter(author__following__user_id=request.user.id)],
+        POST,
+    )
@@ -3,3 +3,13 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from django.conf import settings
+
+        from . import db  # noqa: F401
+
+        if settings.TEMPLATE_WARMUP:
+            from .template_backends import warm_up
+
+            warm_up()
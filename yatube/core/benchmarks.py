@@ -0,0 +1,177 @@
+"""Бенчмарк основных страниц с проверкой на регрессии.
+
+Каждая страница запрашивается через django.test.Client с уникальным
+параметром в адресе: так cache_page всегда промахивается (иначе index
+измерял бы только его), а кэши фрагментов работают как в продакшене,
+прогреваясь на разминочных запросах. Запросы на запись
+(post_create, add_comment) выполняются в транзакции, которая
+откатывается, поэтому данные между прогонами не меняются.
+Клиенты принимают gzip, так что bytes — размер ответа на проводе.
+"""
+import itertools
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from contextlib import ExitStack
+
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+
+from core.loadtest import percentile
+from posts.models import Group, Post
+
+User = get_user_model()
+
+# Метрика -> абсолютный запас сверх относительного tolerance: на
+# быстрых страницах шум в миллисекунду уже больше 20%. None — метрика
+# сравнивается точно (число запросов к БД).
+METRICS = {
+    "p50_ms": 2,
+    "p95_ms": 5,
+    "queries": None,
+    "alloc_kb": 16,
+    "bytes": 0,
+}
+
+
+def build_cases():
+    """Имя -> (метод, url, данные, нужен ли вход)."""
+    post = Post.objects.annotate(number=Count("comments")).latest("number")
+    author = (
+        User.objects.annotate(number=Count("posts")).latest("number").username
+    )
+    group = Group.objects.annotate(number=Count("posts")).latest("number")
+    return {
+        "index": ("get", reverse("posts:index"), None, False),
+        "group_posts": (
+            "get",
+            reverse("posts:group_list", args=[group.slug]),
+            None,
+            False,
+        ),
+        "profile": (
+            "get",
+            reverse("posts:profile", args=[author]),
+            None,
+            False,
+        ),
+        "post_detail": (
+            "get",
+            reverse("posts:post_detail", args=[post.id]),
+            None,
+            False,
+        ),
+        "follow_index": ("get", reverse("posts:follow_index"), None, True),
+        "post_create": (
+            "post",
+            reverse("posts:post_create"),
+            {"text": "Benchmark post"},
+            True,
+        ),
+        "add_comment": (
+            "post",
+            reverse("posts:add_comment", args=[post.id]),
+            {"text": "Benchmark comment"},
+            True,
+        ),
+    }
+
+
+def reader():
+    """Пользователь с наибольшим числом подписок — для follow_index."""
+    return User.objects.annotate(number=Count("follower")).latest("number")
+
+
+class Benchmark:
+    def __init__(self, iterations, warmup=2):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.anonymous = Client(
+            SERVER_NAME="localhost", HTTP_ACCEPT_ENCODING="gzip"
+        )
+        self.logged_in = Client(
+            SERVER_NAME="localhost", HTTP_ACCEPT_ENCODING="gzip"
+        )
+        self.logged_in.force_login(reader())
+        self.run_id = uuid.uuid4().hex[:8]
+        self.counter = itertools.count()
+
+    def request(self, case):
+        method, url, data, login = case
+        client = self.logged_in if login else self.anonymous
+        if method == "get":
+            bench = f"{self.run_id}-{next(self.counter)}"
+            return client.get(url, {"bench": bench})
+        with transaction.atomic():
+            response = client.post(url, data)
+            transaction.set_rollback(True)
+        return response
+
+    def measure(self, case):
+        for _ in range(self.warmup):
+            self.request(case)
+        timings = []
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries[-1] += 1
+            return execute(sql, params, many, context)
+
+        for _ in range(self.iterations):
+            queries.append(0)
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(count))
+                started = time.perf_counter()
+                response = self.request(case)
+                timings.append(time.perf_counter() - started)
+        # Аллокации меряются отдельным запросом: tracemalloc
+        # замедляет код и исказил бы время.
+        tracemalloc.start()
+        self.request(case)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        timings.sort()
+        return {
+            "status": response.status_code,
+            "p50_ms": round(percentile(timings, 0.5) * 1000, 3),
+            "p95_ms": round(percentile(timings, 0.95) * 1000, 3),
+            # Самое частое значение: редкие фоновые записи (например,
+            # сброс счётчика просмотров) не должны считаться регрессией.
+            "queries": Counter(queries).most_common(1)[0][0],
+            "alloc_kb": round(peak / 1024, 1),
+            "bytes": len(response.content),
+        }
+
+    def run(self, names=None):
+        cases = build_cases()
+        return {
+            name: self.measure(case)
+            for name, case in cases.items()
+            if not names or name in names
+        }
+
+
+def compare(results, baseline, tolerance):
+    """Список регрессий относительно baseline."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric, slack in METRICS.items():
+            if metric not in base:
+                continue
+            limit = base[metric]
+            if slack is not None:
+                limit = max(limit * (1 + tolerance), limit + slack)
+            if result[metric] > limit:
+                regressions.append(
+                    f"{name}.{metric}: {result[metric]} > {limit:g} "
+                    f"(базовое {base[metric]})"
+                )
+    return regressions
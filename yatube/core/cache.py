@@ -0,0 +1,25 @@
+from django.core.cache.backends.locmem import LocMemCache
+
+from core import metrics
+from core.instrumentation import record, timed
+
+_MISSING = object()
+
+
+class InstrumentedLocMemCache(LocMemCache):
+    """LocMemCache, считающий попадания и промахи для Server-Timing.
+
+    get_many базового класса вызывает get для каждого ключа, поэтому
+    переопределять его не нужно.
+    """
+
+    def get(self, key, default=None, version=None):
+        with timed("cache"):
+            value = super().get(key, _MISSING, version)
+        result = "miss" if value is _MISSING else "hit"
+        record("cache_" + result)
+        metrics.inc(
+            "yatube_cache_requests_total",
+            {"prefix": metrics.cache_key_prefix(key), "result": result},
+        )
+        return default if value is _MISSING else value
@@ -0,0 +1,54 @@
+import time
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def apply_sqlite_pragmas(cursor, pragmas):
+    """Выполняет PRAGMA из словаря {имя: значение} на курсоре SQLite."""
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+@receiver(connection_created, dispatch_uid="core_sqlite_pragmas")
+def tune_sqlite_connection(sender, connection, **kwargs):
+    """Настраивает каждое новое соединение с SQLite.
+
+    WAL позволяет читателям не ждать писателя, busy_timeout вместо
+    немедленного `database is locked` ждёт освобождения блокировки.
+    Набор PRAGMA задаётся в settings.SQLITE_PRAGMAS. Бэкенд с пулом
+    применяет их сам, только к новым физическим соединениям.
+    """
+    if connection.vendor != "sqlite" or getattr(
+        connection, "applies_sqlite_pragmas", False
+    ):
+        return
+    with connection.cursor() as cursor:
+        apply_sqlite_pragmas(cursor, settings.SQLITE_PRAGMAS)
+
+
+@receiver(request_started, dispatch_uid="core_db_health_check")
+def check_persistent_connections(sender, **kwargs):
+    """Проверяет постоянные соединения перед запросом.
+
+    Django (CONN_MAX_AGE > 0) переиспользует соединение, не проверяя,
+    живо ли оно. Раз в DB_HEALTH_CHECK_INTERVAL секунд вызываем
+    is_usable() и закрываем соединение, если сервер его оборвал, —
+    запрос откроет новое вместо ошибки на первом же запросе к БД.
+    """
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+        checked_at = getattr(connection, "health_checked_at", None)
+        if (
+            checked_at is not None
+            and now - checked_at < settings.DB_HEALTH_CHECK_INTERVAL
+        ):
+            continue
+        connection.health_checked_at = now
+        if not connection.is_usable():
+            connection.close()
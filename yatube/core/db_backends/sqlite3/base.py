@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db.backends.sqlite3 import base
+
+from core.db import apply_sqlite_pragmas
+from core.db_pool import get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite-бэкенд, берущий соединения из общего пула процесса.
+
+    Django держит соединения в thread-local; в многопоточном сервере
+    поток живёт один запрос, и без пула каждое соединение открывается
+    заново. Здесь close() возвращает соединение в пул, а connect()
+    забирает готовое. Параметры пула — settings.DB_POOL.
+
+    SQLITE_PRAGMAS применяются один раз при открытии физического
+    соединения: connection_created срабатывает на каждую выдачу из
+    пула, и journal_mode=WAL под нагрузкой ждал бы блокировку.
+    """
+
+    applies_sqlite_pragmas = True
+
+    @property
+    def pool(self):
+        return get_pool(self.alias, settings.DB_POOL)
+
+    def connect_tuned(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        apply_sqlite_pragmas(conn.cursor(), settings.SQLITE_PRAGMAS)
+        return conn
+
+    def get_new_connection(self, conn_params):
+        if self.is_in_memory_db():
+            return self.connect_tuned(conn_params)
+        return self.pool.checkout(lambda: self.connect_tuned(conn_params))
+
+    def _close(self):
+        if self.connection is None or self.is_in_memory_db():
+            return super()._close()
+        with self.wrap_database_errors:
+            self.pool.checkin(
+                self.connection, reusable=not self.errors_occurred
+            )
@@ -0,0 +1,153 @@
+import queue
+import threading
+import time
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(Exception):
+    """Свободное соединение не появилось за отведённое время."""
+
+
+class ConnectionPool:
+    """Пул DB-API соединений, общий для потоков процесса.
+
+    Соединение создаётся лениво, пока пул не достиг max_size; дальше
+    поток ждёт возврата соединения не дольше timeout секунд. Время
+    ожидания и насыщенность пула копятся в stats().
+    """
+
+    def __init__(self, max_size, timeout, health_check_interval):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+        self._discarded = 0
+
+    def checkout(self, connect):
+        started = time.perf_counter()
+        deadline = started + self.timeout
+        waited = False
+        while True:
+            conn = self._take_idle()
+            if conn is None:
+                with self._lock:
+                    can_grow = self._size < self.max_size
+                    if can_grow:
+                        self._size += 1
+                if can_grow:
+                    try:
+                        return self._checked_out(connect(), started, waited)
+                    except Exception:
+                        with self._lock:
+                            self._size -= 1
+                        raise
+                conn = self._wait_idle(deadline)
+                waited = True
+            # Дождавшееся соединение проверяется так же, как взятое
+            # сразу; отбракованное освобождает место для нового.
+            if self._is_healthy(*conn):
+                return self._checked_out(conn[0], started, waited)
+            self._discard(conn[0])
+
+    def checkin(self, conn, reusable=True):
+        with self._lock:
+            self._in_use -= 1
+        if not reusable:
+            self._discard(conn)
+            return
+        try:
+            conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+        self._idle.put((conn, time.monotonic()))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self._size,
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+                "saturation": self._in_use / self.max_size,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_seconds_total": self._wait_time,
+                "wait_seconds_max": self._max_wait,
+                "timeouts": self._timeouts,
+                "discarded": self._discarded,
+            }
+
+    def _take_idle(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return None
+
+    def _wait_idle(self, deadline):
+        try:
+            return self._idle.get(
+                timeout=max(deadline - time.perf_counter(), 0)
+            )
+        except queue.Empty:
+            with self._lock:
+                self._timeouts += 1
+            raise PoolTimeout(
+                f"Нет свободных соединений за {self.timeout} с "
+                f"(размер пула {self.max_size})."
+            )
+
+    def _is_healthy(self, conn, idle_since):
+        if time.monotonic() - idle_since < self.health_check_interval:
+            return True
+        try:
+            conn.cursor().execute("SELECT 1")
+        except Exception:
+            return False
+        return True
+
+    def _checked_out(self, conn, started, waited=False):
+        wait = time.perf_counter() - started
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            self._wait_time += wait
+            self._max_wait = max(self._max_wait, wait)
+            if waited:
+                self._waits += 1
+        return conn
+
+    def _discard(self, conn):
+        with self._lock:
+            self._size -= 1
+            self._discarded += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def get_pool(alias, options):
+    with _pools_lock:
+        if alias not in _pools:
+            _pools[alias] = ConnectionPool(
+                max_size=options["MAX_SIZE"],
+                timeout=options["TIMEOUT"],
+                health_check_interval=options["HEALTH_CHECK_INTERVAL"],
+            )
+        return _pools[alias]
+
+
+def all_pools():
+    with _pools_lock:
+        return dict(_pools)
@@ -0,0 +1,142 @@
+"""Кэш страниц с «дырками» под данные конкретного пользователя.
+
+Страница рендерится один раз на всех: вместо пользовательских
+фрагментов ({% hole %}) в кэш попадают метки. При каждом ответе метки
+заменяются фрагментами текущего пользователя. Фрагменты кэшируются
+отдельно по пользователю и версии его данных; версию сбрасывает
+bump_user_fragments (новые уведомления, прочтение и т. п.).
+Фрагменты с формами помечаются cache=False: в них CSRF-токен.
+"""
+import base64
+import hashlib
+import json
+import re
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.crypto import salted_hmac
+from django.utils.functional import SimpleLazyObject
+
+# Метку не подделать через текст поста: он экранируется, а токен
+# выведен из SECRET_KEY.
+_TOKEN = SimpleLazyObject(
+    lambda: salted_hmac("core.holes", "marker").hexdigest()[:16]
+)
+_MARKER = SimpleLazyObject(
+    lambda: re.compile(rf"<!--hole:{_TOKEN}:([A-Za-z0-9_=-]+)-->")
+)
+
+
+def punching(request):
+    """Рендерится ли сейчас общая страница с метками вместо фрагментов."""
+    return getattr(request, "punch_holes", False)
+
+
+def marker(template_name, params, use_cache=True):
+    payload = json.dumps(
+        [template_name, params, use_cache], sort_keys=True
+    ).encode()
+    encoded = base64.urlsafe_b64encode(payload).decode()
+    return f"<!--hole:{_TOKEN}:{encoded}-->"
+
+
+def render_fragment(request, template_name, params):
+    return render_to_string(template_name, params, request=request)
+
+
+def _user_key(request):
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return "anon"
+    version = cache.get(f"holes_version:{user.pk}", 0)
+    return f"{user.pk}:{version}"
+
+
+def bump_user_fragments(user_id):
+    """Сбрасывает закэшированные фрагменты пользователя."""
+    cache.set(
+        f"holes_version:{user_id}",
+        uuid.uuid4().hex,
+        settings.CACHE_TIME_FRAGMENTS,
+    )
+
+
+def fill_holes(request, html):
+    """Заменяет метки фрагментами текущего пользователя."""
+    payloads = list(dict.fromkeys(_MARKER.findall(html)))
+    if not payloads:
+        return html
+    user_key = _user_key(request)
+    keys = {
+        payload: "hole:{}:{}".format(
+            user_key, hashlib.md5(payload.encode()).hexdigest()
+        )
+        for payload in payloads
+    }
+    cached = cache.get_many(keys.values())
+    fragments = {}
+    missing = {}
+    for payload in payloads:
+        template_name, params, use_cache = json.loads(
+            base64.urlsafe_b64decode(payload)
+        )
+        fragment = cached.get(keys[payload]) if use_cache else None
+        if fragment is None:
+            fragment = render_fragment(request, template_name, params)
+            if use_cache:
+                missing[keys[payload]] = fragment
+        fragments[payload] = fragment
+    if missing:
+        cache.set_many(missing, settings.CACHE_TIME_FRAGMENTS)
+    return _MARKER.sub(lambda match: fragments[match.group(1)], html)
+
+
+def cached_page(request, key, timeout, render):
+    """Ответ из общего кэша страниц с заполненными дырками.
+
+    render() вызывается только при промахе и должен вернуть ответ
+    представления.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return render()
+    html = cache.get(key)
+    if html is not None:
+        return HttpResponse(fill_holes(request, html))
+    request.punch_holes = True
+    try:
+        response = render()
+    finally:
+        request.punch_holes = False
+    if response.streaming or response.status_code != 200:
+        return response
+    html = response.content.decode(response.charset)
+    cache.set(key, html, timeout)
+    response.content = fill_holes(request, html)
+    return response
+
+
+def page_key(key_prefix, request):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f"{key_prefix}:{path}"
+
+
+def hole_punched_page(timeout, key_prefix):
+    """Аналог cache_page, общий для анонимов и вошедших пользователей."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            return cached_page(
+                request,
+                page_key(key_prefix, request),
+                timeout,
+                lambda: view(request, *args, **kwargs),
+            )
+
+        return wrapper
+
+    return decorator
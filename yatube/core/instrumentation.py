@@ -0,0 +1,62 @@
+"""Замеры времени внутри запроса для Server-Timing.
+
+Хуки (кэш, шаблоны, миниатюры, БД) пишут в сборщик текущего потока.
+Если запрос не попал в выборку, сборщика нет и хук сводится к одной
+проверке атрибута thread-local.
+"""
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+_local = threading.local()
+
+
+class RequestTimings:
+    """Суммарное время и число операций каждого вида за запрос."""
+
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.counts = Counter()
+
+    def add(self, name, duration=0.0, count=1):
+        self.durations[name] += duration
+        self.counts[name] += count
+
+
+def current():
+    return getattr(_local, "timings", None)
+
+
+def start():
+    _local.timings = RequestTimings()
+    return _local.timings
+
+
+def stop():
+    _local.timings = None
+
+
+def record(name, duration=0.0, count=1):
+    timings = current()
+    if timings is not None:
+        timings.add(name, duration, count)
+
+
+@contextmanager
+def timed(name):
+    timings = current()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+def db_wrapper(execute, sql, params, many, context):
+    """execute_wrapper, замеряющий время SQL-запросов."""
+    with timed("db"):
+        return execute(sql, params, many, context)
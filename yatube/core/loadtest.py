@@ -0,0 +1,171 @@
+"""Нагрузочный прогон по настоящим URL проекта.
+
+Запросы идут через django.test.Client (весь стек middleware, без
+сети) или, если задан base_url, по HTTP к запущенному серверу.
+"""
+import random
+import threading
+import time
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+# Имя URL -> (вес в смеси запросов, нужен ли вход).
+MIX = {
+    "posts:index": (40, False),
+    "posts:post_detail": (25, False),
+    "posts:profile": (15, False),
+    "posts:group_list": (10, False),
+    "posts:follow_index": (10, True),
+}
+SAMPLE_SIZE = 500
+
+
+def percentile(values, fraction):
+    """Перцентиль по ближайшему рангу; values отсортированы."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(fraction * len(values)) - 1))
+    return values[index]
+
+
+def summarize(latencies):
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "p50": percentile(values, 0.5),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+    }
+
+
+def build_targets(rng):
+    """Набор адресов для каждого имени URL из случайных объектов БД."""
+    usernames = list(
+        User.objects.filter(posts__isnull=False)
+        .distinct()
+        .values_list("username", flat=True)[:SAMPLE_SIZE]
+    )
+    post_ids = list(
+        Post.objects.order_by("?").values_list("id", flat=True)[:SAMPLE_SIZE]
+    )
+    slugs = list(Group.objects.values_list("slug", flat=True)[:SAMPLE_SIZE])
+    pages = max(1, Post.objects.count() // 10)
+    targets = {
+        "posts:index": [
+            reverse("posts:index") + f"?page={page}"
+            for page in rng.sample(range(1, pages + 1), min(pages, 20))
+        ],
+        "posts:post_detail": [
+            reverse("posts:post_detail", args=[pk]) for pk in post_ids
+        ],
+        "posts:profile": [
+            reverse("posts:profile", args=[name]) for name in usernames
+        ],
+        "posts:group_list": [
+            reverse("posts:group_list", args=[slug]) for slug in slugs
+        ],
+        "posts:follow_index": [reverse("posts:follow_index")],
+    }
+    return {name: urls for name, urls in targets.items() if urls}
+
+
+class LoadTest:
+    def __init__(
+        self, requests, threads, seed=0, base_url=None, login_share=0.5
+    ):
+        self.requests = requests
+        self.threads = threads
+        self.base_url = base_url
+        self.login_share = login_share
+        self.rng = random.Random(seed)
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def client(self, rng, users):
+        """Клиент потока и признак, вошёл ли он на сайт.
+
+        По HTTP запросы идут анонимно: вход потребовал бы CSRF-токена.
+        """
+        if self.base_url:
+            import requests
+
+            return requests.Session(), False
+        client = Client(SERVER_NAME="localhost")
+        if users and rng.random() < self.login_share:
+            client.force_login(rng.choice(users))
+            return client, True
+        return client, False
+
+    def fetch(self, client, url):
+        if self.base_url:
+            return client.get(self.base_url + url).status_code
+        response = client.get(url)
+        if response.streaming:
+            response.close()
+        return response.status_code
+
+    def worker(self, number, targets, users, count):
+        rng = random.Random(f"{self.rng.random()}-{number}")
+        client, logged_in = self.client(rng, users)
+        names = [name for name in targets if logged_in or not MIX[name][1]]
+        weights = [MIX[name][0] for name in names]
+        latencies = defaultdict(list)
+        errors = defaultdict(int)
+        for _ in range(count):
+            name = rng.choices(names, weights)[0]
+            url = rng.choice(targets[name])
+            started = time.perf_counter()
+            status = self.fetch(client, url)
+            latencies[name].append(time.perf_counter() - started)
+            if status >= 400:
+                errors[name] += 1
+        with self.lock:
+            for name, values in latencies.items():
+                self.latencies[name].extend(values)
+            for name, value in errors.items():
+                self.errors[name] += value
+
+    def run(self):
+        targets = build_targets(self.rng)
+        users = list(User.objects.filter(is_active=True)[:SAMPLE_SIZE])
+        shares = [
+            self.requests // self.threads
+            + (1 if number < self.requests % self.threads else 0)
+            for number in range(self.threads)
+        ]
+        started = time.perf_counter()
+        if self.threads == 1:
+            self.worker(0, targets, users, shares[0])
+        else:
+            threads = [
+                threading.Thread(
+                    target=self.run_thread,
+                    args=(number, targets, users, share),
+                )
+                for number, share in enumerate(shares)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        elapsed = time.perf_counter() - started
+        return elapsed, {
+            name: {**summarize(values), "errors": self.errors[name]}
+            for name, values in sorted(self.latencies.items())
+        }
+
+    def run_thread(self, *args):
+        try:
+            self.worker(*args)
+        finally:
+            connections.close_all()
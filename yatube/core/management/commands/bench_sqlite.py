@@ -0,0 +1,123 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.db import apply_sqlite_pragmas
+
+SCHEMA = (
+    "CREATE TABLE post ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+    "author_id INTEGER NOT NULL, "
+    "text TEXT NOT NULL, "
+    "pub_date REAL NOT NULL)",
+    "CREATE INDEX post_author ON post (author_id, pub_date)",
+)
+READ_SQL = (
+    "SELECT id, text, pub_date FROM post "
+    "WHERE author_id = ? ORDER BY pub_date DESC LIMIT 10"
+)
+WRITE_SQL = "INSERT INTO post (author_id, text, pub_date) VALUES (?, ?, ?)"
+AUTHORS = 100
+DEFAULT_TIMEOUT = 5.0
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает пропускную способность SQLite на смешанной нагрузке "
+        "чтения/записи с настройками по умолчанию и SQLITE_PRAGMAS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--writers", type=int, default=2)
+        parser.add_argument(
+            "--duration", type=float, default=5.0, help="Секунд на прогон."
+        )
+        parser.add_argument("--rows", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        for title, pragmas in (
+            ("default", {}),
+            ("tuned", settings.SQLITE_PRAGMAS),
+        ):
+            result = self.run(pragmas, options)
+            self.stdout.write(
+                f"{title:8} reads/s={result['reads']:9.0f} "
+                f"writes/s={result['writes']:8.0f} "
+                f"locked={result['locked']}"
+            )
+
+    def connect(self, path, pragmas):
+        # Таймаут ожидания блокировки — как у sqlite3 и Django по
+        # умолчанию (5 с): сравниваются только PRAGMA, а busy_timeout
+        # из SQLITE_PRAGMAS переопределяет его в настроенном прогоне.
+        connection = sqlite3.connect(
+            path,
+            timeout=DEFAULT_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        apply_sqlite_pragmas(connection.cursor(), pragmas)
+        return connection
+
+    def prepare(self, path, pragmas, rows):
+        connection = self.connect(path, pragmas)
+        for statement in SCHEMA:
+            connection.execute(statement)
+        connection.execute("BEGIN")
+        connection.executemany(
+            WRITE_SQL,
+            ((pk % AUTHORS, "x" * 200, pk) for pk in range(rows)),
+        )
+        connection.execute("COMMIT")
+        connection.close()
+
+    def run(self, pragmas, options):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bench.sqlite3")
+            self.prepare(path, pragmas, options["rows"])
+            counters = {"reads": 0, "writes": 0, "locked": 0}
+            lock = threading.Lock()
+            deadline = time.monotonic() + options["duration"]
+
+            def worker(is_writer):
+                connection = self.connect(path, pragmas)
+                done = locked = 0
+                while time.monotonic() < deadline:
+                    author_id = done % AUTHORS
+                    try:
+                        if is_writer:
+                            connection.execute(
+                                WRITE_SQL, (author_id, "x" * 200, time.time())
+                            )
+                        else:
+                            connection.execute(
+                                READ_SQL, (author_id,)
+                            ).fetchall()
+                        done += 1
+                    except sqlite3.OperationalError:
+                        locked += 1
+                connection.close()
+                with lock:
+                    counters["writes" if is_writer else "reads"] += done
+                    counters["locked"] += locked
+
+            threads = [
+                threading.Thread(target=worker, args=(False,))
+                for _ in range(options["readers"])
+            ] + [
+                threading.Thread(target=worker, args=(True,))
+                for _ in range(options["writers"])
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        counters["reads"] /= options["duration"]
+        counters["writes"] /= options["duration"]
+        return counters
@@ -0,0 +1,79 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import METRICS, Benchmark, compare
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет время, число запросов к БД, аллокации и размер ответа "
+        "основных страниц на засеянной базе (seed_data), сохраняет "
+        "результат в JSON и завершается с ошибкой при регрессии "
+        "относительно базового прогона."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("views", nargs="*", help="Какие страницы мерить.")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument(
+            "--output",
+            default=os.path.join(settings.BENCHMARK_DIR, "last.json"),
+        )
+        parser.add_argument(
+            "--baseline",
+            default=os.path.join(settings.BENCHMARK_DIR, "baseline.json"),
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=settings.BENCHMARK_TOLERANCE,
+            help="Допустимый относительный рост времени, памяти и размера.",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Записать результат как новый базовый.",
+        )
+
+    def handle(self, *args, **options):
+        if Post.objects.count() < settings.BENCHMARK_MIN_POSTS:
+            raise CommandError(
+                "В базе слишком мало постов для бенчмарка, "
+                "сначала выполните seed_data."
+            )
+        results = Benchmark(options["iterations"]).run(options["views"])
+        self.report(results)
+        self.save(options["output"], results)
+        if options["save_baseline"]:
+            self.save(options["baseline"], results)
+            return
+        if not os.path.exists(options["baseline"]):
+            self.stderr.write("Базового прогона нет, сравнивать не с чем.")
+            return
+        with open(options["baseline"]) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, options["tolerance"])
+        if regressions:
+            raise CommandError(
+                "Регрессии производительности:\n" + "\n".join(regressions)
+            )
+        self.stdout.write("Регрессий нет.")
+
+    def report(self, results):
+        self.stdout.write(
+            f"{'view':14}" + "".join(f"{metric:>10}" for metric in METRICS)
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:14}"
+                + "".join(f"{result[metric]:>10}" for metric in METRICS)
+            )
+
+    def save(self, path, results):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+
+from core.loadtest import LoadTest
+
+
+class Command(BaseCommand):
+    help = (
+        "Гоняет смесь запросов к основным страницам из нескольких потоков "
+        "и печатает пропускную способность и перцентили задержки по "
+        "каждому имени URL. Данные готовит команда seed_data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--login-share",
+            type=float,
+            default=0.5,
+            help="Доля потоков, которые заходят на сайт.",
+        )
+        parser.add_argument(
+            "--base-url",
+            help=(
+                "Адрес запущенного сервера, например http://127.0.0.1:8000. "
+                "Без него запросы идут через django.test.Client."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        elapsed, results = LoadTest(
+            options["requests"],
+            options["threads"],
+            seed=options["seed"],
+            base_url=options["base_url"],
+            login_share=options["login_share"],
+        ).run()
+        total = sum(result["count"] for result in results.values())
+        self.stdout.write(
+            f"{total} запросов за {elapsed:.2f} с, "
+            f"{total / elapsed:.1f} запросов/с, "
+            f"{options['threads']} потоков"
+        )
+        self.stdout.write(
+            f"{'view':22} {'count':>6} {'err':>4} {'rps':>7} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:22} {result['count']:6} {result['errors']:4} "
+                f"{result['count'] / elapsed:7.1f} "
+                f"{result['p50'] * 1000:8.1f} {result['p95'] * 1000:8.1f} "
+                f"{result['p99'] * 1000:8.1f}"
+            )
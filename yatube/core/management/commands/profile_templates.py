@@ -0,0 +1,58 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from core.benchmarks import build_cases, reader
+from core.template_profiler import profile_templates
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Рендерит страницы несколько раз и печатает время каждого шаблона "
+        "и include: полное и собственное, без вложенных шаблонов."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "urls",
+            nargs="*",
+            help="Адреса страниц. По умолчанию — страницы бенчмарка.",
+        )
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument(
+            "--user", help="Имя пользователя, от которого рендерить."
+        )
+        parser.add_argument("--top", type=int, default=30)
+
+    def handle(self, *args, **options):
+        client = Client(SERVER_NAME="localhost")
+        if options["user"]:
+            try:
+                client.force_login(User.objects.get(username=options["user"]))
+            except User.DoesNotExist:
+                raise CommandError(f"Нет пользователя {options['user']}.")
+        else:
+            client.force_login(reader())
+        urls = options["urls"] or [
+            url
+            for method, url, _, _ in build_cases().values()
+            if method == "get"
+        ]
+        with profile_templates() as profile:
+            for _ in range(options["iterations"]):
+                for url in urls:
+                    cache.clear()
+                    client.get(url)
+        renders = options["iterations"] * len(urls)
+        self.stdout.write(
+            f"{'template':45} {'calls':>7} {'total ms':>10} "
+            f"{'own ms':>10} {'own/page':>9}"
+        )
+        for name, calls, total, own in profile.rows()[: options["top"]]:
+            self.stdout.write(
+                f"{name[:45]:45} {calls:7} {total * 1000:10.1f} "
+                f"{own * 1000:10.1f} {own * 1000 / renders:9.2f}"
+            )
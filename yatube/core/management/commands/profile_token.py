@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.profiling import make_token
+
+
+class Command(BaseCommand):
+    help = "Печатает токен для заголовка X-Profile."
+
+    def handle(self, *args, **options):
+        self.stdout.write(make_token())
+        self.stderr.write(
+            f"Токен действует {settings.PROFILE_TOKEN_MAX_AGE} с. Пример: "
+            "curl -H 'X-Profile: <токен>' https://yatube/follow/"
+        )
@@ -0,0 +1,62 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.slow_queries import read_log
+
+ORDERINGS = {
+    "total": lambda row: row["total"],
+    "count": lambda row: row["count"],
+    "max": lambda row: row["max"],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Сводит журнал медленных запросов по отпечаткам SQL и печатает "
+        "топ по суммарному времени."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=10)
+        parser.add_argument(
+            "--sort", choices=sorted(ORDERINGS), default="total"
+        )
+        parser.add_argument("--log", default=settings.SLOW_QUERY_LOG)
+
+    def handle(self, *args, **options):
+        groups = defaultdict(
+            lambda: {"count": 0, "total": 0.0, "max": 0.0, "views": set()}
+        )
+        try:
+            entries = list(read_log(options["log"]))
+        except FileNotFoundError:
+            raise CommandError(f"Журнал {options['log']} не найден.")
+        for entry in entries:
+            group = groups[entry["fingerprint"]]
+            group["count"] += 1
+            group["total"] += entry["duration_ms"]
+            group["max"] = max(group["max"], entry["duration_ms"])
+            group["views"].add(entry["view"])
+            if entry["plan"]:
+                group["plan"] = entry["plan"]
+        rows = sorted(
+            (
+                {"fingerprint": shape, **group}
+                for shape, group in groups.items()
+            ),
+            key=ORDERINGS[options["sort"]],
+            reverse=True,
+        )
+        for number, row in enumerate(rows[: options["top"]], 1):
+            self.stdout.write(
+                f"{number}. total={row['total']:.1f}ms "
+                f"count={row['count']} "
+                f"avg={row['total'] / row['count']:.1f}ms "
+                f"max={row['max']:.1f}ms "
+                f"views={', '.join(sorted(row['views']))}"
+            )
+            self.stdout.write(f"   {row['fingerprint']}")
+            for step in row.get("plan", []):
+                self.stdout.write(f"   plan: {step}")
@@ -0,0 +1,52 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Копирует основную базу SQLite в файлы реплик через backup API. "
+        "С --interval работает в цикле, имитируя асинхронную репликацию."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Пауза между синхронизациями в секундах; 0 — один раз.",
+        )
+
+    def handle(self, *args, **options):
+        primary = settings.DATABASES["default"]
+        replicas = [
+            settings.DATABASES[alias] for alias in settings.DATABASE_REPLICAS
+        ]
+        if not replicas:
+            raise CommandError("Реплики не настроены (DB_REPLICA_PATH).")
+        if any(
+            connections[alias].vendor != "sqlite"
+            for alias in ["default", *settings.DATABASE_REPLICAS]
+        ):
+            raise CommandError("sync_replica работает только с SQLite.")
+        while True:
+            self.sync(primary["NAME"], [db["NAME"] for db in replicas])
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
+
+    def sync(self, source_path, target_paths):
+        source = sqlite3.connect(source_path)
+        try:
+            for path in target_paths:
+                target = sqlite3.connect(path)
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(f"{source_path} -> {path}")
+        finally:
+            source.close()
@@ -0,0 +1,334 @@
+"""Метрики в формате Prometheus, общие для всех процессов-воркеров.
+
+Каждый процесс копит значения в памяти и раз в METRICS_FLUSH_SECONDS
+сбрасывает их в файл METRICS_DIR/<pid>-<token>.json (запись атомарная,
+через os.replace). Эндпоинт /metrics складывает счётчики и гистограммы
+из файлов всех процессов, поэтому внешний сервис для агрегации не
+нужен. Счётчики завершившихся воркеров сливаются в один файл, а их
+собственные файлы удаляются: счётчики в Prometheus не «откатываются»
+назад, а число файлов не растёт с перезапусками. token не даёт новому
+процессу с тем же pid затереть файл старого. Gauge складывать нельзя:
+они отдаются с меткой pid и только для живых процессов.
+"""
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+
+# Имя -> (тип, описание).
+METRICS = {
+    "yatube_request_duration_seconds": (
+        "histogram",
+        "Время обработки запроса по имени URL.",
+    ),
+    "yatube_requests_total": ("counter", "Ответы по имени URL и статусу."),
+    "yatube_db_queries_total": ("counter", "SQL-запросы по имени URL."),
+    "yatube_cache_requests_total": (
+        "counter",
+        "Чтения кэша по префиксу ключа: попадания и промахи.",
+    ),
+    "yatube_thumbnails_total": (
+        "counter",
+        "Миниатюры: запрошенные и сгенерированные.",
+    ),
+    "yatube_db_pool": ("gauge", "Состояние пулов соединений (core/db_pool)."),
+    "yatube_memory_flagged_total": (
+        "counter",
+        "Запросы с пиком памяти выше MEMORY_TRACKING_THRESHOLD.",
+    ),
+}
+
+_lock = threading.Lock()
+_values = defaultdict(float)
+_gauges = {}
+_last_flush = time.monotonic()
+_token = uuid.uuid4().hex[:8]
+# Счётчики завершившихся процессов (см. _compact); не .json, чтобы
+# _read_files не принял его за файл воркера.
+_EXITED = "exited.data"
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name, labels, value=1):
+    key = _key(name, labels)
+    with _lock:
+        _values[key] += value
+
+
+def observe(name, labels, value):
+    """Добавляет наблюдение в гистограмму name.
+
+    Корзины хранятся некумулятивно, суммы считаются при выводе.
+    """
+    bucket = next(
+        (str(le) for le in settings.METRICS_BUCKETS if value <= le), "+Inf"
+    )
+    bucket_key = _key(name + "_bucket", {**labels, "le": bucket})
+    sum_key = _key(name + "_sum", labels)
+    count_key = _key(name + "_count", labels)
+    with _lock:
+        _values[bucket_key] += 1
+        _values[sum_key] += value
+        _values[count_key] += 1
+
+
+def set_gauge(name, labels, value):
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+_CACHE_PREFIX = re.compile(r"[.:|]")
+
+
+def cache_key_prefix(key):
+    """Префикс ключа кэша для меток.
+
+    Для cache_page это key_prefix декоратора (index_page, ...),
+    для остальных ключей — начало до первого разделителя.
+    """
+    if key.startswith("views.decorators.cache."):
+        return key.split(".")[4] or "cache_page"
+    return _CACHE_PREFIX.split(key, 1)[0]
+
+
+def _path(pid):
+    return os.path.join(settings.METRICS_DIR, f"{pid}-{_token}.json")
+
+
+def _pid_alive(pid):
+    if os.name != "posix":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _collect_pools():
+    from core.db_pool import all_pools
+
+    for alias, pool in all_pools().items():
+        for stat, value in pool.stats().items():
+            set_gauge("yatube_db_pool", {"alias": alias, "stat": stat}, value)
+
+
+def flush():
+    """Сбрасывает значения текущего процесса в его файл."""
+    global _last_flush
+    _collect_pools()
+    with _lock:
+        rows = [
+            [name, dict(labels), value, "counter"]
+            for (name, labels), value in _values.items()
+        ] + [
+            [name, dict(labels), value, "gauge"]
+            for (name, labels), value in _gauges.items()
+        ]
+        _last_flush = time.monotonic()
+    os.makedirs(settings.METRICS_DIR, exist_ok=True)
+    path = _path(os.getpid())
+    with open(path + ".tmp", "w") as file:
+        json.dump(rows, file)
+    os.replace(path + ".tmp", path)
+
+
+def maybe_flush():
+    if time.monotonic() - _last_flush >= settings.METRICS_FLUSH_SECONDS:
+        flush()
+
+
+def _file_pid(filename):
+    pid = filename[: -len(".json")].split("-")[0]
+    return pid if pid.isdigit() else None
+
+
+def _read_rows(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _read_files():
+    """(pid или None, время изменения, строки) каждого файла метрик."""
+    for filename in os.listdir(settings.METRICS_DIR):
+        if not filename.endswith(".json"):
+            continue
+        path = os.path.join(settings.METRICS_DIR, filename)
+        rows = _read_rows(path)
+        try:
+            modified = os.stat(path).st_mtime
+        except OSError:
+            continue
+        if rows is not None:
+            yield _file_pid(filename), modified, rows
+
+
+def _read_exited():
+    path = os.path.join(settings.METRICS_DIR, _EXITED)
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {"rows": [], "merged": []}
+
+
+def _add_counters(totals, rows):
+    for name, labels, value, kind in rows:
+        if kind != "gauge":
+            totals[_key(name, labels)] += value
+
+
+def _dead_files():
+    for filename in os.listdir(settings.METRICS_DIR):
+        if not filename.endswith(".json"):
+            continue
+        pid = _file_pid(filename)
+        if pid is not None and not _pid_alive(int(pid)):
+            yield filename
+
+
+def _write_exited(totals, merged):
+    path = os.path.join(settings.METRICS_DIR, _EXITED)
+    rows = [
+        [name, dict(labels), value, "counter"]
+        for (name, labels), value in totals.items()
+    ]
+    with open(path + ".tmp", "w") as file:
+        json.dump({"rows": rows, "merged": merged}, file)
+    os.replace(path + ".tmp", path)
+
+
+@contextmanager
+def _dir_lock():
+    """Один процесс за раз сливает и читает файлы METRICS_DIR."""
+    if os.name != "posix":
+        yield
+        return
+    import fcntl
+
+    with open(os.path.join(settings.METRICS_DIR, ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def _compact():
+    """Сливает счётчики завершившихся процессов в один файл _EXITED.
+
+    Файлы мёртвых pid удаляются, чтобы их число не росло с каждым
+    перезапуском воркеров. В _EXITED записываются и имена слитых файлов:
+    если процесс упадёт до их удаления, следующий вызов просто удалит
+    их, не прибавив второй раз. Вызывается под _dir_lock.
+    """
+    exited = _read_exited()
+    totals = defaultdict(float)
+    _add_counters(totals, exited["rows"])
+    merged = []
+    for filename in _dead_files():
+        path = os.path.join(settings.METRICS_DIR, filename)
+        if filename in exited["merged"]:
+            os.remove(path)
+            continue
+        _add_counters(totals, _read_rows(path) or [])
+        merged.append(filename)
+    if merged:
+        _write_exited(totals, merged)
+        for filename in merged:
+            os.remove(os.path.join(settings.METRICS_DIR, filename))
+
+
+def collect():
+    """Значения всех процессов: {(имя, метки): значение}.
+
+    Счётчики и гистограммы суммируются по всем файлам, включая слитый
+    файл завершившихся процессов; gauge берутся из самого свежего файла
+    каждого живого процесса с меткой pid.
+    """
+    flush()
+    totals = defaultdict(float)
+    gauges = {}
+    with _dir_lock():
+        _compact()
+        _add_counters(totals, _read_exited()["rows"])
+        for pid, modified, rows in _read_files():
+            _add_counters(totals, rows)
+            if pid is None or not _pid_alive(int(pid)):
+                continue
+            if pid not in gauges or gauges[pid][0] < modified:
+                gauges[pid] = (modified, rows)
+    for pid, (_, rows) in gauges.items():
+        for name, labels, value, kind in rows:
+            if kind == "gauge":
+                totals[_key(name, {**labels, "pid": pid})] = value
+    return totals
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name, str(value).replace("\\", r"\\").replace('"', r"\"")
+        )
+        for name, value in labels
+    )
+    return "{" + pairs + "}"
+
+
+def _base_name(name):
+    for suffix in ("_bucket", "_sum", "_count"):
+        if name.endswith(suffix) and name[: -len(suffix)] in METRICS:
+            return name[: -len(suffix)]
+    return name
+
+
+def render(totals):
+    """Текстовый формат экспозиции Prometheus."""
+    families = defaultdict(list)
+    for (name, labels), value in totals.items():
+        families[_base_name(name)].append((name, labels, value))
+    lines = []
+    for family in sorted(families):
+        kind, description = METRICS.get(family, ("untyped", ""))
+        lines.append(f"# HELP {family} {description}")
+        lines.append(f"# TYPE {family} {kind}")
+        samples = sorted(families[family])
+        if kind == "histogram":
+            samples = _cumulative(family, samples)
+        for name, labels, value in samples:
+            lines.append(f"{name}{_format_labels(labels)} {value:.10g}")
+    return "\n".join(lines) + "\n"
+
+
+def _cumulative(family, samples):
+    """Делает корзины гистограммы кумулятивными и добавляет +Inf."""
+    buckets = defaultdict(list)
+    rest = []
+    for name, labels, value in samples:
+        if name.endswith("_bucket"):
+            series = tuple(pair for pair in labels if pair[0] != "le")
+            buckets[series].append((labels, value))
+        else:
+            rest.append((name, labels, value))
+    result = []
+    for series, items in buckets.items():
+        observed = {dict(labels)["le"]: value for labels, value in items}
+        running = 0
+        for le in [str(le) for le in settings.METRICS_BUCKETS] + ["+Inf"]:
+            running += observed.get(le, 0)
+            labels = tuple(sorted(series + (("le", le),)))
+            result.append((family + "_bucket", labels, running))
+    return result + rest
@@ -0,0 +1,49 @@
+import re
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+_QVALUE = re.compile(r"\bq\s*=\s*([0-9.]+)")
+
+
+def accepts_gzip(header):
+    """Принимает ли клиент gzip с учётом q-значений (gzip;q=0 — нет)."""
+    qualities = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        match = _QVALUE.search(params)
+        try:
+            quality = float(match.group(1)) if match else 1.0
+        except ValueError:
+            quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZipMiddleware с настраиваемым порогом и списком типов.
+
+    Ответы меньше GZIP_MIN_SIZE байт не сжимаются: выигрыш меньше
+    накладных расходов. Потоковые ответы сжимаются на лету, кроме
+    text/event-stream — gzip буферизует данные, и события доходили бы
+    до браузера пачками. Картинки и архивы уже сжаты и пропускаются.
+    Accept-Encoding разбирается с q-значениями: в Django gzip;q=0
+    считается согласием на gzip.
+    """
+
+    def process_response(self, request, response):
+        content_type = response.get("Content-Type", "").split(";")[0]
+        if not content_type.startswith(settings.GZIP_CONTENT_TYPES):
+            return response
+        if content_type in settings.GZIP_EXCLUDED_CONTENT_TYPES:
+            return response
+        if (
+            not response.streaming
+            and len(response.content) < settings.GZIP_MIN_SIZE
+        ):
+            return response
+        if not accepts_gzip(request.META.get("HTTP_ACCEPT_ENCODING", "")):
+            patch_vary_headers(response, ("Accept-Encoding",))
+            return response
+        return super().process_response(request, response)
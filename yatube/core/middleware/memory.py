@@ -0,0 +1,70 @@
+import json
+import logging
+import tracemalloc
+
+from django.conf import settings
+
+from core import metrics
+
+logger = logging.getLogger("yatube.memory")
+
+# Служебные аллокации самого tracemalloc и импорта в отчёт не попадают.
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+
+class MemoryTrackingMiddleware:
+    """Диагностика памяти запроса через tracemalloc.
+
+    Включается MEMORY_TRACKING_ENABLED: трассировка замедляет Python в
+    разы, поэтому это режим для отладки, а не для постоянной работы.
+    В начале запроса трассы сбрасываются (clear_traces обнуляет и пик,
+    в отличие от reset_peak работает до Python 3.9), поэтому пик
+    считается только по аллокациям запроса. Снимок памяти берётся один
+    раз и только для запросов с пиком больше MEMORY_TRACKING_THRESHOLD:
+    они пишутся в лог вместе с местами самых крупных аллокаций, ещё
+    живых к концу запроса. tracemalloc глобален для процесса, так что
+    точные цифры получаются только при одном потоке на воркер.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.MEMORY_TRACKING_ENABLED:
+            return self.get_response(request)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(settings.MEMORY_TRACKING_FRAMES)
+        tracemalloc.clear_traces()
+        response = self.get_response(request)
+        _, peak = tracemalloc.get_traced_memory()
+        response["X-Memory-Peak"] = str(peak)
+        if peak > settings.MEMORY_TRACKING_THRESHOLD:
+            snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+            self.report(request, response, peak, snapshot.statistics("lineno"))
+        return response
+
+    def report(self, request, response, peak, statistics):
+        match = request.resolver_match
+        view = match.view_name if match else "unmatched"
+        metrics.inc("yatube_memory_flagged_total", {"view": view})
+        top = [
+            {
+                "site": str(statistic.traceback),
+                "size": statistic.size,
+                "count": statistic.count,
+            }
+            for statistic in statistics[: settings.MEMORY_TRACKING_TOP]
+        ]
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": view,
+            "status": response.status_code,
+            "peak_bytes": peak,
+            "top": top,
+        }
+        logger.warning(json.dumps(record))
@@ -0,0 +1,44 @@
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from core import metrics
+
+
+class MetricsMiddleware:
+    """Собирает метрики запросов для /metrics.
+
+    Время, статус и число SQL-запросов учитываются по имени URL
+    (posts:index, posts:profile, ...), а не по пути, чтобы число
+    временных рядов не зависело от числа постов и пользователей.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = []
+
+        def count_query(execute, sql, params, many, context):
+            queries.append(None)
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_query))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        view = match.view_name if match else "unmatched"
+        metrics.observe(
+            "yatube_request_duration_seconds", {"view": view}, duration
+        )
+        metrics.inc(
+            "yatube_requests_total",
+            {"view": view, "status": str(response.status_code)},
+        )
+        metrics.inc("yatube_db_queries_total", {"view": view}, len(queries))
+        metrics.maybe_flush()
+        return response
@@ -0,0 +1,33 @@
+import cProfile
+import logging
+import time
+
+from core import profiling
+
+logger = logging.getLogger("yatube.profiling")
+
+
+class ProfilingMiddleware:
+    """Снимает cProfile запроса, выбранного core.profiling."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not profiling.should_profile(request):
+            return self.get_response(request)
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        name = profiling.save(
+            profiler, match.view_name if match else "unmatched", duration
+        )
+        logger.info("%s %s профиль %s", request.method, request.path, name)
+        response["X-Profile-Id"] = name
+        return response
@@ -0,0 +1,64 @@
+import logging
+import traceback
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from core.queries import QueryBudgetExceeded, QueryRecorder
+
+logger = logging.getLogger("yatube.queries")
+
+
+class QueryBudgetMiddleware:
+    """Считает SQL-запросы запроса и ищет повторы одной формы (N+1).
+
+    Работает при QUERY_BUDGET_ENABLED. Предел задаётся декоратором
+    core.queries.query_budget, иначе QUERY_BUDGET_DEFAULT. Нарушения
+    пишутся в лог со стеком; при QUERY_BUDGET_RAISE запрос падает
+    с QueryBudgetExceeded — так их ловят тесты.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_BUDGET_ENABLED:
+            return self.get_response(request)
+        recorder = QueryRecorder(settings.QUERY_BUDGET_IGNORE)
+        request.query_budget = settings.QUERY_BUDGET_DEFAULT
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        response["X-Query-Count"] = str(recorder.count)
+        problems = self.check(request, recorder)
+        if problems:
+            message = f"{request.method} {request.path}: " + "\n".join(
+                problems
+            )
+            logger.warning(message)
+            if settings.QUERY_BUDGET_RAISE:
+                raise QueryBudgetExceeded(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = getattr(
+            view_func, "query_budget", settings.QUERY_BUDGET_DEFAULT
+        )
+
+    def check(self, request, recorder):
+        problems = []
+        if recorder.count > request.query_budget:
+            problems.append(
+                f"{recorder.count} запросов к БД при бюджете "
+                f"{request.query_budget}"
+            )
+        for shape, count in recorder.repeated(
+            settings.QUERY_REPEAT_THRESHOLD
+        ):
+            stack = "".join(traceback.format_list(recorder.stacks[shape]))
+            problems.append(
+                f"запрос повторён {count} раз (N+1?): {shape}\n{stack}"
+            )
+        return problems
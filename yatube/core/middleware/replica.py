@@ -0,0 +1,38 @@
+from django.conf import settings
+
+from core.routers import set_replica_reads
+
+
+class ReplicaRoutingMiddleware:
+    """Включает чтение с реплики для безопасных запросов.
+
+    После запроса с записью (POST и т. п.) клиент получает cookie на
+    REPLICA_STICKY_SECONDS, и пока она жива, все его чтения идут в
+    default — так автор сразу видит свой новый пост или комментарий.
+    Сессия и пользователь загружаются уже после включения флага, поэтому
+    ReplicaRouter всегда читает их из default.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            set_replica_reads(False)
+        if request.method not in ("GET", "HEAD"):
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE,
+                "1",
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        set_replica_reads(
+            request.method in ("GET", "HEAD")
+            and getattr(view_func, "replica_reads", False)
+            and settings.REPLICA_STICKY_COOKIE not in request.COOKIES
+        )
@@ -0,0 +1,27 @@
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from core.slow_queries import SlowQueryWrapper
+
+
+class SlowQueryMiddleware:
+    """Подключает журнал медленных запросов к каждому запросу."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if settings.SLOW_QUERY_THRESHOLD_MS is None:
+            return self.get_response(request)
+
+        def view():
+            match = request.resolver_match
+            return match.view_name if match else request.path
+
+        wrapper = SlowQueryWrapper(view)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(wrapper))
+            return self.get_response(request)
@@ -0,0 +1,96 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from core import instrumentation
+
+logger = logging.getLogger("yatube.timing")
+
+# Имя метрики Server-Timing -> ключ сборщика.
+SERVER_TIMING = (
+    ("db", "db"),
+    ("cache", "cache"),
+    ("tpl", "template"),
+    ("thumb", "thumbnail"),
+)
+
+
+class ServerTimingMiddleware:
+    """Отдаёт заголовок Server-Timing и пишет строку лога в JSON.
+
+    Замеряется доля запросов SERVER_TIMING_SAMPLE_RATE; остальные
+    проходят без обёрток. Лог пишется для всех замеренных запросов,
+    а заголовок получают только сотрудники и адреса из
+    SERVER_TIMING_ALLOWED_IPS. Middleware стоит первым, чтобы total
+    включал все остальные.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.SERVER_TIMING_SAMPLE_RATE:
+            return self.get_response(request)
+        timings = instrumentation.start()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(instrumentation.db_wrapper)
+                    )
+                response = self.get_response(request)
+        finally:
+            instrumentation.stop()
+        total = time.perf_counter() - started
+        if self.header_allowed(request):
+            response["Server-Timing"] = self.header(timings, total)
+        record = self.log_record(request, response, timings, total)
+        logger.info(json.dumps(record))
+        return response
+
+    def header_allowed(self, request):
+        if request.META.get("REMOTE_ADDR") in (
+            settings.SERVER_TIMING_ALLOWED_IPS
+        ):
+            return True
+        # request.user выставляет AuthenticationMiddleware, стоящий ниже.
+        user = getattr(request, "user", None)
+        return bool(user and user.is_staff)
+
+    def header(self, timings, total):
+        metrics = [
+            f"{name};dur={timings.durations[key] * 1000:.1f};"
+            f'desc="{timings.counts[key]}"'
+            for name, key in SERVER_TIMING
+            if timings.counts[key]
+        ]
+        if timings.counts["cache"]:
+            metrics.append(
+                f'cache-hit;desc="{timings.counts["cache_hit"]}/'
+                f'{timings.counts["cache"]}"'
+            )
+        metrics.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(metrics)
+
+    def log_record(self, request, response, timings, total):
+        match = request.resolver_match
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 2),
+            "cache_hits": timings.counts["cache_hit"],
+            "cache_misses": timings.counts["cache_miss"],
+            "thumbnails_generated": timings.counts["thumbnail_generated"],
+        }
+        for _, key in SERVER_TIMING:
+            record[f"{key}_ms"] = round(timings.durations[key] * 1000, 2)
+            record[f"{key}_count"] = timings.counts[key]
+        return record
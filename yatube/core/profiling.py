@@ -0,0 +1,90 @@
+"""Профилирование отдельных запросов в продакшене.
+
+Запрос профилируется, если в заголовке X-Profile пришёл подписанный
+токен (его печатает команда profile_token) или он попал в долю
+PROFILE_SAMPLE_RATE. Результат — файл pstats в PROFILE_DIR; хранятся
+только PROFILE_MAX_FILES последних файлов.
+"""
+import os
+import random
+import re
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+HEADER = "HTTP_X_PROFILE"
+SALT = "core.profiling"
+# Имя файла: дата-время, имя URL, длительность, случайный суффикс.
+FILENAME = re.compile(r"^[\w.-]+\.prof$")
+
+
+def make_token():
+    return signing.TimestampSigner(salt=SALT).sign("profile")
+
+
+def token_is_valid(token):
+    try:
+        signing.TimestampSigner(salt=SALT).unsign(
+            token, max_age=settings.PROFILE_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def should_profile(request):
+    token = request.META.get(HEADER)
+    if token:
+        return token_is_valid(token)
+    return random.random() < settings.PROFILE_SAMPLE_RATE
+
+
+def save(profiler, view_name, duration):
+    """Сохраняет профиль и удаляет самые старые сверх лимита."""
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    filename = "{}-{}-{}ms-{}.prof".format(
+        timezone.now().strftime("%Y%m%d-%H%M%S"),
+        re.sub(r"[^\w.-]", "_", view_name),
+        int(duration * 1000),
+        uuid.uuid4().hex[:6],
+    )
+    profiler.dump_stats(os.path.join(settings.PROFILE_DIR, filename))
+    for stale in list_profiles()[settings.PROFILE_MAX_FILES:]:
+        try:
+            os.remove(stale["path"])
+        except FileNotFoundError:
+            pass
+    return filename
+
+
+def list_profiles():
+    """Сохранённые профили, новые первыми."""
+    if not os.path.isdir(settings.PROFILE_DIR):
+        return []
+    profiles = []
+    for name in os.listdir(settings.PROFILE_DIR):
+        if not FILENAME.match(name):
+            continue
+        path = os.path.join(settings.PROFILE_DIR, name)
+        stat = os.stat(path)
+        profiles.append(
+            {
+                "name": name,
+                "path": path,
+                "size": stat.st_size,
+                "created": stat.st_mtime,
+                "order": (stat.st_mtime_ns, name),
+            }
+        )
+    profiles.sort(key=lambda profile: profile["order"], reverse=True)
+    return profiles
+
+
+def profile_path(name):
+    """Путь к профилю по имени файла или None, если такого нет."""
+    if not FILENAME.match(name):
+        return None
+    path = os.path.join(settings.PROFILE_DIR, name)
+    return path if os.path.isfile(path) else None
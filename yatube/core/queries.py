@@ -0,0 +1,84 @@
+import os
+import re
+import traceback
+from collections import Counter
+
+from django.conf import settings
+
+_LITERALS = (
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r'(?<![\w."])-?\b\d+(?:\.\d+)?\b'), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(...)"),
+    (re.compile(r"\s+"), " "),
+)
+
+
+def fingerprint(sql):
+    """Приводит SQL к форме без литералов.
+
+    Запросы, отличающиеся только значениями параметров и длиной списка
+    в IN (...), получают одинаковый отпечаток.
+    """
+    for pattern, replacement in _LITERALS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def project_stack(limit=8):
+    """Кадры стека из кода проекта, без Django и сторонних пакетов."""
+    frames = [
+        frame
+        for frame in traceback.extract_stack()[:-1]
+        if frame.filename.startswith(settings.BASE_DIR)
+        and "site-packages" not in frame.filename
+        and os.sep + "core" + os.sep + "queries.py" not in frame.filename
+    ]
+    return frames[-limit:]
+
+
+class QueryBudgetExceeded(Exception):
+    """Представление выполнило больше запросов, чем разрешено."""
+
+
+class QueryRecorder:
+    """execute_wrapper, запоминающий отпечатки и стеки запросов.
+
+    Запросы, содержащие одну из подстрок ignore, не учитываются.
+    """
+
+    def __init__(self, ignore=()):
+        self.ignore = ignore
+        self.count = 0
+        self.shapes = Counter()
+        self.stacks = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        if not any(pattern in sql for pattern in self.ignore):
+            self.count += 1
+            shape = fingerprint(sql)
+            self.shapes[shape] += 1
+            if shape not in self.stacks:
+                self.stacks[shape] = project_stack()
+        return execute(sql, params, many, context)
+
+    def repeated(self, threshold):
+        """Отпечатки, выполненные не меньше threshold раз (N+1)."""
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+
+def query_budget(max_queries):
+    """Задаёт представлению предел числа SQL-запросов.
+
+    Проверку выполняет core.middleware.queries.QueryBudgetMiddleware.
+    """
+
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+
+    return decorator
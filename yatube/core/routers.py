@@ -0,0 +1,53 @@
+import random
+import threading
+
+from django.conf import settings
+
+_state = threading.local()
+
+# Сессии и пользователи читаются только из default: middleware
+# загружает их при каждом запросе, и отстающая реплика разлогинила бы
+# только что вошедшего или показала бы устаревшие права.
+PRIMARY_ONLY_APPS = {"auth", "sessions"}
+
+
+def set_replica_reads(enabled):
+    _state.replica_reads = enabled
+
+
+def replica_reads_enabled():
+    return getattr(_state, "replica_reads", False)
+
+
+def replica_reads(view):
+    """Разрешает представлению читать с реплики.
+
+    Подходит только для GET-представлений, которые ничего не пишут;
+    решение принимает core.middleware.replica.ReplicaRoutingMiddleware.
+    """
+    view.replica_reads = True
+    return view
+
+
+class ReplicaRouter:
+    """Отправляет чтения помеченных представлений на реплики.
+
+    Запись, миграции, сессии, пользователи и все остальные чтения идут
+    в default.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return "default"
+        if settings.DATABASE_REPLICAS and replica_reads_enabled():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
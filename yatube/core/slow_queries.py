@@ -0,0 +1,88 @@
+"""Журнал медленных SQL-запросов.
+
+Запрос дольше SLOW_QUERY_THRESHOLD_MS дописывается строкой JSON в
+SLOW_QUERY_LOG: отпечаток (core.queries.fingerprint), время, имя URL
+и план EXPLAIN QUERY PLAN, снятый сразу же на том же соединении.
+Команда slow_query_report сводит журнал в топ по суммарному времени.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.queries import fingerprint
+
+logger = logging.getLogger("yatube.slow_queries")
+
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+def explain(connection, sql, params):
+    """План запроса или None, если его не снять."""
+    if not sql.lstrip().upper().startswith("SELECT"):
+        return None
+    prefix = (
+        "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+    )
+    _local.explaining = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            return [" ".join(map(str, row)) for row in cursor.fetchall()]
+    except Exception:
+        return None
+    finally:
+        _local.explaining = False
+
+
+def write(entry):
+    line = json.dumps(entry, ensure_ascii=False) + "\n"
+    os.makedirs(os.path.dirname(settings.SLOW_QUERY_LOG), exist_ok=True)
+    with _write_lock, open(settings.SLOW_QUERY_LOG, "a") as file:
+        file.write(line)
+
+
+class SlowQueryWrapper:
+    """execute_wrapper, пишущий медленные запросы в журнал."""
+
+    def __init__(self, view):
+        self.view = view
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(_local, "explaining", False):
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = (time.perf_counter() - started) * 1000
+        if duration >= settings.SLOW_QUERY_THRESHOLD_MS:
+            self.log(sql, params, many, context, duration)
+        return result
+
+    def log(self, sql, params, many, context, duration):
+        shape = fingerprint(sql)
+        entry = {
+            "time": timezone.now().isoformat(),
+            "view": self.view(),
+            "duration_ms": round(duration, 3),
+            "fingerprint": shape,
+            "plan": None if many else explain(
+                context["connection"], sql, params
+            ),
+        }
+        write(entry)
+        logger.warning("%.1f ms %s: %s", duration, entry["view"], shape)
+
+
+def read_log(path):
+    """Записи журнала; битые строки (оборванная запись) пропускаются."""
+    with open(path) as file:
+        for line in file:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
@@ -0,0 +1,58 @@
+"""Хранилище статики с хэшами в именах и сжатыми копиями."""
+import gzip
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+# ManifestStaticFilesStorage вставляет первые 12 символов md5 перед
+# расширением: css/main.3f2a9c1d7b4e.css.
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}(\.[^./]+)?$")
+
+
+def is_hashed(name):
+    return bool(HASHED_NAME.search(name))
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest-хранилище, которое при collectstatic пишет .gz-копии.
+
+    Сжимаются только файлы с хэшем в имени и расширением из
+    STATIC_COMPRESS_EXTENSIONS; копия сохраняется, если она меньше
+    оригинала. Отдаёт их core.views.static_file.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = set()
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if not isinstance(hashed_name, Exception):
+                hashed_names.add(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for hashed_name in sorted(hashed_names):
+            compressed = self.compress(hashed_name)
+            if compressed:
+                yield hashed_name, compressed, True
+
+    def compress(self, name):
+        extension = os.path.splitext(name)[1].lower()
+        if extension not in settings.STATIC_COMPRESS_EXTENSIONS:
+            return None
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < settings.STATIC_COMPRESS_MIN_SIZE:
+            return None
+        # mtime=0: одинаковый вход даёт побайтно одинаковый архив.
+        compressed = gzip.compress(content, compresslevel=9, mtime=0)
+        if len(compressed) >= len(content):
+            return None
+        compressed_name = name + ".gz"
+        if self.exists(compressed_name):
+            self.delete(compressed_name)
+        self._save(compressed_name, ContentFile(compressed))
+        return compressed_name
@@ -0,0 +1,71 @@
+import os
+
+from django.template import TemplateDoesNotExist, engines
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+from core.instrumentation import timed
+
+
+class InstrumentedTemplate(Template):
+    def render(self, context=None, request=None):
+        with timed("template"):
+            return super().render(context, request)
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """Шаблонизатор Django, замеряющий время рендера для Server-Timing.
+
+    Время шаблона включает все его {% include %}.
+    """
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(
+            self.engine.from_string(template_code), self
+        )
+
+    def get_template(self, template_name):
+        try:
+            return InstrumentedTemplate(
+                self.engine.get_template(template_name), self
+            )
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+def template_names(engine):
+    """Имена всех шаблонов .html и .txt в каталогах загрузчиков."""
+    loaders = []
+    for loader in engine.template_loaders:
+        loaders.extend(getattr(loader, "loaders", [loader]))
+    names = set()
+    for loader in loaders:
+        for directory in loader.get_dirs():
+            for root, _, files in os.walk(directory):
+                names.update(
+                    os.path.relpath(os.path.join(root, name), directory)
+                    for name in files
+                    if name.endswith((".html", ".txt"))
+                )
+    return sorted(names)
+
+
+def warm_up():
+    """Компилирует все шаблоны заранее, заполняя кэширующий загрузчик.
+
+    Иначе первый запрос к каждой странице воркера платит за разбор
+    шаблонов. Возвращает число скомпилированных шаблонов.
+    """
+    compiled = 0
+    for backend in engines.all():
+        engine = getattr(backend, "engine", None)
+        if engine is None:
+            continue
+        for name in template_names(engine):
+            try:
+                engine.get_template(name)
+            except Exception:
+                # Шаблоны сторонних приложений могут требовать
+                # библиотек тегов, которых нет в проекте.
+                continue
+            compiled += 1
+    return compiled
@@ -0,0 +1,62 @@
+"""Загрузчик шаблонов, сжимающий HTML до компиляции.
+
+Минификация выполняется над исходником шаблона, один раз при его
+загрузке; с кэширующим загрузчиком ответы её уже не оплачивают.
+Сжимаются только страницы проекта из TEMPLATES_DIR: шаблоны приложений
+(админка, registration/password_reset_email.html) и письма рендерятся
+в текст, где переводы строк и отступы значимы.
+"""
+import fnmatch
+import os
+import re
+
+from django.conf import settings
+from django.template.loaders import filesystem
+
+# Содержимое, где пробелы значимы, остаётся как есть.
+_PROTECTED = re.compile(
+    r"(<(pre|textarea)\b.*?</\2\s*>)", re.IGNORECASE | re.DOTALL
+)
+# Комментарии с тегами шаблона и условные комментарии IE не трогаем.
+_COMMENT = re.compile(r"<!--(?!\[if)(?:(?!{[{%]).)*?-->", re.DOTALL)
+_BLANK = re.compile(r"[ \t\r\f\v]*\n\s*")
+_SPACES = re.compile(r"[ \t\r\f\v]{2,}")
+
+
+def minify_html(source):
+    """Убирает отступы, пустые строки и HTML-комментарии.
+
+    Пробелы с переводом строки заменяются одним переводом строки, а не
+    удаляются: между строчными элементами пробел значим, а в JS перевод
+    строки завершает инструкцию.
+    """
+    parts = _PROTECTED.split(source)
+    # split с двумя группами: текст, блок, имя тега, текст, ...
+    for index in range(0, len(parts), 3):
+        text = _COMMENT.sub("", parts[index])
+        text = _BLANK.sub("\n", text)
+        parts[index] = _SPACES.sub(" ", text)
+    del parts[2::3]
+    return "".join(parts).strip()
+
+
+def is_page_template(origin):
+    """Шаблон HTML-страницы проекта, а не письма или шаблон приложения."""
+    root = os.path.join(os.path.abspath(settings.TEMPLATES_DIR), "")
+    name = origin.template_name or ""
+    return (
+        origin.name.endswith(".html")
+        and os.path.abspath(origin.name).startswith(root)
+        and not name.startswith("registration/")
+        and not fnmatch.fnmatch(os.path.basename(name), "*_email.*")
+    )
+
+
+class FilesystemLoader(filesystem.Loader):
+    """Сжимает страницы проекта; остальные шаблоны не меняются."""
+
+    def get_contents(self, origin):
+        contents = super().get_contents(origin)
+        if is_page_template(origin):
+            return minify_html(contents)
+        return contents
@@ -0,0 +1,81 @@
+"""Профилировщик рендера шаблонов.
+
+На время блока profile_templates() подменяет Template._render и
+BlockNode.render и считает для каждого шаблона и блока число рендеров,
+полное время и собственное время — без вложенных шаблонов и блоков.
+Блок учитывается под именем шаблона, где он объявлен: содержимое
+{% block content %} страницы попадает в «base.html {% block content %}».
+Подмена глобальная, поэтому профилировщик предназначен для команды
+profile_templates, а не для работающего сервера.
+"""
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.template.base import Template
+from django.template.loader_tags import BlockNode
+
+
+class TemplateProfile:
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.total = defaultdict(float)
+        self.own = defaultdict(float)
+        self._children = []
+
+    def enter(self):
+        self._children.append(0.0)
+
+    def exit(self, name, elapsed):
+        children = self._children.pop()
+        if self._children:
+            self._children[-1] += elapsed
+        self.calls[name] += 1
+        self.total[name] += elapsed
+        self.own[name] += elapsed - children
+
+    def rows(self):
+        """Строки (шаблон, рендеров, полное время, собственное время).
+
+        Первыми идут шаблоны с наибольшим собственным временем.
+        """
+        return sorted(
+            (
+                (name, self.calls[name], self.total[name], self.own[name])
+                for name in self.calls
+            ),
+            key=lambda row: row[3],
+            reverse=True,
+        )
+
+
+def _timed(profile, method, name):
+    def wrapper(self, context):
+        profile.enter()
+        started = time.perf_counter()
+        try:
+            return method(self, context)
+        finally:
+            profile.exit(name(self), time.perf_counter() - started)
+
+    return wrapper
+
+
+def _block_name(node):
+    return f"{node.origin.template_name} {{% block {node.name} %}}"
+
+
+@contextmanager
+def profile_templates():
+    profile = TemplateProfile()
+    render_template = Template._render
+    render_block = BlockNode.render
+    Template._render = _timed(
+        profile, render_template, lambda template: template.name or "<string>"
+    )
+    BlockNode.render = _timed(profile, render_block, _block_name)
+    try:
+        yield profile
+    finally:
+        Template._render = render_template
+        BlockNode.render = render_block
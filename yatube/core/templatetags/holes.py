@@ -0,0 +1,21 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from core.holes import marker, punching, render_fragment
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def hole(context, template_name, cache=True, **params):
+    """Пользовательский фрагмент страницы из кэша core.holes.
+
+    Фрагмент рендерится отдельно с params и контекст-процессорами, а не
+    с контекстом страницы, поэтому params должны сериализоваться в JSON.
+    Готовый HTML (например, виджет формы) передаётся строкой и выводится
+    во фрагменте через |safe.
+    """
+    request = context.get("request")
+    if request is not None and punching(request):
+        return mark_safe(marker(template_name, params, cache))
+    return mark_safe(render_fragment(request, template_name, params))
@@ -0,0 +1,17 @@
+import logging
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class QueryBudgetTestRunner(DiscoverRunner):
+    """Тестовый раннер, в котором превышение бюджета запросов — ошибка.
+
+    Информационные строки логов yatube в тестах не выводятся.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.QUERY_BUDGET_ENABLED = True
+        settings.QUERY_BUDGET_RAISE = True
+        logging.getLogger("yatube").setLevel(logging.WARNING)
@@ -0,0 +1,30 @@
+"""Помощники для тестов."""
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+@contextmanager
+def capture_on_commit_callbacks(using=DEFAULT_DB_ALIAS, execute=False):
+    """Аналог TestCase.captureOnCommitCallbacks из Django 3.2+.
+
+    TestCase держит каждый тест в транзакции, поэтому колбэки
+    transaction.on_commit сами не вызываются. Здесь они собираются
+    в список и при execute=True выполняются, включая добавленные
+    самими колбэками.
+    """
+    callbacks = []
+    connection = connections[using]
+    start = len(connection.run_on_commit)
+    try:
+        yield callbacks
+    finally:
+        while True:
+            added = connection.run_on_commit[start:]
+            if not added:
+                break
+            start += len(added)
+            for _, callback in added:
+                callbacks.append(callback)
+                if execute:
+                    callback()
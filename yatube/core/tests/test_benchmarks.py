@@ -0,0 +1,108 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from posts.models import Comment, Post
+
+from ..benchmarks import compare
+
+BENCHMARK_DIR = tempfile.mkdtemp()
+
+
+class CompareTests(TestCase):
+    def test_relative_and_exact_metrics(self):
+        """Время сравнивается с допуском, число запросов — точно."""
+        baseline = {"index": {"p50_ms": 100.0, "queries": 3}}
+        self.assertEqual(
+            compare(
+                {"index": {"p50_ms": 115.0, "queries": 3}}, baseline, 0.2
+            ),
+            [],
+        )
+        regressions = compare(
+            {"index": {"p50_ms": 130.0, "queries": 4}}, baseline, 0.2
+        )
+        self.assertEqual(len(regressions), 2)
+
+    def test_absolute_slack_for_fast_views(self):
+        """На быстрых страницах шум меньше абсолютного запаса не важен."""
+        self.assertEqual(
+            compare({"add": {"p50_ms": 3.0}}, {"add": {"p50_ms": 2.0}}, 0.2),
+            [],
+        )
+
+
+@override_settings(BENCHMARK_DIR=BENCHMARK_DIR, BENCHMARK_MIN_POSTS=10)
+class BenchmarkCommandTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        call_command(
+            "seed_data",
+            users=10,
+            groups=2,
+            posts=30,
+            comments=20,
+            follows=30,
+            stdout=StringIO(),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(BENCHMARK_DIR, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        # Базовый результат одного теста не должен сравниваться с
+        # замерами другого: на время влияет шум машины.
+        shutil.rmtree(BENCHMARK_DIR, ignore_errors=True)
+        os.makedirs(BENCHMARK_DIR)
+
+    def run_benchmark(self, *args):
+        call_command(
+            "benchmark",
+            *args,
+            iterations=2,
+            stdout=StringIO(),
+            stderr=StringIO(),
+        )
+
+    def test_results_are_saved_for_every_view(self):
+        """Результат сохраняется в JSON для всех страниц."""
+        self.run_benchmark("--save-baseline")
+        with open(os.path.join(BENCHMARK_DIR, "baseline.json")) as file:
+            results = json.load(file)
+        self.assertEqual(
+            set(results),
+            {
+                "index",
+                "group_posts",
+                "profile",
+                "post_detail",
+                "follow_index",
+                "post_create",
+                "add_comment",
+            },
+        )
+        self.assertEqual(results["post_create"]["status"], 302)
+        self.assertGreater(results["index"]["queries"], 0)
+
+    def test_regression_fails_command(self):
+        """Рост числа запросов относительно базы — ошибка команды."""
+        with open(os.path.join(BENCHMARK_DIR, "baseline.json"), "w") as file:
+            json.dump({"index": {"queries": 0}}, file)
+        with self.assertRaisesMessage(CommandError, "index.queries"):
+            self.run_benchmark("index")
+
+    def test_writes_are_rolled_back(self):
+        """post_create и add_comment не меняют данные."""
+        counts = Post.objects.count(), Comment.objects.count()
+        self.run_benchmark("post_create", "add_comment")
+        self.assertEqual(
+            (Post.objects.count(), Comment.objects.count()), counts
+        )
@@ -0,0 +1,91 @@
+import gzip
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.template.loader import get_template
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+from ..middleware.compression import CompressionMiddleware
+from ..template_loaders import minify_html
+
+User = get_user_model()
+
+
+class MinifyHtmlTests(TestCase):
+    def test_whitespace_and_comments_are_removed(self):
+        """Отступы, пустые строки и комментарии убираются."""
+        source = "<div>\n    <p>a   b</p> <!-- note -->\n\n\n  </div>\n"
+        self.assertEqual(minify_html(source), "<div>\n<p>a b</p>\n</div>")
+
+    def test_significant_whitespace_is_kept(self):
+        """Содержимое pre и textarea и комментарии с тегами не меняются."""
+        source = (
+            "<pre>\n  a    b\n</pre>\n  <textarea>  x\n\n</textarea>"
+            "\n  <!--{% load static %}-->"
+        )
+        self.assertEqual(
+            minify_html(source),
+            "<pre>\n  a    b\n</pre>\n<textarea>  x\n\n</textarea>"
+            "\n<!--{% load static %}-->",
+        )
+
+    def test_pages_are_rendered_minified(self):
+        """Страницы рендерятся из уже сжатых шаблонов."""
+        cache.clear()
+        author = User.objects.create_user(username="Author")
+        Post.objects.create(text="Test text", author=author)
+        response = self.client.get(reverse("posts:index"))
+        self.assertContains(response, "Test text")
+        self.assertNotIn("\n  ", response.content.decode())
+
+    def test_email_templates_are_not_minified(self):
+        """Текст письма о сбросе пароля сохраняет переводы строк."""
+        source = get_template("registration/password_reset_email.html")
+        with open(source.origin.name) as file:
+            self.assertEqual(source.template.source, file.read())
+
+
+@override_settings(GZIP_MIN_SIZE=100)
+class CompressionMiddlewareTests(TestCase):
+    def process(self, response, encoding="gzip, deflate"):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_large_html_is_compressed(self):
+        """HTML больше порога сжимается, если клиент принимает gzip."""
+        body = "<p>text</p>" * 100
+        response = self.process(HttpResponse(body))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content).decode(), body)
+        plain = self.process(HttpResponse(body), encoding="identity")
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        refused = self.process(HttpResponse(body), encoding="gzip;q=0")
+        self.assertFalse(refused.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", refused["Vary"])
+
+    def test_small_and_binary_responses_are_skipped(self):
+        """Ответы меньше порога и картинки не сжимаются."""
+        small = self.process(HttpResponse("<p>short</p>"))
+        image = self.process(
+            HttpResponse(b"\x89PNG" * 100, content_type="image/png")
+        )
+        self.assertFalse(small.has_header("Content-Encoding"))
+        self.assertFalse(image.has_header("Content-Encoding"))
+
+    def test_streaming(self):
+        """Потоки сжимаются на лету, кроме text/event-stream."""
+        stream = self.process(StreamingHttpResponse(iter(["a", "b"])))
+        self.assertEqual(stream["Content-Encoding"], "gzip")
+        self.assertEqual(
+            gzip.decompress(b"".join(stream.streaming_content)), b"ab"
+        )
+        events = self.process(
+            StreamingHttpResponse(
+                iter(["data: x\n\n"]), content_type="text/event-stream"
+            )
+        )
+        self.assertFalse(events.has_header("Content-Encoding"))
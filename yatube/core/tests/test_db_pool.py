@@ -0,0 +1,105 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.db import connections
+from django.test import SimpleTestCase
+
+from ..db_backends.sqlite3.base import DatabaseWrapper
+from ..db_pool import ConnectionPool, PoolTimeout
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.created = []
+
+    def connect(self):
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self.created.append(conn)
+        return conn
+
+    def make_pool(self, **kwargs):
+        options = {"max_size": 2, "timeout": 0.01, "health_check_interval": 0}
+        options.update(kwargs)
+        return ConnectionPool(**options)
+
+    def test_returned_connection_is_reused(self):
+        """Возвращённое соединение выдаётся снова без переподключения."""
+        pool = self.make_pool()
+        conn = pool.checkout(self.connect)
+        pool.checkin(conn)
+        self.assertIs(pool.checkout(self.connect), conn)
+        self.assertEqual(len(self.created), 1)
+
+    def test_exhausted_pool_times_out(self):
+        """Переполненный пул ждёт timeout и считает отказы."""
+        pool = self.make_pool()
+        pool.checkout(self.connect)
+        pool.checkout(self.connect)
+        with self.assertRaises(PoolTimeout):
+            pool.checkout(self.connect)
+        stats = pool.stats()
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["saturation"], 1.0)
+
+    def test_broken_connection_is_replaced(self):
+        """Соединение, не прошедшее проверку, заменяется новым."""
+        pool = self.make_pool()
+        conn = pool.checkout(self.connect)
+        pool.checkin(conn)
+        conn.close()
+        self.assertIsNot(pool.checkout(self.connect), conn)
+        stats = pool.stats()
+        self.assertEqual(stats["discarded"], 1)
+        self.assertEqual(stats["size"], 1)
+
+    def test_failed_connection_is_not_reused(self):
+        """Соединение после ошибки не возвращается в пул."""
+        pool = self.make_pool()
+        conn = pool.checkout(self.connect)
+        pool.checkin(conn, reusable=False)
+        self.assertEqual(pool.stats()["idle"], 0)
+        self.assertEqual(pool.stats()["in_use"], 0)
+
+    def test_waited_connection_is_checked(self):
+        """Соединение, дождавшееся в очереди, тоже проходит проверку."""
+        pool = self.make_pool(max_size=1, timeout=1)
+        conn = pool.checkout(self.connect)
+        conn.close()
+
+        def release():
+            time.sleep(0.05)
+            # Соединение сломалось уже после возврата в пул.
+            pool._idle.put((conn, time.monotonic() - 1))
+
+        thread = threading.Thread(target=release)
+        thread.start()
+        fresh = pool.checkout(self.connect)
+        thread.join()
+        self.assertIsNot(fresh, conn)
+        fresh.execute("SELECT 1")
+        self.assertEqual(pool.stats()["discarded"], 1)
+
+
+class PooledBackendTests(SimpleTestCase):
+    def test_pragmas_run_once_per_physical_connection(self):
+        """PRAGMA выполняются при открытии, а не при каждой выдаче."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        settings_dict = dict(
+            connections.databases["default"],
+            NAME=os.path.join(directory, "pool.sqlite3"),
+        )
+        wrapper = DatabaseWrapper(settings_dict, alias="pragma-test")
+        with mock.patch(
+            "core.db_backends.sqlite3.base.apply_sqlite_pragmas"
+        ) as apply, mock.patch("core.db.apply_sqlite_pragmas") as signal:
+            for _ in range(3):
+                wrapper.ensure_connection()
+                wrapper.close()
+        self.assertEqual(apply.call_count, 1)
+        signal.assert_not_called()
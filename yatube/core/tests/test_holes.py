@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from notifications.models import Notification
+from notifications.services import notify
+from posts.models import Post
+
+from ..testing import capture_on_commit_callbacks
+
+User = get_user_model()
+
+
+class HolePunchedCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username="Author")
+        cls.reader = User.objects.create_user(username="Reader")
+        cls.post = Post.objects.create(text="Shared text", author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.author_client = Client()
+        self.author_client.force_login(HolePunchedCacheTests.author)
+        self.reader_client = Client()
+        self.reader_client.force_login(HolePunchedCacheTests.reader)
+
+    def test_index_is_shared_between_users(self):
+        """Аноним и вошедшие пользователи читают одну запись кэша."""
+        self.client.get(reverse("posts:index"))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.reader_client.get(reverse("posts:index"))
+        content = response.content.decode()
+        self.assertIn("Shared text", content)
+        self.assertIn("Пользователь: Reader", content)
+        self.assertIn("Избранные авторы", content)
+        self.assertNotIn("Пользователь: Author", content)
+        self.assertFalse(
+            [query for query in queries if "posts_post" in query["sql"]]
+        )
+        anonymous = self.client.get(reverse("posts:index")).content.decode()
+        self.assertIn("Войти", anonymous)
+        self.assertNotIn("Reader", anonymous)
+
+    def test_edit_link_only_for_author(self):
+        """Кнопка правки на общей странице поста видна только автору."""
+        url = reverse("posts:post_detail", kwargs={"post_id": self.post.id})
+        edit_url = reverse("posts:post_edit", kwargs={"post_id": self.post.id})
+        self.assertNotContains(self.reader_client.get(url), edit_url)
+        self.assertContains(self.author_client.get(url), edit_url)
+        self.assertNotContains(self.client.get(url), edit_url)
+
+    def test_comment_form_has_fresh_csrf_token(self):
+        """Форма комментария рендерится каждый раз со своим CSRF-токеном."""
+        url = reverse("posts:post_detail", kwargs={"post_id": self.post.id})
+        first = self.reader_client.get(url)
+        second = self.author_client.get(url)
+        self.assertContains(first, "csrfmiddlewaretoken")
+        self.assertContains(second, "csrfmiddlewaretoken")
+        self.assertNotEqual(
+            first.cookies["csrftoken"].value,
+            second.cookies["csrftoken"].value,
+        )
+        self.assertNotContains(self.client.get(url), "csrfmiddlewaretoken")
+
+    def test_new_comment_changes_cached_page(self):
+        """Новый комментарий сразу виден на закэшированной странице."""
+        url = reverse("posts:post_detail", kwargs={"post_id": self.post.id})
+        self.client.get(url)
+        self.reader_client.post(
+            reverse("posts:add_comment", kwargs={"post_id": self.post.id}),
+            data={"text": "Fresh comment"},
+        )
+        self.assertContains(self.client.get(url), "Fresh comment")
+
+    def test_notification_refreshes_header(self):
+        """Новое уведомление сбрасывает закэшированную шапку."""
+        self.author_client.get(reverse("posts:index"))
+        with capture_on_commit_callbacks(execute=True):
+            notify(self.author.id, self.reader.id, Notification.FOLLOW)
+        response = self.author_client.get(reverse("posts:index"))
+        self.assertContains(response, '<span class="badge bg-danger">1</span>')
@@ -0,0 +1,45 @@
+import json
+import tracemalloc
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+User = get_user_model()
+
+
+@override_settings(MEMORY_TRACKING_ENABLED=True)
+class MemoryTrackingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username="Author")
+        Post.objects.create(text="Test text", author=cls.author)
+
+    def tearDown(self):
+        tracemalloc.stop()
+
+    @override_settings(MEMORY_TRACKING_THRESHOLD=10 ** 9)
+    def test_peak_header(self):
+        """Ответ содержит пик памяти запроса."""
+        response = self.client.get(reverse("posts:profile", args=["Author"]))
+        self.assertGreater(int(response["X-Memory-Peak"]), 0)
+
+    @override_settings(MEMORY_TRACKING_THRESHOLD=10 ** 9)
+    def test_no_snapshot_below_threshold(self):
+        """Для запроса ниже порога снимок памяти не делается."""
+        with mock.patch.object(tracemalloc, "take_snapshot") as snapshot:
+            self.client.get(reverse("posts:profile", args=["Author"]))
+        snapshot.assert_not_called()
+
+    @override_settings(MEMORY_TRACKING_THRESHOLD=0)
+    def test_large_requests_are_reported(self):
+        """Запрос выше порога попадает в лог с местами аллокаций."""
+        with self.assertLogs("yatube.memory", "WARNING") as logs:
+            self.client.get(reverse("posts:profile", args=["Author"]))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["view"], "posts:profile")
+        self.assertTrue(record["top"])
@@ -0,0 +1,150 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+from .. import metrics
+
+User = get_user_model()
+
+METRICS_DIR = tempfile.mkdtemp()
+
+
+@override_settings(METRICS_DIR=METRICS_DIR)
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username="Author")
+        Post.objects.create(text="Test text", author=cls.author)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(METRICS_DIR, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+
+    def sample(self, body, line):
+        for row in body.splitlines():
+            if row.startswith(line + " "):
+                return float(row.rsplit(" ", 1)[1])
+        return 0.0
+
+    def test_endpoint_exposes_views_cache_and_db(self):
+        """/metrics отдаёт гистограмму по имени URL, кэш и запросы к БД."""
+        body = self.client.get(reverse("core:metrics")).content.decode()
+        before = self.sample(
+            body, 'yatube_requests_total{status="200",view="posts:index"}'
+        )
+        self.client.get(reverse("posts:index"))
+        self.client.get(reverse("posts:index"))
+        response = self.client.get(reverse("core:metrics"))
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn("# TYPE yatube_request_duration_seconds histogram", body)
+        self.assertEqual(
+            self.sample(
+                body,
+                'yatube_requests_total{status="200",view="posts:index"}',
+            ),
+            before + 2,
+        )
+        self.assertGreaterEqual(
+            self.sample(
+                body,
+                "yatube_request_duration_seconds_bucket"
+                '{le="+Inf",view="posts:index"}',
+            ),
+            2,
+        )
+        self.assertGreater(
+            self.sample(
+                body,
+                'yatube_cache_requests_total{prefix="index_page",'
+                'result="hit"}',
+            ),
+            0,
+        )
+        self.assertIn('yatube_db_queries_total{view="posts:index"}', body)
+
+    def test_other_processes_are_summed(self):
+        """Значения из файлов других воркеров складываются."""
+        metrics.flush()
+        with open(f"{METRICS_DIR}/999999999.json", "w") as file:
+            file.write(
+                '[["yatube_thumbnails_total", {"result": "generated"}, '
+                '3, "counter"]]'
+            )
+        totals = metrics.collect()
+        self.assertGreaterEqual(
+            totals[("yatube_thumbnails_total", (("result", "generated"),))],
+            3,
+        )
+
+    def test_dead_process_files_are_merged_once(self):
+        """Файлы завершившихся процессов сливаются и удаляются."""
+        key = ("yatube_thumbnails_total", (("result", "cached"),))
+        before = metrics.collect()[key]
+        for name in ("999999997-a.json", "999999997-b.json"):
+            with open(f"{METRICS_DIR}/{name}", "w") as file:
+                file.write(
+                    '[["yatube_thumbnails_total", {"result": "cached"}, '
+                    '2, "counter"]]'
+                )
+        self.assertEqual(metrics.collect()[key], before + 4)
+        self.assertEqual(metrics.collect()[key], before + 4)
+        self.assertFalse(
+            [name for name in os.listdir(METRICS_DIR)
+             if name.startswith("999999997")]
+        )
+        # Файл уже слит, но не успел удалиться: второй раз не считается.
+        exited = metrics._read_exited()
+        with open(f"{METRICS_DIR}/{metrics._EXITED}", "w") as file:
+            json.dump({**exited, "merged": ["999999996-c.json"]}, file)
+        with open(f"{METRICS_DIR}/999999996-c.json", "w") as file:
+            file.write(
+                '[["yatube_thumbnails_total", {"result": "cached"}, '
+                '2, "counter"]]'
+            )
+        self.assertEqual(metrics.collect()[key], before + 4)
+        self.assertNotIn("999999996-c.json", os.listdir(METRICS_DIR))
+
+    def test_gauges_are_per_live_process(self):
+        """Gauge не складываются и берутся только у живых процессов."""
+        metrics.set_gauge("yatube_db_pool", {"stat": "saturation"}, 0.5)
+        metrics.flush()
+        for name in ("999999998-old.json", "999999998-new.json"):
+            with open(f"{METRICS_DIR}/{name}", "w") as file:
+                file.write(
+                    '[["yatube_db_pool", {"stat": "saturation"}, '
+                    '1, "gauge"]]'
+                )
+        totals = metrics.collect()
+        saturation = {
+            labels: value
+            for (name, labels), value in totals.items()
+            if name == "yatube_db_pool" and ("stat", "saturation") in labels
+        }
+        own = (("pid", str(os.getpid())), ("stat", "saturation"))
+        self.assertEqual(saturation, {own: 0.5})
+
+    def test_cache_key_prefix(self):
+        """Для cache_page префикс — key_prefix декоратора."""
+        self.assertEqual(
+            metrics.cache_key_prefix(
+                "views.decorators.cache.cache_page.index_page.GET.abc"
+            ),
+            "index_page",
+        )
+        self.assertEqual(
+            metrics.cache_key_prefix("sorl-thumbnail||x"), "sorl-thumbnail"
+        )
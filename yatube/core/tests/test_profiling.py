@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..profiling import list_profiles, make_token
+
+User = get_user_model()
+
+PROFILE_DIR = tempfile.mkdtemp()
+
+
+@override_settings(PROFILE_DIR=PROFILE_DIR, PROFILE_SAMPLE_RATE=0)
+class ProfilingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_user(username="Admin", is_staff=True)
+        cls.user = User.objects.create_user(username="User")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(PROFILE_DIR, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        shutil.rmtree(PROFILE_DIR, ignore_errors=True)
+        self.admin_client = Client()
+        self.admin_client.force_login(ProfilingTests.admin)
+
+    def test_signed_header_profiles_request(self):
+        """Запрос с подписанным X-Profile сохраняет профиль."""
+        response = self.client.get(
+            reverse("posts:index"), HTTP_X_PROFILE=make_token()
+        )
+        name = response["X-Profile-Id"]
+        self.assertIn("posts_index", name)
+        self.assertTrue(os.path.isfile(os.path.join(PROFILE_DIR, name)))
+
+    def test_forged_header_is_ignored(self):
+        """Неподписанный заголовок профилирование не включает."""
+        response = self.client.get(
+            reverse("posts:index"), HTTP_X_PROFILE="profile:forged"
+        )
+        self.assertFalse(response.has_header("X-Profile-Id"))
+        self.assertEqual(list_profiles(), [])
+
+    @override_settings(PROFILE_SAMPLE_RATE=1, PROFILE_MAX_FILES=2)
+    def test_retention_keeps_newest_files(self):
+        """Хранится не больше PROFILE_MAX_FILES профилей."""
+        for _ in range(4):
+            self.client.get(reverse("about:author"))
+        self.assertEqual(len(list_profiles()), 2)
+
+    def test_staff_can_list_and_download(self):
+        """Сотрудник видит список профилей и скачивает файл."""
+        name = self.client.get(
+            reverse("posts:index"), HTTP_X_PROFILE=make_token()
+        )["X-Profile-Id"]
+        response = self.admin_client.get(reverse("core:profile_list"))
+        self.assertContains(response, name)
+        url = reverse("core:profile_detail", kwargs={"name": name})
+        self.assertContains(self.admin_client.get(url), "cumulative")
+        response = self.admin_client.get(url, {"download": 1})
+        self.assertIn("attachment", response["Content-Disposition"])
+        response.close()
+
+    def test_unknown_sort_falls_back_to_cumulative(self):
+        """Неизвестный ключ сортировки не приводит к ошибке 500."""
+        name = self.client.get(
+            reverse("posts:index"), HTTP_X_PROFILE=make_token()
+        )["X-Profile-Id"]
+        url = reverse("core:profile_detail", kwargs={"name": name})
+        response = self.admin_client.get(url, {"sort": "foo"})
+        self.assertContains(response, "cumulative")
+
+    def test_profiles_are_staff_only(self):
+        """Обычный пользователь к профилям доступа не имеет."""
+        client = Client()
+        client.force_login(ProfilingTests.user)
+        response = client.get(reverse("core:profile_list"))
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+from ..middleware.queries import QueryBudgetMiddleware
+from ..queries import QueryBudgetExceeded, fingerprint, query_budget
+
+User = get_user_model()
+
+
+class FingerprintTests(TestCase):
+    def test_literals_are_replaced(self):
+        """Запросы с разными параметрами дают один отпечаток."""
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 1 AND name = 'a'"),
+            fingerprint("SELECT *  FROM t WHERE id = 25 AND name = 'b''c'"),
+        )
+
+    def test_in_lists_are_collapsed(self):
+        """Длина списка в IN (...) не меняет отпечаток."""
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id IN (%s, %s, %s)"),
+            fingerprint("SELECT * FROM t WHERE id IN (%s)"),
+        )
+
+
+@override_settings(
+    QUERY_BUDGET_ENABLED=True,
+    QUERY_BUDGET_RAISE=True,
+    QUERY_REPEAT_THRESHOLD=3,
+)
+class QueryBudgetMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username="Author")
+        cls.group = Group.objects.create(
+            title="Group", slug="group", description="Description"
+        )
+        Post.objects.bulk_create(
+            Post(text=f"Text {number}", author=cls.author, group=cls.group)
+            for number in range(5)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def call(self, view):
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            return view(request)
+
+        middleware = QueryBudgetMiddleware(get_response)
+        return middleware(self.factory.get("/"))
+
+    def test_repeated_queries_are_reported(self):
+        """Запрос в цикле по объектам распознаётся как N+1."""
+
+        def view(request):
+            for post in Post.objects.all():
+                post.author.username
+            return HttpResponse()
+
+        with self.assertLogs("yatube.queries", "WARNING"):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.call(view)
+
+    def test_budget_from_decorator(self):
+        """Превышение бюджета из query_budget — ошибка."""
+
+        @query_budget(1)
+        def view(request):
+            User.objects.count()
+            Post.objects.count()
+            return HttpResponse()
+
+        with self.assertLogs("yatube.queries", "WARNING"):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.call(view)
+
+    def test_query_count_header(self):
+        """Число запросов не зависит от числа постов на странице."""
+        response = self.client.get(reverse("posts:index"))
+        count = int(response["X-Query-Count"])
+        Post.objects.bulk_create(
+            Post(text="More", author=self.author, group=self.group)
+            for _ in range(5)
+        )
+        cache.clear()
+        response = self.client.get(reverse("posts:index"))
+        self.assertEqual(int(response["X-Query-Count"]), count)
@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+from ..middleware.replica import ReplicaRoutingMiddleware
+from ..routers import ReplicaRouter, replica_reads, replica_reads_enabled
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTests(TestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+        self.seen = []
+
+        def get_response(request):
+            self.seen.append(replica_reads_enabled())
+            return HttpResponse()
+
+        self.middleware = ReplicaRoutingMiddleware(get_response)
+
+    def call(self, request, view):
+        self.middleware.process_view(request, view, (), {})
+        return self.middleware(request)
+
+    def test_router_uses_replica_only_when_enabled(self):
+        """Чтение уходит на реплику только внутри помеченного запроса."""
+        request = self.factory.get("/")
+        view = replica_reads(lambda r: r)
+        self.middleware.process_view(request, view, (), {})
+        self.assertEqual(self.router.db_for_read(Post), "replica")
+        self.assertEqual(self.router.db_for_write(Post), "default")
+        self.middleware(request)
+        self.assertEqual(self.router.db_for_read(Post), "default")
+
+    def test_auth_and_sessions_always_use_primary(self):
+        """Пользователи и сессии читаются из default даже с репликой."""
+        request = self.factory.get("/")
+        self.middleware.process_view(
+            request, replica_reads(lambda r: r), (), {}
+        )
+        self.assertEqual(self.router.db_for_read(User), "default")
+        self.assertEqual(self.router.db_for_read(Session), "default")
+        self.assertEqual(self.router.db_for_read(Post), "replica")
+        self.middleware(request)
+
+    def test_unmarked_and_unsafe_requests_use_primary(self):
+        """Непомеченные представления и POST читают из default."""
+        view = replica_reads(lambda r: r)
+        self.call(self.factory.get("/"), lambda r: r)
+        self.call(self.factory.post("/"), view)
+        self.assertEqual(self.seen, [False, False])
+
+    def test_sticky_cookie_pins_reads_to_primary(self):
+        """После записи клиент читает из default, пока жива cookie."""
+        response = self.call(self.factory.post("/"), lambda r: r)
+        cookie = response.cookies[settings.REPLICA_STICKY_COOKIE]
+        self.assertEqual(cookie["max-age"], settings.REPLICA_STICKY_SECONDS)
+        request = self.factory.get("/")
+        request.COOKIES[settings.REPLICA_STICKY_COOKIE] = "1"
+        self.call(request, replica_reads(lambda r: r))
+        self.assertEqual(self.seen, [False, False])
+
+
+class ReplicaStickyViewTests(TestCase):
+    def test_add_comment_sets_sticky_cookie(self):
+        """add_comment выставляет cookie чтения из основной базы."""
+        user = User.objects.create_user(username="Testname")
+        post = Post.objects.create(text="Test text", author=user)
+        client = Client()
+        client.force_login(user)
+        client.post(
+            reverse("posts:add_comment", kwargs={"post_id": post.id}),
+            data={"text": "comment"},
+        )
+        self.assertIn(settings.REPLICA_STICKY_COOKIE, client.cookies)
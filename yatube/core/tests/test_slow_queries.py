@@ -0,0 +1,64 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+User = get_user_model()
+
+LOG_DIR = tempfile.mkdtemp()
+LOG = os.path.join(LOG_DIR, "slow.ndjson")
+
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_LOG=LOG)
+class SlowQueryLogTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username="Author")
+        Post.objects.create(text="Test text", author=cls.author)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(LOG_DIR, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        if os.path.exists(LOG):
+            os.remove(LOG)
+
+    def entries(self):
+        with open(LOG) as file:
+            return [json.loads(line) for line in file]
+
+    def test_slow_queries_are_logged_with_plan(self):
+        """Запрос выше порога пишется с отпечатком, view и планом."""
+        with self.assertLogs("yatube.slow_queries", "WARNING"):
+            self.client.get(reverse("posts:profile", args=["Author"]))
+        entries = self.entries()
+        self.assertTrue(entries)
+        select = next(
+            entry for entry in entries
+            if entry["fingerprint"].startswith('SELECT "posts_post"')
+        )
+        self.assertEqual(select["view"], "posts:profile")
+        self.assertNotIn("Author", select["fingerprint"])
+        self.assertTrue(select["plan"])
+
+    def test_report_groups_by_fingerprint(self):
+        """Отчёт сводит повторы одного запроса в одну строку."""
+        with self.assertLogs("yatube.slow_queries", "WARNING"):
+            for _ in range(3):
+                self.client.get(reverse("posts:profile", args=["Author"]))
+        out = StringIO()
+        call_command("slow_query_report", top=50, log=LOG, stdout=out)
+        report = out.getvalue()
+        self.assertIn("count=3", report)
+        self.assertIn("plan:", report)
@@ -0,0 +1,121 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from ..storage import is_hashed
+from ..views import static_file
+
+SOURCE_DIR = tempfile.mkdtemp()
+STATIC_ROOT = tempfile.mkdtemp()
+STYLE = "body { color: black; }\n" * 100
+
+
+@override_settings(
+    STATICFILES_DIRS=[SOURCE_DIR],
+    STATIC_ROOT=STATIC_ROOT,
+    STATICFILES_STORAGE="core.storage.CompressedManifestStaticFilesStorage",
+)
+class StaticFilesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(SOURCE_DIR, "css"))
+        with open(os.path.join(SOURCE_DIR, "css", "main.css"), "w") as file:
+            file.write(STYLE)
+        with open(os.path.join(SOURCE_DIR, "css", "tiny.css"), "w") as file:
+            file.write("a{}")
+        call_command("collectstatic", interactive=False, verbosity=0)
+        cls.hashed = next(
+            name
+            for name in os.listdir(os.path.join(STATIC_ROOT, "css"))
+            if name.startswith("main.") and name.endswith(".css")
+            and is_hashed(name)
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(SOURCE_DIR, ignore_errors=True)
+        shutil.rmtree(STATIC_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def url(self, name):
+        return reverse("core:static", kwargs={"path": f"css/{name}"})
+
+    def test_collectstatic_writes_gzip_copies(self):
+        """collectstatic сжимает файлы с хэшем, мелкие пропускает."""
+        files = os.listdir(os.path.join(STATIC_ROOT, "css"))
+        self.assertIn(self.hashed + ".gz", files)
+        self.assertNotIn("main.css.gz", files)
+        self.assertFalse(
+            [name for name in files if name.startswith("tiny.")
+             and name.endswith(".gz")]
+        )
+        with gzip.open(
+            os.path.join(STATIC_ROOT, "css", self.hashed + ".gz"), "rt"
+        ) as file:
+            self.assertEqual(file.read(), STYLE)
+
+    def test_gzip_is_chosen_by_accept_encoding(self):
+        """Сжатая копия отдаётся только клиентам, принимающим gzip."""
+        response = self.client.get(
+            self.url(self.hashed), HTTP_ACCEPT_ENCODING="br, gzip"
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Type"], "text/css")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(
+            gzip.decompress(b"".join(response.streaming_content)).decode(),
+            STYLE,
+        )
+        response = self.client.get(self.url(self.hashed))
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(
+            b"".join(response.streaming_content).decode(), STYLE
+        )
+
+    def test_gzip_refused_by_zero_quality(self):
+        """gzip;q=0 означает отказ от gzip — отдаётся исходный файл."""
+        path = f"css/{self.hashed}"
+        for header, encoding in (
+            ("gzip;q=0", None),
+            ("gzip; q=0.0, br", None),
+            ("*;q=0", None),
+            ("br;q=1, *;q=0.5", "gzip"),
+        ):
+            with self.subTest(header=header):
+                request = RequestFactory().get(
+                    "/", HTTP_ACCEPT_ENCODING=header
+                )
+                response = static_file(request, path)
+                self.assertEqual(response.get("Content-Encoding"), encoding)
+                response.close()
+
+    @override_settings(DEBUG=False)
+    def test_static_urls_are_hashed_without_debug(self):
+        """С DEBUG=False {% static %} ссылается на файл с хэшем."""
+        self.assertEqual(
+            staticfiles_storage.url("css/main.css"),
+            f"/static/css/{self.hashed}",
+        )
+
+    def test_hashed_files_are_immutable(self):
+        """Файлы с хэшем кэшируются навсегда, без хэша — ненадолго."""
+        hashed = self.client.get(self.url(self.hashed))
+        self.assertIn("immutable", hashed["Cache-Control"])
+        plain = self.client.get(self.url("main.css"))
+        self.assertNotIn("immutable", plain["Cache-Control"])
+
+    def test_missing_and_outside_files_are_not_found(self):
+        """Нет файла или путь выходит за STATIC_ROOT — 404."""
+        request = RequestFactory().get("/")
+        for path in ("css/missing.css", "../settings.py", "css"):
+            with self.subTest(path=path):
+                with self.assertRaises(Http404):
+                    static_file(request, path)
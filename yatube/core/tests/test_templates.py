@@ -0,0 +1,54 @@
+from django.contrib.auth import get_user_model
+from django.template import engines
+from django.test import TestCase
+from django.urls import reverse
+
+from posts.models import Post
+
+from ..template_backends import template_names, warm_up
+from ..template_profiler import profile_templates
+
+User = get_user_model()
+
+
+class TemplateCacheTests(TestCase):
+    def test_loader_is_cached(self):
+        """Шаблоны загружаются через кэширующий загрузчик."""
+        engine = engines["template_backends"].engine
+        self.assertEqual(
+            type(engine.template_loaders[0]).__module__,
+            "django.template.loaders.cached",
+        )
+
+    def test_warm_up_compiles_project_templates(self):
+        """Прогрев компилирует шаблоны проекта."""
+        engine = engines["template_backends"].engine
+        self.assertIn("posts/index.html", template_names(engine))
+        self.assertGreater(warm_up(), 0)
+        cached = engine.template_loaders[0].get_template_cache
+        self.assertIn("posts/index.html", cached)
+
+
+class TemplateProfilerTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        author = User.objects.create_user(username="Author")
+        Post.objects.create(text="Test text", author=author)
+
+    def test_includes_are_profiled_separately(self):
+        """Профиль содержит страницу, base.html, блоки и include."""
+        with profile_templates() as profile:
+            self.client.get(reverse("posts:profile", args=["Author"]))
+        names = {row[0] for row in profile.rows()}
+        self.assertTrue(
+            {
+                "posts/profile.html",
+                "base.html",
+                "base.html {% block content %}",
+                "includes/header.html",
+            }
+            <= names
+        )
+        for _, _, total, own in profile.rows():
+            self.assertLessEqual(own, total + 1e-9)
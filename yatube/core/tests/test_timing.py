@@ -0,0 +1,62 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+User = get_user_model()
+
+
+@override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+class ServerTimingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username="Author")
+        cls.staff = User.objects.create_user(username="Staff", is_staff=True)
+        Post.objects.create(text="Test text", author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+
+    def metrics(self, response):
+        return {
+            item.split(";")[0]: item
+            for item in response["Server-Timing"].split(", ")
+        }
+
+    def test_header_reports_db_template_and_cache(self):
+        """Server-Timing содержит БД, шаблоны и попадания в кэш."""
+        with self.assertLogs("yatube.timing", "INFO") as logs:
+            first = self.client.get(reverse("posts:index"))
+            second = self.client.get(reverse("posts:index"))
+        self.assertIn("db", self.metrics(first))
+        self.assertIn("tpl", self.metrics(first))
+        self.assertNotIn("tpl", self.metrics(second))
+        self.assertIn("cache-hit", self.metrics(second))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["view"], "posts:index")
+        self.assertEqual(record["status"], 200)
+        self.assertGreater(record["db_count"], 0)
+        record = json.loads(logs.records[1].getMessage())
+        self.assertEqual(record["cache_misses"], 0)
+        self.assertGreater(record["cache_hits"], 0)
+
+    @override_settings(SERVER_TIMING_ALLOWED_IPS=[])
+    def test_header_only_for_staff_and_allowed_ips(self):
+        """Посторонний клиент заголовка не получает, сотрудник — получает."""
+        with self.assertLogs("yatube.timing", "INFO"):
+            response = self.client.get(reverse("posts:index"))
+        self.assertFalse(response.has_header("Server-Timing"))
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse("posts:index"))
+        self.assertTrue(response.has_header("Server-Timing"))
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_measured(self):
+        """Запросы вне выборки проходят без замеров."""
+        response = self.client.get(reverse("posts:index"))
+        self.assertFalse(response.has_header("Server-Timing"))
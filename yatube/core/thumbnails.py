@@ -0,0 +1,18 @@
+from sorl.thumbnail.base import ThumbnailBackend
+
+from core import metrics
+from core.instrumentation import record, timed
+
+
+class InstrumentedThumbnailBackend(ThumbnailBackend):
+    """Бэкенд sorl-thumbnail, замеряющий поиск и генерацию миниатюр."""
+
+    def get_thumbnail(self, file_, geometry_string, **options):
+        metrics.inc("yatube_thumbnails_total", {"result": "requested"})
+        with timed("thumbnail"):
+            return super().get_thumbnail(file_, geometry_string, **options)
+
+    def _create_thumbnail(self, *args, **kwargs):
+        record("thumbnail_generated")
+        metrics.inc("yatube_thumbnails_total", {"result": "generated"})
+        return super()._create_thumbnail(*args, **kwargs)
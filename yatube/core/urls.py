@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.urls import path
+
+from . import views
+
+app_name = "core"
+
+urlpatterns = [
+    path("metrics", views.metrics, name="metrics"),
+    path("profiles/", views.profile_list, name="profile_list"),
+    path("profiles/<str:name>/", views.profile_detail, name="profile_detail"),
+    path(
+        settings.STATIC_URL.lstrip("/") + "<path:path>",
+        views.static_file,
+        name="static",
+    ),
+]
@@ -1,4 +1,28 @@
+import io
+import mimetypes
+import os
+import pstats
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import PermissionDenied, SuspiciousFileOperation
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+)
 from django.shortcuts import render
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from core import metrics as core_metrics
+from core import profiling
+from core.middleware.compression import accepts_gzip
+from core.storage import is_hashed
 
 
 def page_not_found(request, exception):
@@ -17,3 +41,86 @@ def permission_denied(request, exception):
 
 def csrf_failure(request, reason=""):
     return render(request, "core/403csrf.html")
+
+
+def metrics(request):
+    allowed = settings.METRICS_ALLOWED_IPS
+    if allowed and request.META.get("REMOTE_ADDR") not in allowed:
+        raise PermissionDenied
+    return HttpResponse(
+        core_metrics.render(core_metrics.collect()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@staff_member_required
+def profile_list(request):
+    profiles = profiling.list_profiles()
+    for profile in profiles:
+        profile["created"] = datetime.fromtimestamp(profile["created"])
+    return render(request, "core/profiles.html", {"profiles": profiles})
+
+
+@staff_member_required
+def profile_detail(request, name):
+    path = profiling.profile_path(name)
+    if path is None:
+        raise Http404
+    if "download" in request.GET:
+        return FileResponse(open(path, "rb"), as_attachment=True)
+    sort = request.GET.get("sort", "cumulative")
+    if sort not in pstats.Stats.sort_arg_dict_default:
+        sort = "cumulative"
+    stream = io.StringIO()
+    stats = pstats.Stats(path, stream=stream)
+    stats.sort_stats(sort).print_stats(
+        settings.PROFILE_SHOWN_FUNCTIONS
+    )
+    context = {"name": name, "stats": stream.getvalue()}
+    return render(request, "core/profile_detail.html", context)
+
+
+def static_file(request, path):
+    """Отдаёт файл из STATIC_ROOT, по возможности его .gz-копию.
+
+    Файлы с хэшем в имени не меняются, поэтому кэшируются навсегда;
+    остальные браузер перепроверяет через STATIC_MAX_AGE секунд.
+    """
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    content_type, encoding = mimetypes.guess_type(full_path)
+    served_path = full_path
+    if accepts_gzip(request.META.get("HTTP_ACCEPT_ENCODING", "")):
+        if os.path.isfile(full_path + ".gz"):
+            served_path = full_path + ".gz"
+            encoding = "gzip"
+    stat = os.stat(served_path)
+    if not was_modified_since(
+        request.META.get("HTTP_IF_MODIFIED_SINCE"),
+        stat.st_mtime,
+        stat.st_size,
+    ):
+        response = HttpResponseNotModified()
+    else:
+        response = FileResponse(
+            open(served_path, "rb"),
+            content_type=content_type or "application/octet-stream",
+        )
+        response["Last-Modified"] = http_date(stat.st_mtime)
+        response["Content-Length"] = stat.st_size
+        if encoding:
+            response["Content-Encoding"] = encoding
+    if is_hashed(path):
+        response["Cache-Control"] = (
+            f"public, max-age={settings.STATIC_IMMUTABLE_MAX_AGE}, immutable"
+        )
+    else:
+        response["Cache-Control"] = (
+            f"public, max-age={settings.STATIC_MAX_AGE}"
+        )
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
@@ -0,0 +1,26 @@
+from django.contrib import admin
+
+from .models import Notification, NotificationState
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = (
+        "pk",
+        "recipient",
+        "actor",
+        "verb",
+        "post",
+        "pub_date",
+    )
+    list_filter = ("verb",)
+
+
+@admin.register(NotificationState)
+class NotificationStateAdmin(admin.ModelAdmin):
+    list_display = (
+        "user",
+        "unread_count",
+        "last_read_id",
+        "last_emailed_id",
+    )
@@ -0,0 +1,8 @@
+from .services import unread_count
+
+
+def unread_notifications(request):
+    """Добавляет в контекст число непрочитанных уведомлений."""
+    if not request.user.is_authenticated:
+        return {}
+    return {"unread_notifications": unread_count(request.user)}
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.template.loader import render_to_string
+
+from notifications.models import Notification, NotificationState
+
+
+class Command(BaseCommand):
+    help = (
+        "Рассылает email-дайджест непрочитанных уведомлений. "
+        "Запускается периодически, например из cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.NOTIFICATIONS_DIGEST_BATCH_SIZE,
+            help="Сколько писем отправлять за одно соединение.",
+        )
+
+    def handle(self, *args, **options):
+        states = (
+            NotificationState.objects.filter(unread_count__gt=0)
+            .exclude(user__email="")
+            .annotate(watermark=Greatest("last_read_id", "last_emailed_id"))
+            .select_related("user")
+        )
+        batch, sent = [], 0
+        for state in states.iterator(chunk_size=options["batch_size"]):
+            notifications = list(
+                Notification.objects.filter(
+                    recipient_id=state.user_id, id__gt=state.watermark
+                )
+                .select_related("actor", "post")
+                .order_by("id")[: settings.NOTIFICATIONS_DIGEST_LIMIT]
+            )
+            if not notifications:
+                continue
+            batch.append((state, notifications))
+            if len(batch) >= options["batch_size"]:
+                sent += self.send_batch(batch)
+                batch = []
+        if batch:
+            sent += self.send_batch(batch)
+        self.stdout.write(f"Отправлено дайджестов: {sent}")
+
+    def send_batch(self, batch):
+        messages = [
+            EmailMessage(
+                subject="Новые уведомления Yatube",
+                body=render_to_string(
+                    "notifications/digest.txt",
+                    {"user": state.user, "notifications": notifications},
+                ),
+                to=[state.user.email],
+            )
+            for state, notifications in batch
+        ]
+        get_connection().send_messages(messages)
+        for state, notifications in batch:
+            NotificationState.objects.filter(user_id=state.user_id).update(
+                last_emailed_id=Greatest(
+                    F("last_emailed_id"), notifications[-1].id
+                )
+            )
+        return len(messages)
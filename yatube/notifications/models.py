@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+
+from core.models import CreateModel
+from posts.models import Post
+
+User = get_user_model()
+
+
+class Notification(CreateModel):
+    """Запись журнала уведомлений. Строки только добавляются."""
+
+    FOLLOW = "follow"
+    COMMENT = "comment"
+    VERB_CHOICES = (
+        (FOLLOW, "подписался на вас"),
+        (COMMENT, "прокомментировал ваш пост"),
+    )
+
+    recipient = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="notifications",
+        verbose_name="Получатель",
+    )
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="Инициатор",
+    )
+    verb = models.CharField("Событие", max_length=16, choices=VERB_CHOICES)
+    post = models.ForeignKey(
+        Post,
+        blank=True,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="Пост",
+    )
+
+    class Meta(CreateModel.Meta):
+        indexes = [models.Index(fields=["recipient", "id"])]
+
+    def __str__(self):
+        return f"{self.actor} {self.get_verb_display()}"
+
+
+class NotificationState(models.Model):
+    """Счётчик и водяные знаки уведомлений пользователя.
+
+    last_read_id — последнее уведомление, показанное на сайте,
+    last_emailed_id — последнее, попавшее в email-дайджест.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="notification_state",
+    )
+    unread_count = models.PositiveIntegerField(default=0)
+    last_read_id = models.PositiveIntegerField(default=0)
+    last_emailed_id = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user}: {self.unread_count}"
@@ -0,0 +1,163 @@
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max
+from django.db.models.functions import Greatest
+
+from core.holes import bump_user_fragments
+
+from .models import Notification, NotificationState
+
+_buffer = threading.local()
+
+
+def _pending():
+    if not hasattr(_buffer, "items"):
+        _buffer.items = []
+    return _buffer.items
+
+
+def start_batch():
+    """Откладывает запись уведомлений до конца запроса."""
+    _buffer.deferred = True
+
+
+def notify(recipient_id, actor_id, verb, post_id=None):
+    """Ставит уведомление в очередь текущего потока.
+
+    В очередь оно попадает только после фиксации транзакции, в которой
+    создан комментарий или подписка: откат не оставит уведомления.
+    Внутри запроса очередь записывается одной пачкой после отправки
+    ответа (см. signals) или при переполнении; вне запроса, например
+    в командах manage.py, — сразу.
+    """
+    if recipient_id == actor_id:
+        return
+    notification = Notification(
+        recipient_id=recipient_id,
+        actor_id=actor_id,
+        verb=verb,
+        post_id=post_id,
+    )
+    transaction.on_commit(lambda: _enqueue(notification))
+
+
+def _enqueue(notification):
+    pending = _pending()
+    pending.append(notification)
+    if (
+        not getattr(_buffer, "deferred", False)
+        or len(pending) >= settings.NOTIFICATIONS_BATCH_SIZE
+    ):
+        flush()
+
+
+def flush():
+    """Записывает накопленные уведомления и обновляет счётчики."""
+    pending = _pending()
+    _buffer.items = []
+    if not pending:
+        return
+    per_recipient = Counter(item.recipient_id for item in pending)
+    with transaction.atomic():
+        Notification.objects.bulk_create(pending)
+        NotificationState.objects.bulk_create(
+            [NotificationState(user_id=pk) for pk in per_recipient],
+            ignore_conflicts=True,
+        )
+        for recipient_id, count in per_recipient.items():
+            NotificationState.objects.filter(user_id=recipient_id).update(
+                unread_count=F("unread_count") + count
+            )
+    # Счётчик в шапке берётся из кэша фрагментов.
+    for recipient_id in per_recipient:
+        bump_user_fragments(recipient_id)
+
+
+def finish_batch():
+    """Записывает очередь запроса и возвращает немедленную запись."""
+    _buffer.deferred = False
+    flush()
+
+
+def unread_count(user):
+    return (
+        NotificationState.objects.filter(user_id=user.id)
+        .values_list("unread_count", flat=True)
+        .first()
+        or 0
+    )
+
+
+def mark_read(user):
+    """Сдвигает водяной знак прочтения на последнее уведомление.
+
+    Из счётчика вычитаются только уведомления до нового водяного знака,
+    поэтому пришедшие параллельно не теряются.
+    Возвращает предыдущий водяной знак.
+    """
+    state = NotificationState.objects.filter(user_id=user.id).first()
+    if state is None:
+        return 0
+    unread = Notification.objects.filter(
+        recipient_id=user.id, id__gt=state.last_read_id
+    ).aggregate(last_id=Max("id"), count=Count("id"))
+    if unread["last_id"] is None:
+        return state.last_read_id
+    NotificationState.objects.filter(user_id=user.id).update(
+        unread_count=Greatest(F("unread_count") - unread["count"], 0),
+        last_read_id=unread["last_id"],
+    )
+    bump_user_fragments(user.id)
+    return state.last_read_id
+
+
+def discard(notifications):
+    """Удаляет уведомления, вычитая непрочитанные из счётчиков.
+
+    Непрочитанные — новее водяного знака last_read_id получателя;
+    без вычитания счётчик остался бы завышенным навсегда: mark_read
+    учитывает только уведомления, которые ещё существуют.
+    """
+    with transaction.atomic():
+        unread = (
+            notifications.filter(
+                id__gt=F("recipient__notification_state__last_read_id")
+            )
+            .order_by()
+            .values("recipient_id")
+            .annotate(count=Count("id"))
+        )
+        per_recipient = {row["recipient_id"]: row["count"] for row in unread}
+        for recipient_id, count in per_recipient.items():
+            NotificationState.objects.filter(user_id=recipient_id).update(
+                unread_count=Greatest(F("unread_count") - count, 0)
+            )
+        # Приёмник post_delete не должен вычесть их второй раз.
+        _buffer.discarding = True
+        try:
+            deleted, _ = notifications.delete()
+        finally:
+            _buffer.discarding = False
+    for recipient_id in per_recipient:
+        bump_user_fragments(recipient_id)
+    return deleted
+
+
+def forget(notification):
+    """Вычитает удалённое уведомление из счётчика, если оно не прочитано.
+
+    Вызывается на post_delete: каскадное удаление (пост из админки и
+    т. п.) иначе оставило бы счётчик завышенным. discard() вычитает
+    сам, одним запросом на пачку.
+    """
+    if getattr(_buffer, "discarding", False):
+        return
+    updated = NotificationState.objects.filter(
+        user_id=notification.recipient_id,
+        last_read_id__lt=notification.id,
+    ).update(unread_count=Greatest(F("unread_count") - 1, 0))
+    if updated:
+        bump_user_fragments(notification.recipient_id)
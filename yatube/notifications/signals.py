@@ -0,0 +1,46 @@
+from django.core.signals import request_finished, request_started
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from posts.models import Comment, Follow
+
+from . import services
+from .models import Notification
+
+
+@receiver(
+    post_save, sender=Comment, dispatch_uid="notifications_new_comment"
+)
+def notify_post_author(sender, instance, created, **kwargs):
+    if created:
+        services.notify(
+            instance.post.author_id,
+            instance.author_id,
+            Notification.COMMENT,
+            post_id=instance.post_id,
+        )
+
+
+@receiver(post_save, sender=Follow, dispatch_uid="notifications_new_follow")
+def notify_followed_author(sender, instance, created, **kwargs):
+    if created:
+        services.notify(
+            instance.author_id, instance.user_id, Notification.FOLLOW
+        )
+
+
+@receiver(
+    post_delete, sender=Notification, dispatch_uid="notifications_deleted"
+)
+def forget_deleted_notification(sender, instance, **kwargs):
+    services.forget(instance)
+
+
+@receiver(request_started, dispatch_uid="notifications_start_batch")
+def start_batch_on_request_started(sender, **kwargs):
+    services.start_batch()
+
+
+@receiver(request_finished, dispatch_uid="notifications_flush")
+def flush_on_request_finished(sender, **kwargs):
+    services.finish_batch()
@@ -0,0 +1,119 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.db import transaction
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.testing import capture_on_commit_callbacks
+from posts.models import Comment, Post
+
+from ..models import Notification, NotificationState
+from ..services import finish_batch, start_batch, unread_count
+
+User = get_user_model()
+
+
+class NotificationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            username="Author", email="author@yatube.ru"
+        )
+        cls.reader = User.objects.create_user(username="Reader")
+        cls.post = Post.objects.create(text="Test text", author=cls.author)
+
+    def setUp(self):
+        self.author_client = Client()
+        self.author_client.force_login(NotificationTests.author)
+        self.reader_client = Client()
+        self.reader_client.force_login(NotificationTests.reader)
+
+    def follow_author(self):
+        with capture_on_commit_callbacks(execute=True):
+            self.reader_client.get(
+                reverse(
+                    "posts:profile_follow", kwargs={"username": self.author}
+                )
+            )
+
+    def test_comment_and_follow_notify_author(self):
+        """Комментарий и подписка создают уведомления автору."""
+        with capture_on_commit_callbacks(execute=True):
+            self.reader_client.post(
+                reverse(
+                    "posts:add_comment", kwargs={"post_id": self.post.id}
+                ),
+                data={"text": "Nice"},
+            )
+        self.follow_author()
+        self.assertEqual(
+            set(
+                Notification.objects.filter(
+                    recipient=self.author, actor=self.reader
+                ).values_list("verb", flat=True)
+            ),
+            {Notification.COMMENT, Notification.FOLLOW},
+        )
+        self.assertEqual(unread_count(self.author), 2)
+
+    def test_own_comment_does_not_notify(self):
+        """Комментарий к своему посту не создаёт уведомления."""
+        with capture_on_commit_callbacks(execute=True):
+            self.author_client.post(
+                reverse(
+                    "posts:add_comment", kwargs={"post_id": self.post.id}
+                ),
+                data={"text": "Mine"},
+            )
+        self.assertFalse(Notification.objects.exists())
+
+    def test_rolled_back_comment_does_not_notify(self):
+        """Откат транзакции с комментарием не оставляет уведомления."""
+        # Как в запросе: очередь записывается после ответа.
+        start_batch()
+        with capture_on_commit_callbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Comment.objects.create(
+                        post=self.post, author=self.reader, text="Lost"
+                    )
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        finish_batch()
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(unread_count(self.author), 0)
+
+    def test_cascade_delete_decrements_unread_count(self):
+        """Удаление поста с уведомлениями уменьшает счётчик получателя."""
+        post = Post.objects.create(text="Doomed", author=self.author)
+        with capture_on_commit_callbacks(execute=True):
+            Comment.objects.create(post=post, author=self.reader, text="a")
+        self.follow_author()
+        self.assertEqual(unread_count(self.author), 2)
+        post.delete()
+        self.assertEqual(unread_count(self.author), 1)
+
+    def test_list_marks_notifications_read(self):
+        """Просмотр списка сбрасывает счётчик и двигает водяной знак."""
+        self.follow_author()
+        response = self.author_client.get(reverse("notifications:index"))
+        self.assertEqual(len(response.context["page_obj"]), 1)
+        state = NotificationState.objects.get(user=self.author)
+        self.assertEqual(state.unread_count, 0)
+        self.assertEqual(
+            state.last_read_id, Notification.objects.latest("id").id
+        )
+
+    def test_digest_sends_unread_once(self):
+        """Дайджест отправляется один раз на пачку непрочитанного."""
+        self.follow_author()
+        call_command("send_notification_digest", stdout=StringIO())
+        call_command("send_notification_digest", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.author.email])
+        self.assertIn(self.reader.username, mail.outbox[0].body)
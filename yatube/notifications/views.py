@@ -0,0 +1,19 @@
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render
+
+from posts.utils import paginator_func
+
+from .services import mark_read
+
+
+@login_required
+def notification_list(request):
+    template_name = "notifications/index.html"
+    notifications = request.user.notifications.select_related(
+        "actor", "post"
+    )
+    context = {
+        "page_obj": paginator_func(notifications, request),
+        "last_read_id": mark_read(request.user),
+    }
+    return render(request, template_name, context)
@@ -1,6 +1,14 @@
 from django.contrib import admin
 
-from .models import Comment, Follow, Group, Post
+from . import feeds
+from .models import (
+    ArchivedComment,
+    ArchivedPost,
+    Comment,
+    Follow,
+    Group,
+    Post,
+)
 
 
 @admin.register(Post)
@@ -17,6 +25,18 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ("pub_date",)
     empty_value_display = "-пусто-"
 
+    # Удаление идёт мимо сигналов (см. posts/feeds.py), поэтому ленты
+    # сбрасываются здесь.
+    def delete_model(self, request, obj):
+        scopes = feeds.scopes_for_posts(Post.objects.filter(pk=obj.pk))
+        super().delete_model(request, obj)
+        feeds.bump(scopes)
+
+    def delete_queryset(self, request, queryset):
+        scopes = feeds.scopes_for_posts(queryset)
+        super().delete_queryset(request, queryset)
+        feeds.bump(scopes)
+
 
 @admin.register(Group)
 class GroupAdmin(admin.ModelAdmin):
@@ -44,3 +64,28 @@ class FollowAdmin(admin.ModelAdmin):
         "author",
         "user",
     )
+
+
+@admin.register(ArchivedPost)
+class ArchivedPostAdmin(admin.ModelAdmin):
+    list_display = (
+        "pk",
+        "text",
+        "pub_date",
+        "author",
+        "group",
+        "archived_at",
+    )
+    search_fields = ("text",)
+    list_filter = ("pub_date",)
+    empty_value_display = "-пусто-"
+
+
+@admin.register(ArchivedComment)
+class ArchivedCommentAdmin(admin.ModelAdmin):
+    list_display = (
+        "text",
+        "author",
+        "pub_date",
+        "post_id",
+    )
@@ -0,0 +1,82 @@
+import itertools
+import threading
+from collections import deque, namedtuple
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+Event = namedtuple("Event", ("id", "channel", "name", "data"))
+
+INDEX_CHANNEL = "index"
+
+
+def group_channel(group_id):
+    return f"group:{group_id}"
+
+
+def author_channel(author_id):
+    return f"author:{author_id}"
+
+
+def post_channel(post_id):
+    return f"post:{post_id}"
+
+
+class InProcessBroker:
+    """Pub/sub в памяти процесса.
+
+    Хранит последние события в кольцевом буфере, чтобы клиент,
+    переподключившийся с Last-Event-ID, получил пропущенное.
+    Подходит для разработки и однопроцессного запуска; для нескольких
+    воркеров подключается внешний брокер с тем же интерфейсом.
+    """
+
+    def __init__(self, backlog=None):
+        self._events = deque(maxlen=backlog or settings.EVENTS_BACKLOG)
+        self._ids = itertools.count(1)
+        self._condition = threading.Condition()
+
+    @property
+    def last_id(self):
+        with self._condition:
+            return self._events[-1].id if self._events else 0
+
+    def publish(self, channel, name, data):
+        with self._condition:
+            event = Event(next(self._ids), channel, name, data)
+            self._events.append(event)
+            self._condition.notify_all()
+        return event
+
+    def _collect(self, channels, last_id):
+        return [
+            event
+            for event in self._events
+            if event.id > last_id and event.channel in channels
+        ]
+
+    def wait(self, channels, last_id, timeout):
+        """Возвращает события каналов после last_id.
+
+        Если таких событий нет, ждёт новых не дольше timeout секунд.
+        """
+        channels = set(channels)
+        with self._condition:
+            events = self._collect(channels, last_id)
+            if not events:
+                self._condition.wait(timeout)
+                events = self._collect(channels, last_id)
+            return events
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.EVENTS_BROKER)()
+    return _broker
@@ -0,0 +1,242 @@
+"""RSS/Atom-ленты: общая, группы и автора.
+
+Готовая лента кэшируется до ближайшей записи Post в её области.
+Сохранение поста сбрасывает области в signals.invalidate_feeds, а код,
+удаляющий посты пачками (архив, удаление аккаунта), сам вызывает bump
+один раз на пачку: приёмник post_delete отключил бы быстрое удаление.
+Версия области — время записи: из неё же получаются ETag и
+Last-Modified, поэтому условный запрос с актуальной версией получает
+304 без обращения к БД. Версия живёт не дольше FEEDS_CACHE_TIME:
+изменения в обход сигналов (update(), raw SQL, удаление из админки)
+попадают в ленту вместе с новым ETag после истечения срока.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.http import http_date
+from django.utils.text import Truncator
+
+from core.queries import query_budget
+from core.routers import replica_reads
+
+from .models import Group, Post
+
+User = get_user_model()
+
+FORMATS = {"rss": Rss201rev2Feed, "atom": Atom1Feed}
+ITEM_FIELDS = (
+    "id",
+    "text",
+    "pub_date",
+    "author__username",
+    "author__first_name",
+    "author__last_name",
+    "group__title",
+)
+
+
+def index_scope():
+    return "index"
+
+
+def group_scope(slug):
+    return f"group:{slug}"
+
+
+def author_scope(username):
+    return f"author:{username}"
+
+
+def _version_key(scope):
+    return f"feed_version:{scope}"
+
+
+def get_version(scope):
+    key = _version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        version = time.time()
+        # Параллельный запрос мог успеть записать свою версию.
+        if not cache.add(key, version, settings.FEEDS_CACHE_TIME):
+            version = cache.get(key, version)
+    return version
+
+
+def bump(scopes):
+    """Новая версия областей: закэшированные ленты больше не читаются."""
+    version = time.time()
+    cache.set_many(
+        {_version_key(scope): version for scope in scopes},
+        settings.FEEDS_CACHE_TIME,
+    )
+
+
+def post_scopes(author_ids, group_ids):
+    """Области лент, где показываются посты этих авторов и групп.
+
+    Области адресуются slug и username из URL, чтобы условный запрос
+    обходился без БД, поэтому id переводятся в имена здесь.
+    """
+    scopes = [index_scope()]
+    scopes.extend(
+        author_scope(username)
+        for username in User.objects.filter(id__in=author_ids).values_list(
+            "username", flat=True
+        )
+    )
+    if group_ids:
+        scopes.extend(
+            group_scope(slug)
+            for slug in Group.objects.filter(id__in=group_ids).values_list(
+                "slug", flat=True
+            )
+        )
+    return scopes
+
+
+def scopes_for_posts(posts):
+    """Области лент с постами queryset posts; вызывается до удаления."""
+    author_ids, group_ids = set(), set()
+    for author_id, group_id in (
+        posts.order_by().values_list("author_id", "group_id").distinct()
+    ):
+        author_ids.add(author_id)
+        if group_id:
+            group_ids.add(group_id)
+    return post_scopes(author_ids, group_ids)
+
+
+class PostsFeed(Feed):
+    """Лента постов из .values(): без моделей и запросов на элемент."""
+
+    def get_posts(self, obj):
+        return Post.objects.all()
+
+    def items(self, obj):
+        return self.get_posts(obj).values(*ITEM_FIELDS)[
+            : settings.FEEDS_ITEMS
+        ]
+
+    def item_title(self, item):
+        return Truncator(item["text"]).words(10)
+
+    def item_description(self, item):
+        return item["text"]
+
+    def item_link(self, item):
+        return reverse("posts:post_detail", args=[item["id"]])
+
+    def item_pubdate(self, item):
+        return item["pub_date"]
+
+    def item_author_name(self, item):
+        full_name = "{} {}".format(
+            item["author__first_name"], item["author__last_name"]
+        ).strip()
+        return full_name or item["author__username"]
+
+    def item_categories(self, item):
+        return [item["group__title"]] if item["group__title"] else []
+
+
+class IndexFeed(PostsFeed):
+    title = "Yatube: последние обновления"
+    description = "Новые посты всех авторов"
+
+    def link(self):
+        return reverse("posts:index")
+
+
+class GroupFeed(PostsFeed):
+    def get_object(self, request, slug):
+        group = (
+            Group.objects.filter(slug=slug)
+            .values("id", "slug", "title", "description")
+            .first()
+        )
+        if group is None:
+            raise Http404
+        return group
+
+    def get_posts(self, obj):
+        return Post.objects.filter(group_id=obj["id"])
+
+    def title(self, obj):
+        return f"Yatube: {obj['title']}"
+
+    def description(self, obj):
+        return obj["description"]
+
+    def link(self, obj):
+        return reverse("posts:group_list", args=[obj["slug"]])
+
+
+class AuthorFeed(PostsFeed):
+    def get_object(self, request, username):
+        author = (
+            User.objects.filter(username=username)
+            .values("id", "username")
+            .first()
+        )
+        if author is None:
+            raise Http404
+        return author
+
+    def get_posts(self, obj):
+        return Post.objects.filter(author_id=obj["id"])
+
+    def title(self, obj):
+        return f"Yatube: посты {obj['username']}"
+
+    def description(self, obj):
+        return f"Новые посты пользователя {obj['username']}"
+
+    def link(self, obj):
+        return reverse("posts:profile", args=[obj["username"]])
+
+
+def cached_feed(feed_class, get_scope):
+    """Представление ленты с кэшем по версии области и условным GET."""
+
+    def view(request, kind, **kwargs):
+        if kind not in FORMATS:
+            raise Http404
+        scope = get_scope(**kwargs)
+        version = get_version(scope)
+        etag = f'"{scope}:{kind}:{version}"'
+        last_modified = int(version)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            key = f"feed:{kind}:{scope}:{version}"
+            cached = cache.get(key)
+            if cached is None:
+                feed = feed_class()
+                feed.feed_type = FORMATS[kind]
+                response = feed(request, **kwargs)
+                cache.set(
+                    key,
+                    (response["Content-Type"], response.content),
+                    settings.FEEDS_CACHE_TIME,
+                )
+            else:
+                content_type, content = cached
+                response = HttpResponse(content, content_type=content_type)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    return replica_reads(query_budget(3)(view))
+
+
+index_feed = cached_feed(IndexFeed, index_scope)
+group_feed = cached_feed(GroupFeed, group_scope)
+author_feed = cached_feed(AuthorFeed, author_scope)
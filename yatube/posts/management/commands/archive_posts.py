@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from notifications.models import Notification
+from notifications.services import discard
+from posts import feeds
+from posts.models import ArchivedComment, ArchivedPost, Comment, Post
+
+POST_FIELDS = ("id", "text", "pub_date", "group_id", "author_id", "image")
+COMMENT_FIELDS = ("id", "post_id", "author_id", "text", "pub_date")
+
+
+class Command(BaseCommand):
+    help = (
+        "Переносит посты старше --older-than дней вместе с комментариями "
+        "в холодные таблицы ArchivedPost/ArchivedComment."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=settings.ARCHIVE_AFTER_DAYS,
+            help="Возраст поста в днях, после которого он уходит в архив.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.ARCHIVE_BATCH_SIZE,
+            help="Сколько постов переносить за одну транзакцию.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["older_than"])
+        old_posts = Post.objects.filter(pub_date__lt=cutoff).order_by("id")
+        archived = 0
+        while True:
+            ids = list(
+                old_posts.values_list("id", flat=True)[: options["batch_size"]]
+            )
+            if not ids:
+                break
+            self.archive(ids)
+            archived += len(ids)
+        self.stdout.write(f"Перенесено в архив постов: {archived}")
+
+    @transaction.atomic
+    def archive(self, ids):
+        scopes = feeds.scopes_for_posts(Post.objects.filter(id__in=ids))
+        ArchivedPost.objects.bulk_create(
+            ArchivedPost(**row)
+            for row in Post.objects.filter(id__in=ids).values(*POST_FIELDS)
+        )
+        comments = Comment.objects.filter(post_id__in=ids)
+        ArchivedComment.objects.bulk_create(
+            ArchivedComment(**row)
+            for row in comments.values(*COMMENT_FIELDS).iterator()
+        )
+        comments.delete()
+        # Уведомления о постах иначе удалил бы каскад, не поправив
+        # счётчики непрочитанного.
+        discard(Notification.objects.filter(post_id__in=ids))
+        Post.objects.filter(id__in=ids).delete()
+        feeds.bump(scopes)
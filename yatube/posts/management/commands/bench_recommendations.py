@@ -0,0 +1,56 @@
+import time
+import tracemalloc
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.recommendations import build_adjacency, top_suggestions
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет расчёт рекомендаций на синтетическом графе подписок "
+        "со степенным распределением популярности авторов. База не нужна."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100000)
+        parser.add_argument("--edges", type=int, default=1000000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        users, edges = options["users"], options["edges"]
+        followers = rng.integers(0, users, size=edges)
+        # Популярность автора ~ Zipf: немногие авторы собирают
+        # большую часть подписок.
+        authors = (rng.zipf(1.3, size=edges) - 1) % users
+        authors = rng.permutation(users)[authors]
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        adjacency, ids = build_adjacency(followers, authors)
+        built = time.perf_counter()
+        rows = suggestions = 0
+        for _, candidates, _ in top_suggestions(
+            adjacency,
+            settings.RECOMMENDATIONS_TOP_K,
+            settings.RECOMMENDATIONS_BLOCK_SIZE,
+            settings.RECOMMENDATIONS_WEIGHTS,
+            settings.RECOMMENDATIONS_MAX_DEGREE,
+            settings.RECOMMENDATIONS_NEIGHBOURS,
+        ):
+            rows += 1
+            suggestions += len(candidates)
+        finished = time.perf_counter()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.stdout.write(
+            f"graph: {len(ids)} users, {adjacency.nnz} edges\n"
+            f"build matrix: {built - started:.2f} s\n"
+            f"score + top-k: {finished - built:.2f} s "
+            f"({rows} users, {suggestions} suggestions)\n"
+            f"peak python memory: {peak / 2 ** 20:.0f} MiB"
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from posts.recommendations import rebuild_suggestions
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает рекомендации «кого почитать» по графу подписок. "
+        "Запускается периодически, например из cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top-k", type=int, default=None)
+        parser.add_argument("--block-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        stored = rebuild_suggestions(
+            top_k=options["top_k"], block_size=options["block_size"]
+        )
+        self.stdout.write(f"Сохранено рекомендаций: {stored}")
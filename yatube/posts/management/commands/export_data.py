@@ -0,0 +1,108 @@
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from posts.models import (
+    ArchivedComment,
+    ArchivedPost,
+    Comment,
+    Follow,
+    Group,
+    Post,
+)
+
+User = get_user_model()
+
+POST_FIELDS = (
+    "id",
+    "text",
+    "pub_date",
+    "author__username",
+    "group__slug",
+    "image",
+)
+COMMENT_FIELDS = ("id", "post_id", "author__username", "text", "pub_date")
+
+# Порядок важен: при импорте записи ссылаются только на уже прочитанные.
+EXPORTS = (
+    (
+        "user",
+        User.objects.order_by("id"),
+        (
+            "username",
+            "password",
+            "first_name",
+            "last_name",
+            "email",
+            "is_active",
+            "date_joined",
+        ),
+    ),
+    (
+        "group",
+        Group.objects.order_by("id"),
+        ("slug", "title", "description"),
+    ),
+    (
+        "post",
+        Post.objects.order_by("id"),
+        POST_FIELDS,
+    ),
+    ("comment", Comment.objects.order_by("id"), COMMENT_FIELDS),
+    ("archived_post", ArchivedPost.objects.order_by("id"), POST_FIELDS),
+    (
+        "archived_comment",
+        ArchivedComment.objects.order_by("id"),
+        COMMENT_FIELDS,
+    ),
+    (
+        "follow",
+        Follow.objects.order_by("id"),
+        ("user__username", "author__username"),
+    ),
+)
+
+
+def encode_value(value):
+    # DjangoJSONEncoder округляет время до миллисекунд, а выгрузка
+    # должна сохранять даты точно.
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Не сериализуется в JSON: {value!r}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Выгружает пользователей, группы, посты и комментарии (вместе "
+        "с архивными) и подписки в NDJSON: одна запись на строку, "
+        "данные читаются порциями."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output", help="Файл для выгрузки; по умолчанию stdout."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.TRANSFER_BATCH_SIZE,
+            help="Сколько строк читать из базы за раз.",
+        )
+
+    def handle(self, *args, **options):
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as stream:
+                self.export(stream, options["chunk_size"])
+        else:
+            self.export(self.stdout, options["chunk_size"])
+
+    def export(self, stream, chunk_size):
+        encoder = json.JSONEncoder(ensure_ascii=False, default=encode_value)
+        for model, queryset, fields in EXPORTS:
+            rows = queryset.values(*fields).iterator(chunk_size=chunk_size)
+            for row in rows:
+                row["model"] = model
+                stream.write(encoder.encode(row) + "\n")
@@ -0,0 +1,213 @@
+import json
+import os
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils.dateparse import parse_datetime
+
+from posts.models import (
+    ArchivedComment,
+    ArchivedPost,
+    Comment,
+    Follow,
+    Group,
+    Post,
+)
+
+User = get_user_model()
+
+
+@contextmanager
+def keep_pub_date(*models):
+    """Отключает auto_now_add, чтобы сохранить даты из выгрузки."""
+    fields = [model._meta.get_field("pub_date") for model in models]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = (
+        "Загружает NDJSON из export_data через bulk_create порциями, "
+        "каждая порция — в своей транзакции."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Файл NDJSON.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TRANSFER_BATCH_SIZE,
+            help="Сколько записей вставлять за одну транзакцию.",
+        )
+        parser.add_argument(
+            "--media-from",
+            help="MEDIA_ROOT исходного сайта, откуда копировать картинки.",
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options["batch_size"]
+        self.media_from = options["media_from"]
+        self.users = dict(User.objects.values_list("username", "id"))
+        self.groups = dict(Group.objects.values_list("slug", "id"))
+        # У Follow нет уникального ограничения: повторный импорт той же
+        # выгрузки иначе удвоил бы подписки.
+        self.follows = set(Follow.objects.values_list("user_id", "author_id"))
+        # Новый id = старый id + сдвиг: ссылки комментариев на посты
+        # пересчитываются без словаря на все посты. Архив делит id
+        # с горячими таблицами, поэтому сдвиг считается по обеим.
+        self.post_offset = self.last_id(Post, ArchivedPost)
+        self.comment_offset = self.last_id(Comment, ArchivedComment)
+        self.builders = {
+            "user": self.build_user,
+            "group": self.build_group,
+            "post": self.build_post,
+            "comment": self.build_comment,
+            "archived_post": self.build_archived_post,
+            "archived_comment": self.build_archived_comment,
+            "follow": self.build_follow,
+        }
+        self.pending = {}
+        self.counts = {}
+        with keep_pub_date(Post, Comment):
+            with open(options["path"], encoding="utf-8") as stream:
+                for number, line in enumerate(stream, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        row = json.loads(line)
+                        self.add(row.pop("model"), row)
+                    except (KeyError, ValueError) as error:
+                        raise CommandError(f"Строка {number}: {error!r}")
+            for model in list(self.pending):
+                self.flush(model)
+        self.reset_sequences()
+        for model, count in self.counts.items():
+            self.stdout.write(f"{model}: {count}")
+
+    @staticmethod
+    def last_id(*models):
+        return max(
+            model.objects.aggregate(last=Max("id"))["last"] or 0
+            for model in models
+        )
+
+    def add(self, model, row):
+        # Выгрузка упорядочена по типам: когда тип записи сменился,
+        # дописываем хвост предыдущего, чтобы ссылки на него разрешились.
+        if self.pending and model not in self.pending:
+            self.flush(next(iter(self.pending)))
+        batch = self.pending.setdefault(model, [])
+        obj = self.builders[model](row)
+        if obj is not None:
+            batch.append(obj)
+        if len(batch) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model):
+        batch = self.pending.pop(model, [])
+        if not batch:
+            return
+        with transaction.atomic():
+            type(batch[0]).objects.bulk_create(batch)
+            if model == "user":
+                self.users.update(
+                    User.objects.filter(
+                        username__in=[user.username for user in batch]
+                    ).values_list("username", "id")
+                )
+            elif model == "group":
+                self.groups.update(
+                    Group.objects.filter(
+                        slug__in=[group.slug for group in batch]
+                    ).values_list("slug", "id")
+                )
+        self.counts[model] = self.counts.get(model, 0) + len(batch)
+
+    def build_user(self, row):
+        if row["username"] in self.users:
+            return None
+        row["date_joined"] = parse_datetime(row["date_joined"])
+        return User(**row)
+
+    def build_group(self, row):
+        if row["slug"] in self.groups:
+            return None
+        return Group(**row)
+
+    def post_fields(self, row):
+        if row["image"]:
+            self.copy_image(row["image"])
+        return {
+            "id": row["id"] + self.post_offset,
+            "text": row["text"],
+            "pub_date": parse_datetime(row["pub_date"]),
+            "author_id": self.users.get(row["author__username"]),
+            "group_id": self.groups.get(row["group__slug"]),
+            "image": row["image"],
+        }
+
+    def comment_fields(self, row):
+        fields = {
+            "post_id": row["post_id"] + self.post_offset,
+            "author_id": self.users[row["author__username"]],
+            "text": row["text"],
+            "pub_date": parse_datetime(row["pub_date"]),
+        }
+        # В старых выгрузках id комментариев нет.
+        if "id" in row:
+            fields["id"] = row["id"] + self.comment_offset
+        return fields
+
+    def build_post(self, row):
+        return Post(**self.post_fields(row))
+
+    def build_comment(self, row):
+        return Comment(**self.comment_fields(row))
+
+    def build_archived_post(self, row):
+        return ArchivedPost(**self.post_fields(row))
+
+    def build_archived_comment(self, row):
+        return ArchivedComment(**self.comment_fields(row))
+
+    def build_follow(self, row):
+        pair = (
+            self.users[row["user__username"]],
+            self.users[row["author__username"]],
+        )
+        if pair in self.follows:
+            return None
+        self.follows.add(pair)
+        return Follow(user_id=pair[0], author_id=pair[1])
+
+    def copy_image(self, name):
+        if not self.media_from or default_storage.exists(name):
+            return
+        source = os.path.join(self.media_from, name)
+        if not os.path.exists(source):
+            self.stderr.write(f"Нет файла картинки: {source}")
+            return
+        with open(source, "rb") as image:
+            default_storage.save(name, File(image))
+
+    def reset_sequences(self):
+        # Посты вставлялись с явными id; выравниваем счётчики там,
+        # где СУБД сама этого не делает (PostgreSQL и т. п.).
+        statements = connection.ops.sequence_reset_sql(
+            self.style, [Post, Comment, Follow, Group, User]
+        )
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
@@ -0,0 +1,193 @@
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+
+from posts.models import Comment, Follow, Group, Post
+
+from .import_data import keep_pub_date
+
+User = get_user_model()
+
+SEED_PASSWORD = "seed-password"
+TEXTS = 2000
+
+
+class Command(BaseCommand):
+    help = (
+        "Заполняет базу синтетическими данными для нагрузочных тестов: "
+        "пользователи, группы, посты с Zipf-распределением по авторам, "
+        "комментарии и граф подписок со степенным распределением. "
+        "При одинаковом --seed данные одинаковые."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--groups", type=int, default=20)
+        parser.add_argument("--posts", type=int, default=20000)
+        parser.add_argument("--comments", type=int, default=50000)
+        parser.add_argument("--follows", type=int, default=20000)
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.TRANSFER_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        self.rng = np.random.default_rng(options["seed"])
+        self.batch_size = options["batch_size"]
+        fake = Faker("ru_RU")
+        fake.seed_instance(options["seed"])
+        # Faker медленный, поэтому тексты берутся из заранее
+        # сгенерированного набора.
+        self.texts = [fake.text(max_nb_chars=400) for _ in range(TEXTS)]
+        self.now = timezone.now()
+        self.days = options["days"]
+
+        user_ids = self.create_users(options["users"], options["seed"])
+        group_ids = self.create_groups(fake, options["groups"])
+        with keep_pub_date(Post, Comment):
+            post_ids = self.create_posts(options["posts"], user_ids, group_ids)
+            self.create_comments(options["comments"], user_ids, post_ids)
+        self.create_follows(options["follows"], user_ids)
+        statements = connection.ops.sequence_reset_sql(self.style, [Post])
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def zipf(self, size, count, exponent=1.5):
+        """Номера 0..count-1: немногие номера выпадают очень часто.
+
+        Какие именно номера популярны, решает случайная перестановка.
+        """
+        ranks = (self.rng.zipf(exponent, size=size) - 1) % count
+        return self.rng.permutation(count)[ranks]
+
+    def dates(self, size):
+        seconds = self.rng.uniform(0, self.days * 86400, size=size)
+        return [
+            self.now - timedelta(seconds=float(value)) for value in seconds
+        ]
+
+    def text(self):
+        return self.texts[self.rng.integers(len(self.texts))]
+
+    def insert(self, model, objects):
+        objects = list(objects)
+        for start in range(0, len(objects), self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(
+                    objects[start:start + self.batch_size]
+                )
+        self.stdout.write(f"{model._meta.model_name}: {len(objects)}")
+
+    def create_users(self, count, seed):
+        prefix = f"seed{seed}_"
+        password = make_password(SEED_PASSWORD)
+        existing = set(
+            User.objects.filter(username__startswith=prefix).values_list(
+                "username", flat=True
+            )
+        )
+        self.insert(
+            User,
+            (
+                User(username=f"{prefix}{number}", password=password)
+                for number in range(count)
+                if f"{prefix}{number}" not in existing
+            ),
+        )
+        return np.array(
+            User.objects.filter(username__startswith=prefix)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+    def create_groups(self, fake, count):
+        existing = Group.objects.count()
+        self.insert(
+            Group,
+            (
+                Group(
+                    title=fake.sentence(nb_words=3)[:200],
+                    slug=f"seed-{existing + number}",
+                    description=self.text(),
+                )
+                for number in range(count)
+            ),
+        )
+        return np.array(
+            Group.objects.order_by("id").values_list("id", flat=True)
+        )
+
+    def create_posts(self, count, user_ids, group_ids):
+        first = (Post.objects.aggregate(last=Max("id"))["last"] or 0) + 1
+        authors = user_ids[self.zipf(count, len(user_ids))]
+        grouped = self.rng.random(count) < 0.7
+        groups = (
+            group_ids[self.zipf(count, len(group_ids))]
+            if len(group_ids)
+            else np.zeros(count, dtype=int)
+        )
+        dates = self.dates(count)
+        self.insert(
+            Post,
+            (
+                Post(
+                    id=first + number,
+                    author_id=int(authors[number]),
+                    group_id=(
+                        int(groups[number])
+                        if grouped[number] and len(group_ids)
+                        else None
+                    ),
+                    text=self.text(),
+                    pub_date=dates[number],
+                )
+                for number in range(count)
+            ),
+        )
+        return np.arange(first, first + count)
+
+    def create_comments(self, count, user_ids, post_ids):
+        if not len(post_ids):
+            return
+        posts = post_ids[self.zipf(count, len(post_ids), exponent=1.2)]
+        authors = self.rng.choice(user_ids, size=count)
+        dates = self.dates(count)
+        self.insert(
+            Comment,
+            (
+                Comment(
+                    post_id=int(posts[number]),
+                    author_id=int(authors[number]),
+                    text=self.text()[:200],
+                    pub_date=dates[number],
+                )
+                for number in range(count)
+            ),
+        )
+
+    def create_follows(self, count, user_ids):
+        followers = self.rng.choice(user_ids, size=count)
+        authors = user_ids[self.zipf(count, len(user_ids), exponent=1.3)]
+        existing = set(Follow.objects.values_list("user_id", "author_id"))
+        pairs = {
+            (int(user), int(author))
+            for user, author in zip(followers, authors)
+            if user != author
+        } - existing
+        self.insert(
+            Follow,
+            (
+                Follow(user_id=user, author_id=author)
+                for user, author in sorted(pairs)
+            ),
+        )
@@ -37,10 +37,44 @@ class Post(CreateModel):
         verbose_name="Автор",
     )
     image = models.ImageField("Картинка", upload_to="posts/", blank=True)
+    version = models.PositiveIntegerField(
+        "Версия", default=1, editable=False
+    )
+
+    is_archived = False
+    # Группа и автор на момент загрузки из БД: при их смене ленты
+    # сбрасываются и для прежних (posts/signals.invalidate_feeds).
+    loaded_scope = {}
 
     def __str__(self):
         return self.text[:15]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_scope = {
+            name: value
+            for name, value in zip(field_names, values)
+            if name in ("author_id", "group_id")
+            and value is not models.DEFERRED
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Версия входит в ключ кэша карточки поста: правка делает
+        # закэшированную карточку недостижимой. Увеличивает её сама БД,
+        # чтобы параллельные правки не получили одну и ту же версию.
+        bumped = self.pk is not None
+        if bumped:
+            self.version = models.F("version") + 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "version"}
+        super().save(*args, **kwargs)
+        if bumped:
+            # Поле становится отложенным и перечитывается при первом
+            # обращении, а не лишним запросом на каждое сохранение.
+            del self.version
+
 
 class Comment(CreateModel):
     post = models.ForeignKey(
@@ -69,3 +103,103 @@ class Follow(models.Model):
     author = models.ForeignKey(
         User, related_name="following", on_delete=models.CASCADE
     )
+
+
+class ArchivedPost(models.Model):
+    """Холодная копия старого поста. id совпадает с id исходного Post."""
+
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField(verbose_name="Текст поста")
+    pub_date = models.DateTimeField("Дата создания", db_index=True)
+    group = models.ForeignKey(
+        Group,
+        blank=True,
+        null=True,
+        on_delete=SET_NULL,
+        related_name="archived_posts",
+        verbose_name="Группа",
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name="archived_posts",
+        verbose_name="Автор",
+    )
+    image = models.ImageField("Картинка", upload_to="posts/", blank=True)
+    archived_at = models.DateTimeField("Дата архивации", auto_now_add=True)
+
+    is_archived = True
+
+    class Meta:
+        ordering = ["-pub_date"]
+
+    def __str__(self):
+        return self.text[:15]
+
+
+class ArchivedComment(models.Model):
+    id = models.IntegerField(primary_key=True)
+    post = models.ForeignKey(
+        ArchivedPost, on_delete=models.CASCADE, related_name="comments"
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="archived_comments",
+        verbose_name="Автор",
+    )
+    text = models.TextField(verbose_name="Текст комментария", blank=True)
+    pub_date = models.DateTimeField("Дата создания")
+
+    class Meta:
+        ordering = ["-pub_date"]
+
+    def __str__(self):
+        return self.text[:15]
+
+
+class FollowSuggestion(models.Model):
+    """Рекомендация автора для подписки, считается пакетно."""
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="follow_suggestions"
+    )
+    author = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="+"
+    )
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ["-score"]
+        indexes = [models.Index(fields=["user", "-score"])]
+
+    def __str__(self):
+        return f"{self.user} -> {self.author}"
+
+
+class PostScore(models.Model):
+    """Затухающая популярность поста (см. posts/trending.py)."""
+
+    post = models.OneToOneField(
+        Post, on_delete=models.CASCADE, primary_key=True, related_name="trend"
+    )
+    score = models.FloatField(db_index=True)
+
+    def __str__(self):
+        return f"{self.post_id}: {self.score}"
+
+
+class GroupScore(models.Model):
+    """Затухающая популярность группы (см. posts/trending.py)."""
+
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="trend",
+    )
+    score = models.FloatField(db_index=True)
+
+    def __str__(self):
+        return f"{self.group_id}: {self.score}"
@@ -0,0 +1,168 @@
+"""Рекомендации «кого почитать» по графу подписок.
+
+Граф подписок хранится как разреженная матрица A (пользователь ->
+автор). Кандидаты для пользователя считаются одним умножением строки A
+на матрицу K = w_fof * A + w_co * C, где
+    A @ A — друзья друзей: на кого подписаны те, на кого подписан я;
+    C — косинусная близость авторов по общим подписчикам (A.T @ A),
+        то есть «с этими авторами часто читают ещё и...».
+"""
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from scipy import sparse
+
+from .models import Follow, FollowSuggestion
+
+
+def build_adjacency(followers, authors):
+    """Строит матрицу подписок из массивов id подписчиков и авторов.
+
+    Возвращает CSR-матрицу в компактной нумерации и массив, который
+    переводит номер строки/столбца обратно в id пользователя.
+    """
+    ids, inverse = np.unique(
+        np.concatenate([followers, authors]), return_inverse=True
+    )
+    rows, cols = np.split(inverse, 2)
+    size = len(ids)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+        shape=(size, size),
+    )
+    # Повторные подписки схлопываются в одну связь.
+    matrix.data[:] = 1
+    return matrix, ids
+
+
+def co_follow_matrix(adjacency, max_degree):
+    """Косинусная близость авторов по общим подписчикам.
+
+    Подписчики с числом подписок больше max_degree не учитываются:
+    они дают квадратичный рост A.T @ A, почти не добавляя сигнала.
+    """
+    out_degree = np.diff(adjacency.indptr)
+    keep = sparse.diags((out_degree <= max_degree).astype(np.float32))
+    limited = keep @ adjacency
+    co_follow = (limited.T @ limited).tocsr()
+    co_follow.setdiag(0)
+    co_follow.eliminate_zeros()
+    norm = np.sqrt(np.asarray(limited.sum(axis=0)).ravel())
+    norm[norm == 0] = 1
+    inverse_norm = sparse.diags(1 / norm)
+    return (inverse_norm @ co_follow @ inverse_norm).tocsr()
+
+
+def _top_per_row(matrix, limit):
+    """Оставляет в каждой строке CSR-матрицы limit наибольших значений."""
+    matrix = matrix.tocsr()
+    row_sizes = np.diff(matrix.indptr)
+    keep = np.ones(matrix.nnz, dtype=bool)
+    for row in np.flatnonzero(row_sizes > limit):
+        low, high = matrix.indptr[row], matrix.indptr[row + 1]
+        smallest = np.argpartition(
+            matrix.data[low:high], high - low - limit
+        )[: high - low - limit]
+        keep[low + smallest] = False
+    matrix.data[~keep] = 0
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def top_suggestions(
+    adjacency, top_k, block_size, weights, max_degree, neighbours
+):
+    """Генерирует (номер пользователя, номера авторов, оценки).
+
+    Оценки считаются блоками строк, поэтому память ограничена размером
+    блока, а не квадратом числа пользователей. У каждого автора в K
+    остаются только neighbours ближайших соседей: иначе строка
+    популярного автора делает результат умножения почти плотным.
+    """
+    fof_weight, co_weight = weights
+    kernel = _top_per_row(
+        fof_weight * adjacency
+        + co_weight * co_follow_matrix(adjacency, max_degree),
+        neighbours,
+    )
+    size = adjacency.shape[0]
+    for start in range(0, size, block_size):
+        stop = min(start + block_size, size)
+        block = adjacency[start:stop]
+        scores = (block @ kernel).tocsr()
+        # Уже подписанных и самого себя не рекомендуем.
+        exclude = block + sparse.eye(
+            stop - start, size, k=start, format="csr"
+        )
+        exclude.data[:] = 1
+        scores = (scores - scores.multiply(exclude)).tocsr()
+        scores.eliminate_zeros()
+        for offset in range(stop - start):
+            low, high = scores.indptr[offset], scores.indptr[offset + 1]
+            if low == high:
+                continue
+            data = scores.data[low:high]
+            count = min(top_k, high - low)
+            best = np.argpartition(-data, count - 1)[:count]
+            best = best[np.argsort(-data[best])]
+            yield start + offset, scores.indices[low:high][best], data[best]
+
+
+def rebuild_suggestions(top_k=None, block_size=None):
+    """Пересчитывает FollowSuggestion для всех пользователей.
+
+    Оценки считаются вне транзакции; замена таблицы — одна короткая
+    транзакция, чтобы не держать блокировку записи SQLite всё время
+    расчёта.
+    """
+    top_k = top_k or settings.RECOMMENDATIONS_TOP_K
+    block_size = block_size or settings.RECOMMENDATIONS_BLOCK_SIZE
+    # Один запрос без count(): иначе удалённая между ними подписка
+    # ломала бы np.fromiter с заданной длиной.
+    pairs = np.fromiter(
+        (
+            pk
+            for edge in Follow.objects.values_list(
+                "user_id", "author_id"
+            ).iterator(chunk_size=10000)
+            for pk in edge
+        ),
+        dtype=np.int64,
+    )
+    followers, authors = pairs[0::2], pairs[1::2]
+    if not len(followers):
+        FollowSuggestion.objects.all().delete()
+        return 0
+    adjacency, ids = build_adjacency(followers, authors)
+    users, candidates, scores = [], [], []
+    for user, user_candidates, user_scores in top_suggestions(
+        adjacency,
+        top_k,
+        block_size,
+        settings.RECOMMENDATIONS_WEIGHTS,
+        settings.RECOMMENDATIONS_MAX_DEGREE,
+        settings.RECOMMENDATIONS_NEIGHBOURS,
+    ):
+        users.append(np.full(len(user_candidates), ids[user]))
+        candidates.append(ids[user_candidates])
+        scores.append(user_scores)
+    rows = (
+        list(
+            zip(
+                np.concatenate(users).tolist(),
+                np.concatenate(candidates).tolist(),
+                np.concatenate(scores).tolist(),
+            )
+        )
+        if users
+        else []
+    )
+    batch_size = settings.TRANSFER_BATCH_SIZE
+    with transaction.atomic():
+        FollowSuggestion.objects.all().delete()
+        for start in range(0, len(rows), batch_size):
+            FollowSuggestion.objects.bulk_create(
+                FollowSuggestion(user_id=user, author_id=author, score=score)
+                for user, author, score in rows[start:start + batch_size]
+            )
+    return len(rows)
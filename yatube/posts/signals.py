@@ -0,0 +1,77 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.template.loader import render_to_string
+
+from .events import (
+    INDEX_CHANNEL,
+    author_channel,
+    get_broker,
+    group_channel,
+    post_channel,
+)
+from . import feeds, trending
+from .models import Comment, Follow, Post
+
+
+@receiver(post_save, sender=Post, dispatch_uid="posts_publish_new_post")
+def publish_new_post(sender, instance, created, **kwargs):
+    if not created:
+        return
+    channels = [INDEX_CHANNEL, author_channel(instance.author_id)]
+    if instance.group_id:
+        channels.append(group_channel(instance.group_id))
+
+    def publish():
+        html = render_to_string(
+            "posts/includes/post_event.html", {"post": instance}
+        )
+        broker = get_broker()
+        for channel in channels:
+            broker.publish(channel, "post", html)
+
+    transaction.on_commit(publish)
+
+
+@receiver(
+    post_save, sender=Comment, dispatch_uid="posts_publish_new_comment"
+)
+def publish_new_comment(sender, instance, created, **kwargs):
+    if not created:
+        return
+
+    def publish():
+        html = render_to_string(
+            "posts/includes/comment.html", {"comment": instance}
+        )
+        get_broker().publish(post_channel(instance.post_id), "comment", html)
+
+    transaction.on_commit(publish)
+
+
+@receiver(post_save, sender=Comment, dispatch_uid="posts_trending_comment")
+def trend_commented_post(sender, instance, created, **kwargs):
+    if created:
+        trending.record(
+            trending.COMMENT, instance.post_id, instance.post.group_id
+        )
+
+
+@receiver(post_save, sender=Follow, dispatch_uid="posts_trending_follow")
+def trend_followed_author(sender, instance, created, **kwargs):
+    if created:
+        trending.record_author_followed(instance.author_id)
+
+
+@receiver(post_save, sender=Post, dispatch_uid="posts_feeds_changed")
+def invalidate_feeds(sender, instance, **kwargs):
+    # Сбрасываются области и новых, и прежних группы и автора поста:
+    # прежние значения запоминает Post.from_db.
+    loaded = instance.loaded_scope
+    author_ids = {instance.author_id, loaded.get("author_id")} - {None}
+    group_ids = {instance.group_id, loaded.get("group_id")} - {None}
+    feeds.bump(feeds.post_scopes(author_ids, group_ids))
+    instance.loaded_scope = {
+        "author_id": instance.author_id,
+        "group_id": instance.group_id,
+    }
@@ -0,0 +1,52 @@
+import hashlib
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+CARD_TEMPLATE = "posts/includes/post_card.html"
+
+
+def card_key(post):
+    # Архивные посты версий не имеют: их не редактируют. Автор и группа
+    # приходят через select_related, поэтому их поля, попадающие в
+    # карточку, добавляются в ключ без лишних запросов.
+    author, group = post.author, post.group
+    shown = "{}:{}:{}".format(
+        author.username if author else "",
+        author.get_full_name() if author else "",
+        group.slug if group else "",
+    )
+    return "post_card:{}:{}:{}:{}".format(
+        post._meta.model_name,
+        post.id,
+        getattr(post, "version", 0),
+        hashlib.md5(shown.encode()).hexdigest(),
+    )
+
+
+@register.simple_tag
+def post_cards(posts):
+    """Пары (пост, HTML карточки) для страницы ленты.
+
+    Все карточки страницы читаются из кэша одним get_many, рендерятся
+    только промахи, и они же одним set_many кладутся обратно.
+    """
+    posts = list(posts)
+    keys = [card_key(post) for post in posts]
+    cached = cache.get_many(keys)
+    missing = {}
+    cards = []
+    for post, key in zip(posts, keys):
+        html = cached.get(key)
+        if html is None:
+            html = render_to_string(CARD_TEMPLATE, {"post": post})
+            missing[key] = html
+        cards.append((post, mark_safe(html)))
+    if missing:
+        cache.set_many(missing, settings.CACHE_TIME_POST_CARD)
+    return cards
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.paginator import Paginator
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.testing import capture_on_commit_callbacks
+from notifications.models import Notification
+from notifications.services import mark_read, notify, unread_count
+
+from ..models import ArchivedComment, ArchivedPost, Comment, Post
+
+User = get_user_model()
+
+
+class ArchivePostsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="Testname")
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(ArchivePostsTests.user)
+        cache.clear()
+        self.old_post = Post.objects.create(text="Old text", author=self.user)
+        Post.objects.filter(id=self.old_post.id).update(
+            pub_date=timezone.now() - timedelta(days=400)
+        )
+        self.comment = Comment.objects.create(
+            post=self.old_post, author=self.user, text="Old comment"
+        )
+        self.new_post = Post.objects.create(text="New text", author=self.user)
+        call_command("archive_posts", older_than=365, stdout=StringIO())
+
+    def test_old_posts_move_to_archive(self):
+        """Старые посты и их комментарии уходят в холодные таблицы."""
+        self.assertEqual(list(Post.objects.all()), [self.new_post])
+        self.assertTrue(ArchivedPost.objects.filter(id=self.old_post.id))
+        self.assertEqual(ArchivedComment.objects.get().id, self.comment.id)
+        self.assertFalse(Comment.objects.exists())
+
+    def test_archive_invalidates_feeds(self):
+        """Архивация пачки сбрасывает ленты, где были её посты."""
+        url = reverse("posts:author_feed", args=["Testname", "rss"])
+        etag = self.client.get(url)["ETag"]
+        Post.objects.filter(id=self.new_post.id).update(
+            pub_date=timezone.now() - timedelta(days=400)
+        )
+        call_command("archive_posts", older_than=365, stdout=StringIO())
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "New text")
+
+    def test_archived_notifications_leave_unread_count(self):
+        """Удалённые с постом уведомления вычитаются из счётчика."""
+        reader = User.objects.create_user(username="Reader")
+        with capture_on_commit_callbacks(execute=True):
+            notify(
+                self.user.id, reader.id, Notification.COMMENT, self.new_post.id
+            )
+        self.assertEqual(unread_count(self.user), 1)
+        Post.objects.filter(id=self.new_post.id).update(
+            pub_date=timezone.now() - timedelta(days=400)
+        )
+        call_command("archive_posts", older_than=365, stdout=StringIO())
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(unread_count(self.user), 0)
+        mark_read(self.user)
+        self.assertEqual(unread_count(self.user), 0)
+
+    def test_index_reads_only_hot_posts(self):
+        """Главная страница показывает только горячие посты."""
+        response = self.client.get(reverse("posts:index"))
+        self.assertEqual(list(response.context["page_obj"]), [self.new_post])
+
+    def test_post_detail_reads_through_archive(self):
+        """Страница архивного поста открывается по прежнему адресу."""
+        response = self.authorized_client.get(
+            reverse("posts:post_detail", kwargs={"post_id": self.old_post.id})
+        )
+        self.assertEqual(response.context["post"].text, "Old text")
+        self.assertEqual(response.context["post_count"], 2)
+        self.assertEqual(
+            response.context["post_comments"][0].text, "Old comment"
+        )
+        self.assertNotContains(
+            response,
+            reverse("posts:post_edit", kwargs={"post_id": self.old_post.id}),
+        )
+
+    def test_profile_pages_continue_into_archive(self):
+        """Профиль листается из горячих постов в архивные."""
+        response = self.client.get(
+            reverse("posts:profile", kwargs={"username": self.user})
+        )
+        self.assertEqual(response.context["post_count"], 2)
+        paginator = Paginator(
+            response.context["page_obj"].paginator.object_list, 1
+        )
+        self.assertEqual(
+            [post.text for post in paginator.page(1)], ["New text"]
+        )
+        self.assertEqual(
+            [post.text for post in paginator.page(2)], ["Old text"]
+        )
@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..events import (
+    INDEX_CHANNEL,
+    InProcessBroker,
+    get_broker,
+    post_channel,
+)
+from ..models import Follow, Post
+
+User = get_user_model()
+
+
+class InProcessBrokerTests(TestCase):
+    def test_wait_returns_only_subscribed_channels(self):
+        """Подписчик получает события только своих каналов."""
+        broker = InProcessBroker(backlog=10)
+        broker.publish("other", "post", "skip")
+        event = broker.publish(INDEX_CHANNEL, "post", "<p>new</p>")
+        events = broker.wait([INDEX_CHANNEL], 0, timeout=0)
+        self.assertEqual(events, [event])
+
+    def test_wait_times_out_without_events(self):
+        """Без новых событий wait возвращает пустой список."""
+        broker = InProcessBroker(backlog=10)
+        broker.publish(INDEX_CHANNEL, "post", "old")
+        self.assertEqual(
+            broker.wait([INDEX_CHANNEL], broker.last_id, timeout=0.01), []
+        )
+
+    def test_backlog_is_bounded(self):
+        """Буфер событий не растёт бесконечно."""
+        broker = InProcessBroker(backlog=2)
+        for number in range(5):
+            broker.publish(INDEX_CHANNEL, "post", str(number))
+        events = broker.wait([INDEX_CHANNEL], 0, timeout=0)
+        self.assertEqual([event.data for event in events], ["3", "4"])
+
+
+@override_settings(SSE_STREAM_TIMEOUT=0.05, SSE_HEARTBEAT=0.01)
+class EventStreamViewTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="Testname")
+        cls.author = User.objects.create_user(username="Author")
+        cls.post = Post.objects.create(text="Test text", author=cls.author)
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(EventStreamViewTests.user)
+
+    def read_stream(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_stream_replays_missed_events(self):
+        """Клиент с Last-Event-ID получает пропущенные события."""
+        broker = get_broker()
+        last_id = broker.last_id
+        broker.publish(
+            post_channel(self.post.id), "comment", "<p>first</p>\n<p>2</p>"
+        )
+        response = self.client.get(
+            reverse("posts:post_events", kwargs={"post_id": self.post.id}),
+            HTTP_LAST_EVENT_ID=str(last_id),
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        body = self.read_stream(response)
+        self.assertIn(
+            "event: comment\ndata: <p>first</p>\ndata: <p>2</p>", body
+        )
+
+    def test_stream_sends_heartbeat(self):
+        """Без событий поток шлёт комментарии-пинги."""
+        response = self.client.get(reverse("posts:index_events"))
+        self.assertIn(": ping", self.read_stream(response))
+
+    def test_follow_stream_listens_to_followed_authors(self):
+        """Лента подписок получает посты авторов, на которых подписан."""
+        Follow.objects.create(user=self.user, author=self.author)
+        broker = get_broker()
+        last_id = broker.last_id
+        broker.publish(f"author:{self.author.id}", "post", "followed")
+        broker.publish(f"author:{self.user.id}", "post", "not followed")
+        response = self.authorized_client.get(
+            reverse("posts:follow_events"), HTTP_LAST_EVENT_ID=str(last_id)
+        )
+        body = self.read_stream(response)
+        self.assertIn("data: followed", body)
+        self.assertNotIn("not followed", body)
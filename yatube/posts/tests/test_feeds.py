@@ -0,0 +1,151 @@
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class FeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            username="Author", first_name="Лев", last_name="Толстой"
+        )
+        cls.group = Group.objects.create(
+            title="Test title", slug="test-slug", description="Text"
+        )
+        cls.post = Post.objects.create(
+            text="Grouped post", author=cls.author, group=cls.group
+        )
+        Post.objects.create(text="Plain post", author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feeds_render_values(self):
+        """Ленты всех областей отдаются в RSS и Atom."""
+        cases = (
+            (reverse("posts:index_feed", args=["rss"]), "Plain post"),
+            (
+                reverse("posts:group_feed", args=[self.group.slug, "atom"]),
+                "Grouped post",
+            ),
+            (
+                reverse("posts:author_feed", args=["Author", "rss"]),
+                "Лев Толстой",
+            ),
+        )
+        for url, text in cases:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, text)
+                self.assertTrue(response.has_header("ETag"))
+                self.assertTrue(response.has_header("Last-Modified"))
+        group_feed = self.client.get(cases[1][0])
+        self.assertNotContains(group_feed, "Plain post")
+        self.assertTrue(
+            group_feed["Content-Type"].startswith("application/atom+xml")
+        )
+
+    def test_conditional_get_skips_database(self):
+        """Условный запрос с актуальным ETag — 304 без запросов к БД."""
+        url = reverse("posts:index_feed", args=["atom"])
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+        self.assertEqual(cached["ETag"], etag)
+
+    def test_post_write_invalidates_scopes(self):
+        """Запись поста сбрасывает общую ленту, ленту группы и автора."""
+        urls = [
+            reverse("posts:index_feed", args=["rss"]),
+            reverse("posts:group_feed", args=[self.group.slug, "rss"]),
+            reverse("posts:author_feed", args=["Author", "rss"]),
+        ]
+        other = reverse("posts:group_feed", args=["other", "rss"])
+        Group.objects.create(title="Other", slug="other", description="")
+        etags = {url: self.client.get(url)["ETag"] for url in urls + [other]}
+        self.post.text = "Edited post"
+        self.post.save()
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+                self.assertContains(response, "Edited post")
+        self.assertEqual(
+            self.client.get(
+                other, HTTP_IF_NONE_MATCH=etags[other]
+            ).status_code,
+            304,
+        )
+
+    def test_group_change_invalidates_old_group(self):
+        """Перенос поста в другую группу сбрасывает ленту прежней."""
+        url = reverse("posts:group_feed", args=[self.group.slug, "rss"])
+        etag = self.client.get(url)["ETag"]
+        other = Group.objects.create(
+            title="Other", slug="other", description=""
+        )
+        post = Post.objects.get(pk=self.post.pk)
+        post.group = other
+        post.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "Grouped post")
+
+    def test_bulk_delete_does_not_query_per_post(self):
+        """Удаление постов пачкой не тратит запросы на каждый пост."""
+        counts = []
+        for size in (2, 20):
+            Post.objects.bulk_create(
+                Post(text="Bulk", author=self.author) for _ in range(size)
+            )
+            with CaptureQueriesContext(connection) as queries:
+                Post.objects.filter(text="Bulk").delete()
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_save_does_not_reread_post(self):
+        """Сохранение загруженного поста не перечитывает его из БД."""
+        post = Post.objects.get(pk=self.post.pk)
+        # UPDATE и имена автора и группы для областей лент.
+        with self.assertNumQueries(3):
+            post.save()
+
+    def test_version_expires_with_feed_cache(self):
+        """Без сигнала лента обновляется с новым ETag по истечении срока."""
+        url = reverse("posts:index_feed", args=["rss"])
+        etag = self.client.get(url)["ETag"]
+        Post.objects.filter(pk=self.post.pk).update(text="Silent edit")
+        later = time.time() + settings.FEEDS_CACHE_TIME + 1
+        with mock.patch("time.time", return_value=later):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, "Silent edit")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_unknown_format_and_scope(self):
+        """Неизвестный формат или группа — 404."""
+        self.assertEqual(
+            self.client.get(
+                reverse("posts:index_feed", args=["json"])
+            ).status_code,
+            404,
+        )
+        self.assertEqual(
+            self.client.get(
+                reverse("posts:group_feed", args=["missing", "rss"])
+            ).status_code,
+            404,
+        )
@@ -0,0 +1,93 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import TestCase
+
+from core.loadtest import LoadTest, percentile
+
+from ..models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class SeedDataTests(TestCase):
+    def seed(self, **options):
+        call_command(
+            "seed_data",
+            users=30,
+            groups=3,
+            posts=300,
+            comments=200,
+            follows=100,
+            stdout=StringIO(),
+            **options,
+        )
+
+    def test_seed_creates_requested_volume(self):
+        """seed_data создаёт объекты в заданном количестве."""
+        self.seed()
+        self.assertEqual(User.objects.count(), 30)
+        self.assertEqual(Group.objects.count(), 3)
+        self.assertEqual(Post.objects.count(), 300)
+        self.assertEqual(Comment.objects.count(), 200)
+        self.assertFalse(
+            Follow.objects.values("user", "author")
+            .annotate(number=Count("id"))
+            .filter(number__gt=1)
+            .exists()
+        )
+
+    def test_authors_are_skewed(self):
+        """У самого активного автора заметно больше среднего постов."""
+        self.seed()
+        counts = sorted(
+            User.objects.annotate(number=Count("posts")).values_list(
+                "number", flat=True
+            ),
+            reverse=True,
+        )
+        self.assertGreater(counts[0], 3 * 300 / 30)
+
+    def test_repeated_seed_reuses_users(self):
+        """Повторный запуск с тем же --seed не дублирует пользователей."""
+        self.seed()
+        self.seed()
+        self.assertEqual(User.objects.count(), 30)
+
+
+class LoadTestTests(TestCase):
+    def test_percentile(self):
+        """Перцентиль считается по ближайшему рангу."""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_run_reports_every_view(self):
+        """Прогон обходит все страницы без ошибок."""
+        call_command(
+            "seed_data",
+            users=10,
+            groups=2,
+            posts=50,
+            comments=20,
+            follows=30,
+            stdout=StringIO(),
+        )
+        _, results = LoadTest(200, 1, login_share=1).run()
+        self.assertEqual(
+            set(results),
+            {
+                "posts:index",
+                "posts:post_detail",
+                "posts:profile",
+                "posts:group_list",
+                "posts:follow_index",
+            },
+        )
+        self.assertFalse(any(result["errors"] for result in results.values()))
+        self.assertEqual(
+            sum(result["count"] for result in results.values()), 200
+        )
@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.template_profiler import profile_templates
+
+from ..models import Group, Post
+from ..templatetags.post_cards import CARD_TEMPLATE, card_key
+
+User = get_user_model()
+
+
+class PostCardCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username="Author")
+        cls.group = Group.objects.create(
+            title="Group", slug="group", description="Description"
+        )
+        cls.posts = [
+            Post.objects.create(
+                text=f"Text {number}", author=cls.author, group=cls.group
+            )
+            for number in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.author_client = Client()
+        self.author_client.force_login(PostCardCacheTests.author)
+        self.url = reverse("posts:group_list", args=[self.group.slug])
+
+    def card_renders(self):
+        with profile_templates() as profile:
+            self.client.get(self.url)
+        return profile.calls[CARD_TEMPLATE]
+
+    def test_cards_are_rendered_once(self):
+        """Повторный показ ленты берёт карточки из кэша."""
+        self.assertEqual(self.card_renders(), 3)
+        self.assertEqual(self.card_renders(), 0)
+        self.assertIsNotNone(cache.get(card_key(self.posts[0])))
+
+    def test_edit_invalidates_card(self):
+        """Правка через post_edit обновляет карточку в ленте."""
+        post = self.posts[0]
+        self.client.get(self.url)
+        self.author_client.post(
+            reverse("posts:post_edit", args=[post.id]),
+            data={"text": "Edited text", "group": self.group.id},
+        )
+        post.refresh_from_db()
+        self.assertEqual(post.version, 2)
+        self.assertEqual(self.card_renders(), 1)
+        response = self.client.get(self.url)
+        self.assertContains(response, "Edited text")
+        self.assertNotContains(response, "Text 0")
+
+    def test_concurrent_saves_get_distinct_versions(self):
+        """Две копии одного поста при сохранении не теряют версию."""
+        first = Post.objects.get(id=self.posts[0].id)
+        second = Post.objects.get(id=self.posts[0].id)
+        first.save()
+        self.assertEqual(first.version, 2)
+        second.save()
+        self.assertEqual(second.version, 3)
+
+    def test_author_rename_invalidates_card(self):
+        """Смена имени автора видна в ленте сразу."""
+        self.client.get(self.url)
+        User.objects.filter(id=self.author.id).update(
+            username="Renamed", first_name="New"
+        )
+        self.assertEqual(self.card_renders(), 3)
+        self.assertContains(self.client.get(self.url), "Renamed")
+
+    def test_group_delete_invalidates_card(self):
+        """Удаление группы убирает ссылку на неё из карточки."""
+        group = Group.objects.create(
+            title="Other", slug="other", description="Description"
+        )
+        Post.objects.create(text="Other text", author=self.author, group=group)
+        url = reverse("posts:profile", args=[self.author.username])
+        self.assertContains(self.client.get(url), "/group/other/")
+        group.delete()
+        self.assertNotContains(self.client.get(url), "/group/other/")
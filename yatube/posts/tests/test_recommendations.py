@@ -0,0 +1,82 @@
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Follow, FollowSuggestion
+from ..recommendations import (
+    build_adjacency,
+    rebuild_suggestions,
+    top_suggestions,
+)
+from ..utils import follow_suggestions
+
+User = get_user_model()
+
+
+class TopSuggestionsTests(TestCase):
+    def suggest(self, edges, weights=(1.0, 0.0)):
+        followers, authors = np.array(edges).T
+        adjacency, ids = build_adjacency(followers, authors)
+        return {
+            int(ids[user]): [int(ids[pk]) for pk in candidates]
+            for user, candidates, _ in top_suggestions(
+                adjacency,
+                top_k=5,
+                block_size=2,
+                weights=weights,
+                max_degree=100,
+                neighbours=10,
+            )
+        }
+
+    def test_friends_of_friends(self):
+        """Рекомендуются авторы, на которых подписаны мои авторы."""
+        suggestions = self.suggest([(1, 2), (2, 3), (2, 4), (1, 4)])
+        self.assertEqual(suggestions[1], [3])
+
+    def test_co_follow(self):
+        """Рекомендуются авторы, которых читают вместе с моими."""
+        suggestions = self.suggest(
+            [(1, 10), (2, 10), (2, 20), (3, 10), (3, 20)], weights=(0, 1)
+        )
+        self.assertEqual(suggestions[1], [20])
+        self.assertNotIn(10, suggestions[1])
+
+
+class FollowSuggestionViewTests(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f"user{number}")
+            for number in range(3)
+        ]
+        first, second, third = self.users
+        Follow.objects.create(user=first, author=second)
+        Follow.objects.create(user=second, author=third)
+        self.client = Client()
+        self.client.force_login(first)
+
+    def test_rebuild_and_show_suggestions(self):
+        """Рекомендации сохраняются и показываются в ленте подписок."""
+        self.assertEqual(rebuild_suggestions(), 1)
+        suggestion = FollowSuggestion.objects.get()
+        self.assertEqual(
+            (suggestion.user, suggestion.author),
+            (self.users[0], self.users[2]),
+        )
+        response = self.client.get(reverse("posts:follow_index"))
+        self.assertEqual(list(response.context["suggestions"]), [suggestion])
+        self.assertContains(
+            response,
+            reverse("posts:profile", kwargs={"username": "user2"}),
+        )
+
+    def test_stale_suggestions_are_hidden(self):
+        """Новые подписки и отключённые авторы не показываются."""
+        rebuild_suggestions()
+        first, _, third = self.users
+        Follow.objects.create(user=first, author=third)
+        self.assertEqual(list(follow_suggestions(first)), [])
+        Follow.objects.filter(user=first, author=third).delete()
+        User.objects.filter(id=third.id).update(is_active=False)
+        self.assertEqual(list(follow_suggestions(first)), [])
@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..models import (
+    ArchivedComment,
+    ArchivedPost,
+    Comment,
+    Follow,
+    Group,
+    Post,
+)
+
+User = get_user_model()
+SOURCE_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+TARGET_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+class DataTransferTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(SOURCE_MEDIA_ROOT, ignore_errors=True)
+        shutil.rmtree(TARGET_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="Author")
+        self.reader = User.objects.create_user(username="Reader")
+        self.group = Group.objects.create(title="Test title", slug="slug")
+        with override_settings(MEDIA_ROOT=SOURCE_MEDIA_ROOT):
+            self.post = Post.objects.create(
+                text="Test text",
+                author=self.author,
+                group=self.group,
+                image=SimpleUploadedFile("small.gif", b"GIF89a"),
+            )
+        self.pub_date = timezone.now() - timedelta(days=30)
+        Post.objects.filter(id=self.post.id).update(pub_date=self.pub_date)
+        Comment.objects.create(
+            post=self.post, author=self.reader, text="comment"
+        )
+        Follow.objects.create(user=self.reader, author=self.author)
+
+    def export(self, batch_size=1):
+        path = os.path.join(TARGET_MEDIA_ROOT, "dump.ndjson")
+        call_command("export_data", output=path, chunk_size=batch_size)
+        return path
+
+    def test_export_writes_one_record_per_line(self):
+        """Каждая строка выгрузки — отдельная запись."""
+        with open(self.export(), encoding="utf-8") as stream:
+            models = [line.split('"model": "')[1][:4] for line in stream]
+        self.assertEqual(
+            models, ["user", "user", "grou", "post", "comm", "foll"]
+        )
+
+    @override_settings(MEDIA_ROOT=TARGET_MEDIA_ROOT)
+    def test_import_restores_relations_and_dates(self):
+        """Импорт восстанавливает связи, даты и картинки."""
+        path = self.export()
+        User.objects.all().delete()
+        Group.objects.all().delete()
+        call_command(
+            "import_data",
+            path,
+            batch_size=1,
+            media_from=SOURCE_MEDIA_ROOT,
+            stdout=StringIO(),
+        )
+        post = Post.objects.select_related("author", "group").get()
+        self.assertEqual(post.author.username, "Author")
+        self.assertEqual(post.group.slug, "slug")
+        self.assertEqual(post.pub_date, self.pub_date)
+        self.assertTrue(
+            os.path.exists(os.path.join(TARGET_MEDIA_ROOT, post.image.name))
+        )
+        comment = Comment.objects.select_related("author").get()
+        self.assertEqual(comment.post_id, post.id)
+        self.assertEqual(comment.author.username, "Reader")
+        self.assertTrue(
+            Follow.objects.filter(
+                user__username="Reader", author__username="Author"
+            ).exists()
+        )
+
+    def test_import_into_populated_database_keeps_existing_rows(self):
+        """Повторный импорт не дублирует пользователей, группы, подписки."""
+        path = self.export()
+        call_command("import_data", path, stdout=StringIO())
+        self.assertEqual(User.objects.count(), 2)
+        self.assertEqual(Group.objects.count(), 1)
+        self.assertEqual(Follow.objects.count(), 1)
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertEqual(
+            Comment.objects.filter(post__id__gt=self.post.id).count(), 1
+        )
+
+    def test_archive_is_exported_and_imported(self):
+        """Архивные посты и комментарии переносятся вместе с горячими."""
+        call_command("archive_posts", older_than=7, stdout=StringIO())
+        path = self.export()
+        call_command("import_data", path, stdout=StringIO())
+        self.assertEqual(ArchivedPost.objects.count(), 2)
+        imported = ArchivedPost.objects.exclude(id=self.post.id).get()
+        self.assertEqual(imported.pub_date, self.pub_date)
+        self.assertEqual(
+            ArchivedComment.objects.get(post=imported).author.username,
+            "Reader",
+        )
+        self.assertFalse(Post.objects.exists())
@@ -0,0 +1,83 @@
+import math
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from .. import trending
+from ..models import Comment, Follow, Group, GroupScore, Post, PostScore
+
+User = get_user_model()
+
+
+class TrendingScoreTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="Testname")
+        cls.group = Group.objects.create(title="Test title", slug="slug")
+
+    def setUp(self):
+        cache.clear()
+        self.quiet = Post.objects.create(text="Quiet", author=self.user)
+        self.hot = Post.objects.create(
+            text="Hot", author=self.user, group=self.group
+        )
+
+    def test_scores_add_up_incrementally(self):
+        """Каждое событие прибавляется к оценке без пересчёта."""
+        now = time.time()
+        trending.record(trending.COMMENT, self.hot.id, timestamp=now)
+        trending.record(trending.COMMENT, self.hot.id, timestamp=now)
+        expected = trending.event_score(2 * 3.0, timestamp=now)
+        self.assertAlmostEqual(
+            PostScore.objects.get(pk=self.hot.id).score, expected
+        )
+
+    def test_failed_insert_is_not_retried_forever(self):
+        """Если вставка оценки всё время падает, событие отбрасывается."""
+        with mock.patch.object(
+            PostScore.objects, "create", side_effect=IntegrityError
+        ) as create:
+            trending.record(trending.VIEW, 10 ** 6)
+        self.assertEqual(create.call_count, 1)
+        self.assertFalse(PostScore.objects.filter(pk=10 ** 6).exists())
+
+    def test_old_events_decay(self):
+        """Событие суточной давности весит вдвое меньше свежего."""
+        now = time.time()
+        with override_settings(TRENDING_HALF_LIFE_HOURS=24):
+            old = trending.event_score(1, timestamp=now - 24 * 3600)
+            new = trending.event_score(1, timestamp=now)
+        self.assertAlmostEqual(new - old, math.log(2))
+
+    def test_comments_and_follows_raise_scores(self):
+        """Комментарии и подписки поднимают пост и его группу."""
+        reader = User.objects.create_user(username="Reader")
+        Comment.objects.create(post=self.hot, author=reader, text="wow")
+        Follow.objects.create(user=reader, author=self.user)
+        self.assertTrue(PostScore.objects.filter(pk=self.hot.id).exists())
+        self.assertTrue(GroupScore.objects.filter(pk=self.group.id).exists())
+        self.assertFalse(PostScore.objects.filter(pk=self.quiet.id).exists())
+
+    @override_settings(TRENDING_VIEW_FLUSH_SECONDS=0)
+    def test_views_are_counted(self):
+        """Просмотры поста учитываются в оценке."""
+        Client().get(
+            reverse("posts:post_detail", kwargs={"post_id": self.quiet.id})
+        )
+        self.assertTrue(PostScore.objects.filter(pk=self.quiet.id).exists())
+
+    def test_trending_feed_is_ordered_by_score(self):
+        """Лента популярного отсортирована по оценке."""
+        trending.record(trending.VIEW, self.quiet.id)
+        trending.record(trending.COMMENT, self.hot.id, self.group.id)
+        response = Client().get(reverse("posts:trending"))
+        self.assertEqual(
+            list(response.context["page_obj"]), [self.hot, self.quiet]
+        )
+        self.assertEqual(response.context["groups"], [self.group])
@@ -0,0 +1,115 @@
+"""Популярное: оценки с экспоненциальным затуханием.
+
+Оценка объекта — сумма весов событий, каждый из которых затухает вдвое
+за TRENDING_HALF_LIFE_HOURS. Вместо того чтобы пересчитывать затухание
+всех оценок, храним log(сумма w * 2 ** ((t - EPOCH) / half_life)):
+затухание на момент запроса одинаково для всех объектов и не меняет
+порядок, поэтому сортировать можно прямо по сохранённому значению,
+а новое событие меняет одну строку.
+"""
+import math
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+
+from .models import GroupScore, Post, PostScore
+
+EPOCH = 1_600_000_000
+
+COMMENT = "comment"
+FOLLOW = "follow"
+VIEW = "view"
+
+
+def event_score(weight, timestamp=None):
+    timestamp = time.time() if timestamp is None else timestamp
+    half_life = settings.TRENDING_HALF_LIFE_HOURS * 3600
+    return math.log(weight) + (timestamp - EPOCH) / half_life * math.log(2)
+
+
+def _update(model, key, value):
+    return model.objects.filter(pk=key).update(
+        score=Greatest(F("score"), value)
+        + Ln(1 + Exp(-Abs(F("score") - value)))
+    )
+
+
+def _add(model, key, value):
+    """Прибавляет событие к оценке одним UPDATE: log(e^score + e^value).
+
+    Если строки нет, создаёт её. IntegrityError значит, что строку
+    успел создать параллельный запрос, и UPDATE повторяется один раз.
+    Если и он ничего не нашёл, создание сорвалось по внешнему ключу
+    (пост или группа уже удалены), и событие отбрасывается.
+    """
+    value = Value(value)
+    if _update(model, key, value):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(pk=key, score=value.value)
+    except IntegrityError:
+        _update(model, key, value)
+
+
+def record(event, post_id, group_id=None, count=1, timestamp=None):
+    """Учитывает count событий одного вида для поста и его группы."""
+    value = event_score(
+        settings.TRENDING_WEIGHTS[event] * count, timestamp=timestamp
+    )
+    _add(PostScore, post_id, value)
+    if group_id:
+        _add(GroupScore, group_id, value)
+
+
+def record_author_followed(author_id):
+    """Подписка на автора поднимает его последний пост."""
+    post = (
+        Post.objects.filter(author_id=author_id)
+        .values("id", "group_id")
+        .first()
+    )
+    if post is not None:
+        record(FOLLOW, post["id"], post["group_id"])
+
+
+class ViewCounter:
+    """Копит просмотры в памяти и сбрасывает их в базу пачкой.
+
+    Запись на каждый просмотр превратила бы чтение поста в запись;
+    здесь одна запись на пост раз в TRENDING_VIEW_FLUSH_SECONDS.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = Counter()
+        self._flushed_at = time.monotonic()
+
+    def add(self, post_id):
+        with self._lock:
+            self._views[post_id] += 1
+            due = (
+                time.monotonic() - self._flushed_at
+                >= settings.TRENDING_VIEW_FLUSH_SECONDS
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            views, self._views = self._views, Counter()
+            self._flushed_at = time.monotonic()
+        if not views:
+            return
+        # Пост мог быть удалён или уйти в архив, пока копились просмотры.
+        posts = Post.objects.filter(pk__in=views).values_list("id", "group_id")
+        for post_id, group_id in posts:
+            record(VIEW, post_id, group_id, count=views[post_id])
+
+
+views = ViewCounter()
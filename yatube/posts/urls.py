@@ -1,20 +1,40 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 app_name = "posts"
 
 urlpatterns = [
     path("", views.index, name="index"),
+    path("events/", views.index_events, name="index_events"),
+    path("trending/", views.trending_posts, name="trending"),
+    path("feed/<str:kind>/", feeds.index_feed, name="index_feed"),
+    path(
+        "group/<slug:slug>/feed/<str:kind>/",
+        feeds.group_feed,
+        name="group_feed",
+    ),
+    path(
+        "profile/<str:username>/feed/<str:kind>/",
+        feeds.author_feed,
+        name="author_feed",
+    ),
     path("group/<slug:slug>/", views.group_posts, name="group_list"),
+    path(
+        "group/<slug:slug>/events/", views.group_events, name="group_events"
+    ),
     path("profile/<str:username>/", views.profile, name="profile"),
     path("posts/<int:post_id>/", views.post_detail, name="post_detail"),
+    path(
+        "posts/<int:post_id>/events/", views.post_events, name="post_events"
+    ),
     path("create/", views.post_create, name="post_create"),
     path("posts/<int:post_id>/edit/", views.post_edit, name="post_edit"),
     path(
         "posts/<int:post_id>/comment/", views.add_comment, name="add_comment"
     ),
     path("follow/", views.follow_index, name="follow_index"),
+    path("follow/events/", views.follow_events, name="follow_events"),
     path(
         "profile/<str:username>/follow/",
         views.profile_follow,
@@ -1,9 +1,62 @@
 from django.conf import settings
 from django.core.paginator import Paginator
 
+from .models import FollowSuggestion
+
 
 def paginator_func(page_name, request, numbers=settings.POST_QUANTITY):
     paginator = Paginator(page_name, numbers)
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
     return page_obj
+
+
+class ChainedQuerySets:
+    """Последовательность из нескольких querysets для Paginator.
+
+    Отдаёт записи первого queryset, затем второго и т. д.; при срезе
+    запрашивает из каждого только попавший в страницу кусок.
+    """
+
+    def __init__(self, *querysets):
+        self.querysets = querysets
+        self._counts = None
+
+    def counts(self):
+        if self._counts is None:
+            self._counts = [queryset.count() for queryset in self.querysets]
+        return self._counts
+
+    def count(self):
+        return sum(self.counts())
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop, _ = index.indices(self.count())
+        items = []
+        for queryset, size in zip(self.querysets, self.counts()):
+            if start < size and stop > 0:
+                items.extend(queryset[max(start, 0):min(stop, size)])
+            start -= size
+            stop -= size
+        return items
+
+
+def follow_suggestions(user):
+    """Готовые рекомендации «кого почитать» из FollowSuggestion.
+
+    Таблица пересчитывается пакетно, поэтому авторы, на которых
+    пользователь подписался после пересчёта, и отключённые аккаунты
+    отсеиваются при чтении.
+    """
+    if not user.is_authenticated:
+        return []
+    return (
+        FollowSuggestion.objects.filter(user=user, author__is_active=True)
+        .exclude(author__following__user=user)
+        .select_related("author")[: settings.RECOMMENDATIONS_SHOWN]
+    )
@@ -1,28 +1,66 @@
+import time
+
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
+from django.http import StreamingHttpResponse
+from django.db.models import Count, Max
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.cache import cache_page
 
+from core.holes import cached_page, hole_punched_page
+from core.queries import query_budget
+from core.routers import replica_reads
+
+from . import trending
+from .events import (
+    INDEX_CHANNEL,
+    author_channel,
+    get_broker,
+    group_channel,
+    post_channel,
+)
 from .forms import CommentForm, PostForm
-from .models import Comment, Follow, Group, Post
-from .utils import paginator_func
+from .models import ArchivedPost, Follow, Group, GroupScore, Post
+from .utils import ChainedQuerySets, follow_suggestions, paginator_func
 
 
-@cache_page(settings.CACHE_TIME_INDEX, key_prefix="index_page")
+@replica_reads
+@query_budget(8)
+@hole_punched_page(settings.CACHE_TIME_INDEX, key_prefix="index_page")
 def index(request):
     template_name = "posts/index.html"
-    post_list = Post.objects.all()
+    post_list = Post.objects.select_related("author", "group")
     context = {
         "page_obj": paginator_func(post_list, request),
     }
     return render(request, template_name, context)
 
 
+@replica_reads
+@query_budget(8)
+@cache_page(settings.CACHE_TIME_TRENDING, key_prefix="trending_page")
+def trending_posts(request):
+    template_name = "posts/trending.html"
+    post_list = Post.objects.filter(trend__isnull=False).order_by(
+        "-trend__score"
+    )
+    groups = GroupScore.objects.select_related("group").order_by("-score")
+    context = {
+        "page_obj": paginator_func(
+            post_list.select_related("author", "group"), request
+        ),
+        "groups": [score.group for score in groups[:10]],
+    }
+    return render(request, template_name, context)
+
+
+@replica_reads
+@query_budget(8)
 def group_posts(request, slug):
     template_name = "posts/group_list.html"
     group = get_object_or_404(Group, slug=slug)
-    post_list = group.posts.all()
+    post_list = group.posts.select_related("author", "group")
     context = {
         "group": group,
         "page_obj": paginator_func(post_list, request),
@@ -30,10 +68,15 @@ def group_posts(request, slug):
     return render(request, template_name, context)
 
 
+@replica_reads
+@query_budget(12)
 def profile(request, username):
     template_name = "posts/profile.html"
     author = get_object_or_404(User, username=username)
-    post_list = author.posts.all()
+    post_list = ChainedQuerySets(
+        author.posts.select_related("author", "group"),
+        author.archived_posts.select_related("author", "group"),
+    )
     post_count = post_list.count()
     following = (
         request.user.is_authenticated
@@ -44,23 +87,48 @@ def profile(request, username):
         "post_count": post_count,
         "page_obj": paginator_func(post_list, request),
         "following": following,
+        "suggestions": follow_suggestions(request.user),
     }
     return render(request, template_name, context)
 
 
+@replica_reads
+@query_budget(12)
 def post_detail(request, post_id):
     template_name = "posts/post_detail.html"
-    post = get_object_or_404(Post, id=post_id)
-    post_count = Post.objects.filter(author=post.author).count()
-    post_comments = Comment.objects.filter(post_id=post)
-    form = CommentForm(request.POST or None)
-    context = {
-        "post": post,
-        "post_count": post_count,
-        "post_comments": post_comments,
-        "form": form,
-    }
-    return render(request, template_name, context)
+    post = Post.objects.select_related("author", "group").filter(
+        id=post_id
+    ).first() or get_object_or_404(
+        ArchivedPost.objects.select_related("author", "group"), id=post_id
+    )
+    if not post.is_archived:
+        trending.views.add(post.id)
+    comments = post.comments.aggregate(last=Max("id"), count=Count("id"))
+    key = "post_detail:{}:{}:{}:{}:{}:{}".format(
+        post._meta.model_name,
+        post.id,
+        getattr(post, "version", 0),
+        post.pub_date.timestamp(),
+        comments["last"],
+        comments["count"],
+    )
+
+    def render_page():
+        post_count = (
+            Post.objects.filter(author_id=post.author_id).count()
+            + ArchivedPost.objects.filter(author_id=post.author_id).count()
+        )
+        context = {
+            "post": post,
+            "post_count": post_count,
+            "post_comments": post.comments.select_related("author"),
+            "form": CommentForm(),
+        }
+        return render(request, template_name, context)
+
+    return cached_page(
+        request, key, settings.CACHE_TIME_POST_DETAIL, render_page
+    )
 
 
 @login_required
@@ -105,6 +173,8 @@ def add_comment(request, post_id):
     return redirect("posts:post_detail", post_id=post_id)
 
 
+@replica_reads
+@query_budget(10)
 @login_required
 def follow_index(request):
     template_name = "posts/follow.html"
@@ -112,11 +182,14 @@ def follow_index(request):
         "author"
     )
     posts = [author_id.author for author_id in following]
-    posts_list = Post.objects.all().filter(author__in=posts)
+    posts_list = Post.objects.select_related("author", "group").filter(
+        author__in=posts
+    )
     counter = posts_list.count()
     context = {
         "page_obj": paginator_func(posts_list, request),
         "counter": counter,
+        "suggestions": follow_suggestions(request.user),
     }
     return render(request, template_name, context)
 
@@ -135,3 +208,67 @@ def profile_unfollow(request, username):
     if Follow.objects.filter(author=author, user=request.user):
         Follow.objects.filter(author=author, user=request.user).delete()
     return redirect("posts:profile", username=username)
+
+
+def _format_event(event):
+    lines = [f"id: {event.id}", f"event: {event.name}"]
+    lines.extend(f"data: {line}" for line in event.data.splitlines())
+    return "\n".join(lines) + "\n\n"
+
+
+def _event_stream(request, channels):
+    """Отдаёт события каналов в формате Server-Sent Events.
+
+    Поток живёт SSE_STREAM_TIMEOUT секунд, после чего браузер
+    переподключается сам и передаёт Last-Event-ID.
+    """
+    broker = get_broker()
+    last_id = request.META.get("HTTP_LAST_EVENT_ID")
+    last_id = int(last_id) if last_id and last_id.isdigit() else None
+    if last_id is None:
+        last_id = broker.last_id
+
+    def stream(last_id):
+        yield f"retry: {settings.SSE_RETRY_MS}\n\n"
+        deadline = time.monotonic() + settings.SSE_STREAM_TIMEOUT
+        while True:
+            timeout = min(
+                settings.SSE_HEARTBEAT, deadline - time.monotonic()
+            )
+            if timeout <= 0:
+                return
+            events = broker.wait(channels, last_id, timeout)
+            for event in events:
+                last_id = event.id
+                yield _format_event(event)
+            if not events:
+                yield ": ping\n\n"
+
+    response = StreamingHttpResponse(
+        stream(last_id), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def index_events(request):
+    return _event_stream(request, [INDEX_CHANNEL])
+
+
+def group_events(request, slug):
+    group = get_object_or_404(Group, slug=slug)
+    return _event_stream(request, [group_channel(group.id)])
+
+
+@login_required
+def follow_events(request):
+    authors = Follow.objects.filter(user=request.user).values_list(
+        "author_id", flat=True
+    )
+    return _event_stream(request, [author_channel(pk) for pk in authors])
+
+
+def post_events(request, post_id):
+    post = get_object_or_404(Post, id=post_id)
+    return _event_stream(request, [post_channel(post.id)])
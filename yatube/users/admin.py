@@ -0,0 +1,18 @@
+from django.contrib import admin
+
+from .models import AccountDeletion
+
+
+@admin.register(AccountDeletion)
+class AccountDeletionAdmin(admin.ModelAdmin):
+    list_display = (
+        "username",
+        "user_id",
+        "status",
+        "step",
+        "deleted_objects",
+        "created",
+        "finished",
+    )
+    list_filter = ("status",)
+    readonly_fields = list_display
@@ -0,0 +1,122 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from notifications.models import Notification, NotificationState
+from notifications.services import discard
+from posts import feeds
+from posts.models import (
+    ArchivedComment,
+    ArchivedPost,
+    Comment,
+    Follow,
+    FollowSuggestion,
+    Post,
+)
+
+from .models import AccountDeletion
+
+User = get_user_model()
+
+
+def _steps(user_id):
+    """Зависимые данные пользователя в порядке безопасного удаления.
+
+    Сначала удаляются строки, ссылающиеся на посты пользователя, чтобы
+    каскад при удалении самих постов не поднимал их в память.
+    """
+    return (
+        (
+            "notifications",
+            Notification.objects.filter(
+                Q(recipient_id=user_id)
+                | Q(actor_id=user_id)
+                | Q(post__author_id=user_id)
+            ),
+        ),
+        (
+            "follows",
+            Follow.objects.filter(Q(user_id=user_id) | Q(author_id=user_id)),
+        ),
+        (
+            "follow_suggestions",
+            FollowSuggestion.objects.filter(
+                Q(user_id=user_id) | Q(author_id=user_id)
+            ),
+        ),
+        (
+            "comments",
+            Comment.objects.filter(
+                Q(author_id=user_id) | Q(post__author_id=user_id)
+            ),
+        ),
+        ("posts", Post.objects.filter(author_id=user_id)),
+        (
+            "archived_comments",
+            ArchivedComment.objects.filter(
+                Q(author_id=user_id) | Q(post__author_id=user_id)
+            ),
+        ),
+        ("archived_posts", ArchivedPost.objects.filter(author_id=user_id)),
+    )
+
+
+@transaction.atomic
+def schedule_deletion(user):
+    """Сразу отключает аккаунт и ставит удаление данных в очередь.
+
+    Пользователь больше не может войти, его текущие сессии перестают
+    действовать, а имя освобождается для новой регистрации.
+    """
+    AccountDeletion.objects.create(user_id=user.id, username=user.username)
+    user.username = f"deleted-{user.id}"
+    user.email = ""
+    user.is_active = False
+    user.set_unusable_password()
+    user.save()
+    NotificationState.objects.filter(user_id=user.id).delete()
+
+
+def process_deletion(job, batch_size, max_batches=None):
+    """Удаляет данные задания порциями по batch_size строк.
+
+    Каждая порция — отдельная транзакция, прогресс сохраняется в job,
+    поэтому прерванное удаление продолжается с места остановки.
+    Возвращает True, когда аккаунт удалён полностью.
+    """
+    batches = 0
+    for step, queryset in _steps(job.user_id):
+        while True:
+            if max_batches is not None and batches >= max_batches:
+                return False
+            ids = list(queryset.values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                batch = queryset.model.objects.filter(pk__in=ids)
+                if queryset.model is Notification:
+                    # Чужие непрочитанные уведомления вычитаются из
+                    # счётчиков их получателей.
+                    discard(batch)
+                elif queryset.model is Post:
+                    # Ленты сбрасываются одним bump на пачку, в том числе
+                    # лента под прежним именем пользователя.
+                    scopes = feeds.scopes_for_posts(batch)
+                    batch.delete()
+                    feeds.bump(
+                        [*scopes, feeds.author_scope(job.username)]
+                    )
+                else:
+                    batch.delete()
+                job.step = step
+                job.deleted_objects += len(ids)
+                job.save(update_fields=["step", "deleted_objects"])
+            batches += 1
+    with transaction.atomic():
+        User.objects.filter(id=job.user_id).delete()
+        job.status = AccountDeletion.DONE
+        job.step = ""
+        job.finished = timezone.now()
+        job.save(update_fields=["status", "step", "finished"])
+    return True
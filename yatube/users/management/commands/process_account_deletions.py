@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.deletion import process_deletion
+from users.models import AccountDeletion
+
+
+class Command(BaseCommand):
+    help = (
+        "Удаляет данные аккаунтов из очереди AccountDeletion порциями. "
+        "Запускается периодически, например из cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.ACCOUNT_DELETION_BATCH_SIZE,
+            help="Сколько строк удалять за одну транзакцию.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Сколько порций обработать на задание за запуск.",
+        )
+
+    def handle(self, *args, **options):
+        jobs = AccountDeletion.objects.filter(status=AccountDeletion.PENDING)
+        for job in jobs:
+            finished = process_deletion(
+                job, options["batch_size"], options["max_batches"]
+            )
+            state = "удалён" if finished else "в процессе"
+            self.stdout.write(
+                f"{job.username}: {state}, "
+                f"удалено записей {job.deleted_objects}"
+            )
@@ -0,0 +1,30 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountDeletion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.IntegerField(unique=True, verbose_name='id пользователя')),
+                ('username', models.CharField(max_length=150, verbose_name='Имя пользователя')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('done', 'Завершено')], default='pending', max_length=16, verbose_name='Статус')),
+                ('step', models.CharField(blank=True, max_length=32, verbose_name='Текущий шаг')),
+                ('deleted_objects', models.PositiveIntegerField(default=0, verbose_name='Удалено записей')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('finished', models.DateTimeField(blank=True, null=True, verbose_name='Завершено')),
+            ],
+            options={
+                'ordering': ['created'],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import models
+
+
+class AccountDeletion(models.Model):
+    """Задание на фоновое удаление аккаунта и всех его данных."""
+
+    PENDING = "pending"
+    DONE = "done"
+    STATUS_CHOICES = (
+        (PENDING, "В очереди"),
+        (DONE, "Завершено"),
+    )
+
+    user_id = models.IntegerField("id пользователя", unique=True)
+    username = models.CharField("Имя пользователя", max_length=150)
+    status = models.CharField(
+        "Статус", max_length=16, choices=STATUS_CHOICES, default=PENDING
+    )
+    step = models.CharField("Текущий шаг", max_length=32, blank=True)
+    deleted_objects = models.PositiveIntegerField("Удалено записей", default=0)
+    created = models.DateTimeField("Создано", auto_now_add=True)
+    finished = models.DateTimeField("Завершено", null=True, blank=True)
+
+    class Meta:
+        ordering = ["created"]
+
+    def __str__(self):
+        return f"{self.username}: {self.get_status_display()}"
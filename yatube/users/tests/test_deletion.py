@@ -0,0 +1,92 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.testing import capture_on_commit_callbacks
+from notifications.models import Notification
+from notifications.services import unread_count
+from posts.models import Comment, Follow, FollowSuggestion, Post
+
+from ..models import AccountDeletion
+
+User = get_user_model()
+
+
+class AccountDeletionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="Leaving")
+        self.other = User.objects.create_user(username="Staying")
+        self.client = Client()
+        self.client.force_login(self.user)
+        posts = Post.objects.bulk_create(
+            Post(text=f"Post {number}", author=self.user)
+            for number in range(5)
+        )
+        own_post = Post.objects.filter(author=self.user).first()
+        self.other_post = Post.objects.create(text="Other", author=self.other)
+        with capture_on_commit_callbacks(execute=True):
+            Comment.objects.create(
+                post=own_post, author=self.other, text="a"
+            )
+            Comment.objects.create(
+                post=self.other_post, author=self.user, text="b"
+            )
+            Follow.objects.create(user=self.other, author=self.user)
+        FollowSuggestion.objects.create(
+            user=self.user, author=self.other, score=1
+        )
+        FollowSuggestion.objects.create(
+            user=self.other, author=self.user, score=1
+        )
+        # Посты, 2 комментария, подписка, 2 рекомендации и уведомления.
+        self.object_count = len(posts) + 5 + Notification.objects.count()
+
+    def delete_account(self):
+        self.client.post(reverse("users:delete_account"))
+        return AccountDeletion.objects.get()
+
+    def test_account_is_detached_immediately(self):
+        """После запроса аккаунт отключён, а данные ещё на месте."""
+        job = self.delete_account()
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertEqual(job.username, "Leaving")
+        self.assertFalse(User.objects.filter(username="Leaving").exists())
+        self.assertEqual(Post.objects.filter(author=self.user).count(), 5)
+        response = self.client.get(reverse("posts:follow_index"))
+        self.assertEqual(response.status_code, 302)
+
+    def test_data_is_removed_in_batches(self):
+        """Данные удаляются порциями с сохранением прогресса."""
+        job = self.delete_account()
+        call_command(
+            "process_account_deletions",
+            batch_size=2,
+            max_batches=2,
+            stdout=StringIO(),
+        )
+        job.refresh_from_db()
+        self.assertEqual(job.status, AccountDeletion.PENDING)
+        self.assertEqual(job.deleted_objects, 3)
+        call_command(
+            "process_account_deletions", batch_size=2, stdout=StringIO()
+        )
+        job.refresh_from_db()
+        self.assertEqual(job.status, AccountDeletion.DONE)
+        self.assertEqual(job.deleted_objects, self.object_count)
+        self.assertFalse(User.objects.filter(id=self.user.id).exists())
+        self.assertEqual(list(Post.objects.all()), [self.other_post])
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(Follow.objects.exists())
+        self.assertFalse(FollowSuggestion.objects.exists())
+
+    def test_others_unread_counters_are_decremented(self):
+        """Удалённые уведомления других пользователей вычитаются."""
+        self.assertEqual(unread_count(self.other), 1)
+        self.delete_account()
+        call_command("process_account_deletions", stdout=StringIO())
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(unread_count(self.other), 0)
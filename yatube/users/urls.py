@@ -16,6 +16,7 @@ app_name = "users"
 
 urlpatterns = [
     path("signup/", views.SignUp.as_view(), name="signup"),
+    path("delete/", views.delete_account, name="delete_account"),
     path(
         "login/",
         LoginView.as_view(template_name="users/login.html"),
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -29,6 +30,8 @@ INSTALLED_APPS = [
     "posts.apps.PostsConfig",
     "users.apps.UsersConfig",
     "core.apps.CoreConfig",
+    "notifications.apps.NotificationsConfig",
+    "api.apps.ApiConfig",
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -39,30 +42,100 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.metrics.MetricsMiddleware",
+    "core.middleware.profiling.ProfilingMiddleware",
+    "core.middleware.memory.MemoryTrackingMiddleware",
+    "core.middleware.slow_queries.SlowQueryMiddleware",
+    "core.middleware.timing.ServerTimingMiddleware",
+    "core.middleware.compression.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.queries.QueryBudgetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.replica.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "yatube.urls"
 
+TEST_RUNNER = "core.test_runner.QueryBudgetTestRunner"
+
+# COMPRESSION (core/middleware/compression.py)
+
+GZIP_MIN_SIZE = 1024
+# Префиксы Content-Type, которые имеет смысл сжимать.
+GZIP_CONTENT_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/atom+xml",
+    "application/rss+xml",
+    "image/svg+xml",
+)
+GZIP_EXCLUDED_CONTENT_TYPES = ("text/event-stream",)
+
+# QUERY BUDGET (core/middleware/queries.py)
+
+QUERY_BUDGET_ENABLED = DEBUG
+QUERY_BUDGET_RAISE = False
+QUERY_BUDGET_DEFAULT = 20
+# Сколько одинаковых по форме запросов за запрос считать N+1.
+QUERY_REPEAT_THRESHOLD = 5
+# Не учитываются: sorl-thumbnail на холодном кэше ходит в БД за каждой
+# картинкой и пишет результат под SAVEPOINT.
+QUERY_BUDGET_IGNORE = ["thumbnail_kvstore", "SAVEPOINT"]
+
+# SERVER TIMING (core/middleware/timing.py)
+
+# Доля запросов, для которых собираются замеры (0..1). Каждый замер —
+# строка INFO в логе, поэтому по умолчанию замеры идут только с DEBUG.
+SERVER_TIMING_SAMPLE_RATE = float(
+    os.environ.get("SERVER_TIMING_SAMPLE_RATE", 1.0 if DEBUG else 0.0)
+)
+# Заголовок Server-Timing раскрывает устройство сайта, поэтому его
+# получают только сотрудники и клиенты с этих адресов.
+SERVER_TIMING_ALLOWED_IPS = ["127.0.0.1"]
+
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+# Скомпилированные шаблоны кэшируются в памяти процесса. При правке
+# шаблонов в разработке кэш выключают: TEMPLATE_CACHE=0.
+TEMPLATE_CACHE = os.environ.get("TEMPLATE_CACHE") != "0"
+# Компилировать все шаблоны при старте (CoreConfig.ready).
+TEMPLATE_WARMUP = os.environ.get("TEMPLATE_WARMUP") == "1"
+# Минификация HTML при загрузке шаблона (core/template_loaders.py).
+TEMPLATE_MINIFY = os.environ.get("TEMPLATE_MINIFY") != "0"
+TEMPLATE_LOADERS = (
+    [
+        "core.template_loaders.FilesystemLoader",
+        "django.template.loaders.app_directories.Loader",
+    ]
+    if TEMPLATE_MINIFY
+    else [
+        "django.template.loaders.filesystem.Loader",
+        "django.template.loaders.app_directories.Loader",
+    ]
+)
+if TEMPLATE_CACHE:
+    TEMPLATE_LOADERS = [
+        ("django.template.loaders.cached.Loader", TEMPLATE_LOADERS)
+    ]
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "core.template_backends.InstrumentedDjangoTemplates",
         "DIRS": [TEMPLATES_DIR],
-        "APP_DIRS": True,
         "OPTIONS": {
+            "loaders": TEMPLATE_LOADERS,
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
                 "core.context_processors.year.year",
+                "notifications.context_processors.unread_notifications",
             ],
         },
     },
@@ -79,22 +152,185 @@ EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
 # Database
 # https://docs.djangoproject.com/en/2.2/ref/settings/#databases
 
+# Пул соединений (core/db_backends) включается DB_POOL_ENABLED=1. Пул сам
+# держит соединения, поэтому Django с пулом закрывает их после запроса.
+DB_POOL_ENABLED = os.environ.get("DB_POOL_ENABLED") == "1"
+DB_POOL = {
+    "MAX_SIZE": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+    "TIMEOUT": float(os.environ.get("DB_POOL_TIMEOUT", 5)),
+    "HEALTH_CHECK_INTERVAL": 30,
+}
+DB_HEALTH_CHECK_INTERVAL = 30
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
+        "ENGINE": (
+            "core.db_backends.sqlite3"
+            if DB_POOL_ENABLED
+            else "django.db.backends.sqlite3"
+        ),
         "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+        "CONN_MAX_AGE": (
+            0
+            if DB_POOL_ENABLED
+            else int(os.environ.get("DB_CONN_MAX_AGE", 60))
+        ),
+    }
+}
+
+# Реплики для чтения. Локально роль реплики играет копия db.sqlite3,
+# которую поддерживает команда sync_replica.
+DB_REPLICA_PATH = os.environ.get("DB_REPLICA_PATH")
+if DB_REPLICA_PATH:
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": DB_REPLICA_PATH,
+        "TEST": {"MIRROR": "default"},
     }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+REPLICA_STICKY_COOKIE = "primary_sticky"
+# Сколько секунд после записи клиент читает только из default. Значение
+# должно быть больше наибольшего ожидаемого отставания реплики (для
+# sync_replica — её --interval плюс время копирования), иначе автор не
+# увидит свою запись, пока реплика её не догонит.
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 10))
+
+# Применяются к каждому новому соединению с SQLite (см. core/db.py).
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 128 * 1024 * 1024,
+    "cache_size": -20000,
+    "busy_timeout": 5000,
+    "temp_store": "MEMORY",
 }
 
 # CACHING
 
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "BACKEND": "core.cache.InstrumentedLocMemCache",
     }
 }
 
+THUMBNAIL_BACKEND = "core.thumbnails.InstrumentedThumbnailBackend"
+
 CACHE_TIME_INDEX = 20
+CACHE_TIME_TRENDING = 60
+# Карточка поста в ленте (posts/templatetags/post_cards.py). Ключ
+# меняют правка поста, смена имени автора и смена или удаление группы.
+CACHE_TIME_POST_CARD = 60 * 60 * 24
+# Страница поста целиком (core/holes.py). Ключ включает версию поста и
+# состояние комментариев, поэтому TTL ограничивает только устаревание
+# числа постов автора.
+CACHE_TIME_POST_DETAIL = 60
+# RSS/Atom-ленты (posts/feeds.py) сбрасываются записью Post; TTL
+# страхует от записей в обход сигналов (bulk_create, update).
+FEEDS_CACHE_TIME = 60 * 60
+FEEDS_ITEMS = 20
+# Пользовательские фрагменты страниц: шапка, кнопка правки и т. п.
+CACHE_TIME_FRAGMENTS = 60 * 10
+
+# LIVE UPDATES (Server-Sent Events)
+
+EVENTS_BROKER = "posts.events.InProcessBroker"
+EVENTS_BACKLOG = 1000
+SSE_STREAM_TIMEOUT = 60
+SSE_HEARTBEAT = 15
+SSE_RETRY_MS = 3000
+
+# BULK EXPORT/IMPORT (export_data, import_data)
+
+TRANSFER_BATCH_SIZE = 1000
+
+# HOT/COLD ARCHIVE (archive_posts)
+
+ARCHIVE_AFTER_DAYS = 365
+ARCHIVE_BATCH_SIZE = 500
+
+# ACCOUNT DELETION (process_account_deletions)
+
+ACCOUNT_DELETION_BATCH_SIZE = 500
+
+# FOLLOW RECOMMENDATIONS (build_recommendations)
+
+RECOMMENDATIONS_TOP_K = 10
+RECOMMENDATIONS_BLOCK_SIZE = 2000
+# Веса «друзей друзей» и «читают вместе с».
+RECOMMENDATIONS_WEIGHTS = (1.0, 0.5)
+RECOMMENDATIONS_MAX_DEGREE = 500
+RECOMMENDATIONS_NEIGHBOURS = 50
+RECOMMENDATIONS_SHOWN = 5
+
+# TRENDING (posts/trending.py)
+
+TRENDING_HALF_LIFE_HOURS = 24
+TRENDING_WEIGHTS = {"comment": 3.0, "follow": 2.0, "view": 0.2}
+TRENDING_VIEW_FLUSH_SECONDS = 30
+
+# NOTIFICATIONS
+
+NOTIFICATIONS_BATCH_SIZE = 100
+NOTIFICATIONS_DIGEST_BATCH_SIZE = 50
+NOTIFICATIONS_DIGEST_LIMIT = 20
+
+# METRICS (core/metrics.py, /metrics)
+
+METRICS_DIR = os.environ.get(
+    "METRICS_DIR", os.path.join(tempfile.gettempdir(), "yatube-metrics")
+)
+METRICS_FLUSH_SECONDS = 5
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Пустой список — доступ без ограничений.
+METRICS_ALLOWED_IPS = ["127.0.0.1"]
+
+# REQUEST PROFILING (core/profiling.py, /profiles/)
+
+PROFILE_DIR = os.environ.get(
+    "PROFILE_DIR", os.path.join(BASE_DIR, "profiles")
+)
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+PROFILE_MAX_FILES = 200
+PROFILE_TOKEN_MAX_AGE = 60 * 60
+PROFILE_SHOWN_FUNCTIONS = 60
+
+# SLOW QUERY LOG (core/slow_queries.py, slow_query_report)
+
+# None отключает журнал.
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_LOG = os.environ.get(
+    "SLOW_QUERY_LOG", os.path.join(BASE_DIR, "logs", "slow_queries.ndjson")
+)
+
+# BENCHMARKS (core/benchmarks.py, benchmark)
+
+BENCHMARK_DIR = os.path.join(BASE_DIR, "benchmarks")
+BENCHMARK_TOLERANCE = 0.2
+BENCHMARK_MIN_POSTS = 1000
+
+# MEMORY DIAGNOSTICS (core/middleware/memory.py)
+
+MEMORY_TRACKING_ENABLED = os.environ.get("MEMORY_TRACKING") == "1"
+MEMORY_TRACKING_THRESHOLD = 20 * 1024 * 1024
+MEMORY_TRACKING_FRAMES = 10
+MEMORY_TRACKING_TOP = 10
+
+# LOGGING
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "yatube": {
+            "handlers": ["console"],
+            "level": os.environ.get("YATUBE_LOG_LEVEL", "INFO"),
+        },
+    },
+}
 
 # Logging_url
 
@@ -124,6 +360,10 @@ AUTH_PASSWORD_VALIDATORS = [
 
 POST_QUANTITY = 10
 
+# JSON API (api/)
+API_PAGE_SIZE = POST_QUANTITY
+API_MAX_PAGE_SIZE = 100
+
 # Internationalization
 # https://docs.djangoproject.com/en/2.2/topics/i18n/
 
@@ -144,6 +384,22 @@ USE_TZ = True
 STATIC_URL = "/static/"
 STAT_DIR = os.path.join(BASE_DIR, "static")
 STATICFILES_DIRS = [STAT_DIR]
+STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
+# Хэши в именах и .gz-копии (core/storage.py) включаются явно: с ними
+# {% static %} требует манифест, то есть предварительный collectstatic.
+# При DEBUG=True ManifestStaticFilesStorage отдаёт имена без хэша, так
+# что хэшированные URL и вечное кэширование работают только с DEBUG=False.
+STATICFILES_STORAGE = (
+    "core.storage.CompressedManifestStaticFilesStorage"
+    if os.environ.get("STATIC_MANIFEST") == "1"
+    else "django.contrib.staticfiles.storage.StaticFilesStorage"
+)
+STATIC_COMPRESS_EXTENSIONS = (
+    ".css", ".js", ".map", ".svg", ".json", ".txt", ".ico"
+)
+STATIC_COMPRESS_MIN_SIZE = 256
+STATIC_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+STATIC_MAX_AGE = 60 * 10
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
@@ -11,8 +11,14 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("posts.urls", namespace="posts")),
     path("about/", include("about.urls", namespace="about")),
+    path(
+        "notifications/",
+        include("notifications.urls", namespace="notifications"),
+    ),
     path("auth/", include("users.urls", namespace="users")),
     path("auth/", include("django.contrib.auth.urls")),
+    path("api/v1/", include("api.urls", namespace="api")),
+    path("", include("core.urls", namespace="core")),
 ]
 
 if settings.DEBUG: